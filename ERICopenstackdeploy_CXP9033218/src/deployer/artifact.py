@@ -4,10 +4,6 @@ import json
 import logging
 import os
 import re
-import requests
-import semantic_version
-
-from pyunpack import Archive
 from deployer.utils import cached
 from deployer.ci import MediaCategoryNotDefinedException, ArtifactNotFoundException
 from . import ci
@@ -15,11 +11,18 @@ from . import configuration
 from . import image_utils
 from . import openstack
 from . import utils
+from .lazy import lazy_import
 
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
+# pylint: disable=C0103
+pyunpack = lazy_import('pyunpack')
+requests = lazy_import('requests')
+semantic_version = lazy_import('semantic_version')
+# pylint: enable=C0103
+
 
 class Artifacts:
     """
@@ -539,14 +542,15 @@ class ISO:
         """Downloaded ISO."""
         utils.download_file(
             url=self.url,
-            destination_directory=self.build_dir
+            destination_directory=self.build_dir,
+            mirror_urls=ci.get_artifact_mirror_urls(url=self.url)
         )
 
     def extract(self):
         """Extract ISO image."""
         LOG.info('Extract %s to: %s', self.name, self.extracted_filepath)
         iso_filepath = os.path.join(self.build_dir, self.name)
-        Archive(iso_filepath).extractall(self.extracted_filepath)
+        pyunpack.Archive(iso_filepath).extractall(self.extracted_filepath)
         LOG.info('%s extracted to: %s', self.name, self.extracted_filepath)
         os.system(f'rm -f {iso_filepath}')
 
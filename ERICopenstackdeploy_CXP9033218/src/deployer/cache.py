@@ -0,0 +1,237 @@
+"""
+This module contains logic relating to the deployer's on-disk cache.
+
+The cache directory holds data that is expensive to fetch or compute and
+that remains valid between separate runs of the deployer. Each entry is
+written atomically so concurrent deployer processes never read a partially
+written file.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+LOG = logging.getLogger(__name__)
+CACHE_DIRECTORY = os.path.expanduser('~/.deployer/cache')
+
+
+def get_cache_path(**kwargs):
+    """
+    Return the path of an entry in the cache directory.
+
+    The parent directory of the entry is created if it does not exist yet.
+
+    Args:
+        name (str): relative name of the cache entry
+
+    Returns:
+        (str): absolute path of the cache entry
+    """
+    name = kwargs.pop('name')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    cache_path = os.path.join(CACHE_DIRECTORY, name)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    return cache_path
+
+
+def get_entry_age(**kwargs):
+    """
+    Return the age of a cache entry in seconds.
+
+    Args:
+        name (str): relative name of the cache entry
+
+    Returns:
+        (float): age of the entry, or None if the entry does not exist
+    """
+    name = kwargs.pop('name')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    try:
+        return time.time() - os.path.getmtime(os.path.join(CACHE_DIRECTORY, name))
+    except OSError:
+        return None
+
+
+def read_entry(**kwargs):
+    """
+    Return the contents of a text cache entry.
+
+    Args:
+        name (str): relative name of the cache entry
+        max_age (int, optional): maximum age of the entry in seconds, defaults to None
+
+    Returns:
+        (str): the cached content, or None if the entry is missing, expired or unreadable
+    """
+    name = kwargs.pop('name')
+    max_age = kwargs.pop('max_age', None)
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    entry_age = get_entry_age(name=name)
+    if entry_age is None or (max_age is not None and entry_age > max_age):
+        return None
+    try:
+        with open(os.path.join(CACHE_DIRECTORY, name), 'r') as cache_file:
+            return cache_file.read()
+    except OSError as exception:
+        LOG.debug('Ignoring unreadable cache entry %s: %s', name, exception)
+        return None
+
+
+def read_json_entry(**kwargs):
+    """
+    Return the contents of a json cache entry.
+
+    Args:
+        name (str): relative name of the cache entry
+        max_age (int, optional): maximum age of the entry in seconds, defaults to None
+
+    Returns:
+        (obj): the cached data, or None if the entry is missing, expired or unreadable
+    """
+    name = kwargs.pop('name')
+    max_age = kwargs.pop('max_age', None)
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    content = read_entry(name=name, max_age=max_age)
+    if content is None:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError as exception:
+        LOG.debug('Ignoring unreadable cache entry %s: %s', name, exception)
+        return None
+
+
+def write_entry(**kwargs):
+    """
+    Atomically write the given content to a cache entry.
+
+    Args:
+        name (str): relative name of the cache entry
+        content (str|bytes): content to write
+        private (bool, optional): True | False, restrict the entry to the current user
+
+    Returns:
+        (bool): True if the entry was written
+    """
+    name = kwargs.pop('name')
+    content = kwargs.pop('content')
+    private = kwargs.pop('private', False)
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    try:
+        cache_path = get_cache_path(name=name)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(cache_path),
+            prefix='.tmp'
+        )
+        with os.fdopen(file_descriptor, 'wb' if isinstance(content, bytes) else 'w') as cache_file:
+            cache_file.write(content)
+        if not private:
+            os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, cache_path)
+        return True
+    except OSError as exception:
+        LOG.debug('Unable to write cache entry %s: %s', name, exception)
+        return False
+
+
+def write_json_entry(**kwargs):
+    """
+    Atomically write the given data to a json cache entry.
+
+    Args:
+        name (str): relative name of the cache entry
+        data (obj): json serializable data
+        private (bool, optional): True | False, restrict the entry to the current user
+
+    Returns:
+        (bool): True if the entry was written
+    """
+    name = kwargs.pop('name')
+    data = kwargs.pop('data')
+    private = kwargs.pop('private', False)
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    return write_entry(name=name, content=json.dumps(data), private=private)
+
+
+def get_directory_entry(**kwargs):
+    """
+    Return the path of a directory cache entry.
+
+    Args:
+        name (str): relative name of the cache entry
+
+    Returns:
+        (str): absolute path of the entry, or None if the entry does not exist
+    """
+    name = kwargs.pop('name')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    cache_path = os.path.join(CACHE_DIRECTORY, name)
+    return cache_path if os.path.isdir(cache_path) else None
+
+
+def populate_directory_entry(**kwargs):
+    """
+    Atomically populate a directory cache entry.
+
+    The populate function fills a temporary directory next to the entry,
+    which is then renamed into place. If another deployer process populated
+    the entry first, its copy is kept.
+
+    Args:
+        name (str): relative name of the cache entry
+        populate (function): called with the directory to fill
+
+    Returns:
+        (str): absolute path of the entry, or None if the entry could not be written
+    """
+    name = kwargs.pop('name')
+    populate = kwargs.pop('populate')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    try:
+        cache_path = get_cache_path(name=name)
+        temporary_path = tempfile.mkdtemp(dir=os.path.dirname(cache_path), prefix='.tmp')
+    except OSError as exception:
+        LOG.debug('Unable to write cache entry %s: %s', name, exception)
+        return None
+    try:
+        populate(temporary_path)
+    except Exception:
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        raise
+    try:
+        os.chmod(temporary_path, 0o755)
+        os.rename(temporary_path, cache_path)
+    except OSError as exception:
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        if os.path.isdir(cache_path):
+            return cache_path
+        LOG.debug('Unable to write cache entry %s: %s', name, exception)
+        return None
+    return cache_path
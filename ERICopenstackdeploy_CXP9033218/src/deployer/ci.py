@@ -3,17 +3,24 @@
 import logging
 import os
 import re
+import time
 from urllib.parse import urlparse
-import requests
-import urllib3
-from deployer.utils import cached, CliNonZeroExitCodeException
+import warnings
+from deployer.utils import cached
+from . import cache
 from . import configuration
 from . import utils
+from .lazy import lazy_import
 
-AUTH = configuration.FunctionalIdConfig()
-CONFIG = configuration.DeployerConfig()
+AUTH = configuration.get_functional_id_config()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+requests = lazy_import('requests')  # pylint: disable=C0103
+MIRROR_PROFILES = {}
+ARTIFACT_MIRRORS = {}
+MIRROR_PROFILES_CACHE_ENTRY = 'mirror_profiles.json'
+ARTIFACT_SIZES = {}
 
 
 class ArtifactNotFoundException(Exception):
@@ -131,16 +138,13 @@ def get_artifact_details_from_media(**kwargs):
 
 def get_local_artifact_url(**kwargs):
     """
-    Return local url based on host response time.
+    Return the artifact url from the mirror expected to deliver the artifact the fastest.
 
     Args:
         artifact_object (obj): artifact object
 
     Returns:
         local artifact url (str): artifact url
-
-    Raises:
-        CliNonZeroExitCodeException: if the commands fails with a non-zero exit code
     """
     artifact_object = kwargs.pop('artifact_object')
 
@@ -148,8 +152,7 @@ def get_local_artifact_url(**kwargs):
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
     hub_key = 'hubUrl' if artifact_object.get('hubUrl') else 'hub_url'
-    hub_netloc = urlparse(artifact_object.get(hub_key)).netloc
-    hub_hostname = hub_netloc.split(':')[0]
+    hub_hostname = get_url_hostname(url=artifact_object.get(hub_key))
 
     if not (artifact_object.get('athloneUrl') or artifact_object.get('athlone_url')):
         LOG.info('%s will be downloaded from: %s as no alternative source is available.',
@@ -162,30 +165,193 @@ def get_local_artifact_url(**kwargs):
                  os.path.basename(artifact_object[hub_key]), hub_hostname)
         return artifact_object[hub_key]
 
-    athlone_netloc = urlparse(artifact_object[athlone_key]).netloc
-    athlone_hostname = athlone_netloc.split(':')[0]
+    athlone_hostname = get_url_hostname(url=artifact_object[athlone_key])
 
-    try:
-        athlone_response_time = utils.get_host_response_time(hostname=athlone_hostname)
-    except CliNonZeroExitCodeException:
+    athlone_profile = get_mirror_profile(url=artifact_object[athlone_key])
+    if athlone_profile is None:
         LOG.info('%s will be downloaded from: %s as %s was unreachable.',
                  os.path.basename(artifact_object[hub_key]), hub_hostname, athlone_hostname)
         return artifact_object[hub_key]
 
-    try:
-        hub_response_time = utils.get_host_response_time(hostname=hub_hostname)
-    except CliNonZeroExitCodeException:
+    hub_profile = get_mirror_profile(url=artifact_object[hub_key])
+    if hub_profile is None:
         LOG.info('%s will be downloaded from: %s as %s was unreachable.',
                  os.path.basename(artifact_object[athlone_key]), athlone_hostname, hub_hostname)
         return artifact_object[athlone_key]
 
-    if athlone_response_time > hub_response_time:
-        LOG.info('%s will be downloaded from: %s as it was determined to have the least latency.',
-                 os.path.basename(artifact_object[hub_key]), hub_hostname)
+    if hub_profile['time_to_first_byte'] <= athlone_profile['time_to_first_byte'] and \
+            hub_profile['throughput'] >= athlone_profile['throughput']:
+        hub_is_faster = True
+    elif hub_profile['time_to_first_byte'] >= athlone_profile['time_to_first_byte'] and \
+            hub_profile['throughput'] <= athlone_profile['throughput']:
+        hub_is_faster = False
+    else:
+        # Neither mirror is better on both latency and throughput, so the size
+        # of the artifact decides which of the two is expected to finish first
+        artifact_size = get_artifact_size(url=artifact_object[hub_key])
+        hub_is_faster = get_expected_transfer_time(
+            mirror_profile=hub_profile, artifact_size=artifact_size
+        ) <= get_expected_transfer_time(
+            mirror_profile=athlone_profile, artifact_size=artifact_size
+        )
+
+    if hub_is_faster:
+        ARTIFACT_MIRRORS[artifact_object[hub_key]] = [
+            artifact_object[hub_key], artifact_object[athlone_key]
+        ]
+        LOG.info('%s will be downloaded from: %s as it was determined to have the shortest '
+                 'expected transfer time.', os.path.basename(artifact_object[hub_key]),
+                 hub_hostname)
         return artifact_object[hub_key]
+    ARTIFACT_MIRRORS[artifact_object[athlone_key]] = [
+        artifact_object[athlone_key], artifact_object[hub_key]
+    ]
+    LOG.info('%s will be downloaded from: %s as it was determined to have the shortest '
+             'expected transfer time.', os.path.basename(artifact_object[athlone_key]),
+             athlone_hostname)
     return artifact_object[athlone_key]
 
 
+def get_artifact_mirror_urls(**kwargs):
+    """
+    Return the urls of an artifact on every reachable mirror, preferred mirror first.
+
+    Args:
+        url (str): artifact url returned by get_local_artifact_url
+
+    Returns:
+        (list): artifact urls
+    """
+    url = kwargs.pop('url')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    return ARTIFACT_MIRRORS.get(url, [url])
+
+
+def get_url_hostname(**kwargs):
+    """
+    Return the hostname part of a url.
+
+    Args:
+        url (str): url
+
+    Returns:
+        (str): hostname
+    """
+    url = kwargs.pop('url')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    return urlparse(url).netloc.split(':')[0]
+
+
+def get_mirror_profile(**kwargs):
+    """
+    Return the latency and throughput profile of the mirror hosting the given url.
+
+    Profiles are measured once per mirror by probing the given url, kept for
+    the lifetime of the process and shared with later runs through the on-disk
+    cache until they are older than the configured time to live.
+
+    Args:
+        url (str): artifact url on the mirror
+
+    Returns:
+        (dict): mirror profile, or None if the mirror was unreachable
+    """
+    url = kwargs.pop('url')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    hostname = get_url_hostname(url=url)
+    if hostname in MIRROR_PROFILES:
+        return MIRROR_PROFILES[hostname]
+
+    profile_time_to_live = CONFIG.getint('mirror_selection', 'profile_ttl')
+    cached_profiles = cache.read_json_entry(name=MIRROR_PROFILES_CACHE_ENTRY) or {}
+    cached_profile = cached_profiles.get(hostname)
+    if cached_profile and cached_profile.get('throughput') and \
+            time.time() - cached_profile.get('measured_at', 0) < profile_time_to_live:
+        LOG.debug('Using cached transfer profile for %s', hostname)
+        MIRROR_PROFILES[hostname] = cached_profile
+        return cached_profile
+
+    try:
+        mirror_profile = utils.probe_http_transfer(
+            url=url,
+            probe_bytes=CONFIG.getint('mirror_selection', 'probe_bytes'),
+            timeout=CONFIG.getint('mirror_selection', 'probe_timeout')
+        )
+    except requests.exceptions.RequestException as exception:
+        LOG.debug('Unable to probe %s: %s', hostname, exception)
+        MIRROR_PROFILES[hostname] = None
+        return None
+
+    mirror_profile['measured_at'] = time.time()
+    LOG.debug('Measured transfer profile for %s: %s', hostname, mirror_profile)
+    if mirror_profile['size'] is not None:
+        ARTIFACT_SIZES[url] = mirror_profile['size']
+    MIRROR_PROFILES[hostname] = mirror_profile
+    cached_profiles[hostname] = mirror_profile
+    cache.write_json_entry(name=MIRROR_PROFILES_CACHE_ENTRY, data=cached_profiles)
+    return mirror_profile
+
+
+def get_artifact_size(**kwargs):
+    """
+    Return the size of the artifact at the given url.
+
+    Args:
+        url (str): artifact url
+
+    Returns:
+        (int): artifact size in bytes, or None if it is unknown
+    """
+    url = kwargs.pop('url')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    if url not in ARTIFACT_SIZES:
+        try:
+            response = requests.head(
+                url, verify=False, allow_redirects=True,
+                timeout=CONFIG.getint('mirror_selection', 'probe_timeout')
+            )
+            response.raise_for_status()
+            ARTIFACT_SIZES[url] = utils.get_content_size(headers=response.headers)
+        except requests.exceptions.RequestException:
+            ARTIFACT_SIZES[url] = None
+    return ARTIFACT_SIZES[url]
+
+
+def get_expected_transfer_time(**kwargs):
+    """
+    Return the time a mirror is expected to take to deliver an artifact.
+
+    Args:
+        mirror_profile (dict): mirror profile
+        artifact_size (int): artifact size in bytes, None if unknown
+
+    Returns:
+        (float): expected transfer time in seconds
+    """
+    mirror_profile = kwargs.pop('mirror_profile')
+    artifact_size = kwargs.pop('artifact_size')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    if artifact_size is None:
+        # Media artifacts are typically large, so favour throughput
+        artifact_size = CONFIG.getint('mirror_selection', 'default_artifact_size')
+    return mirror_profile['time_to_first_byte'] + artifact_size / mirror_profile['throughput']
+
+
 @cached
 def get_nexus_url_from_ps_and_media(cxp_number, product_set_version):
     """
@@ -17,7 +17,7 @@ from . import utils
 from . import cli_parameter
 
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 # pylint: disable=W0221
@@ -466,8 +466,9 @@ class Sed:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
         if self.document_id:
-            document_object = dit.execute_dit_get_rest_call(
-                url_string=f'/api/documents/{self.document_id}'
+            document_object = dit.DOCUMENTS.get(
+                collection='documents',
+                database_id=self.document_id
             )
             self.document = document_object['content']
         elif self.document_url:
@@ -16,7 +16,7 @@ from . import workflows
 from . import cli_parameter
 
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 # pylint: disable=W0221
@@ -187,7 +187,8 @@ class CIENMBackupDeployment(Command):
             username=self.lcm_username,
             private_key=self.private_key_file_path,
             https_enabled=life_cycle_manager.is_https_supported,
-            ui_hostname=life_cycle_manager.ui_hostname
+            ui_hostname=life_cycle_manager.ui_hostname,
+            facts=life_cycle_manager.remote_facts
         )
         workflows_version = workflow.get_workflows_version(
             workflows_name='enmdeploymentworkflows',
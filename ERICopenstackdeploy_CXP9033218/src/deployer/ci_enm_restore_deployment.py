@@ -16,7 +16,7 @@ from . import workflows
 from . import cli_parameter
 
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 # pylint: disable=W0221
@@ -204,7 +204,8 @@ class CIENMRestoreDeployment(Command):
             username=self.lcm_username,
             private_key=self.private_key_file_path,
             https_enabled=life_cycle_manager.is_https_supported,
-            ui_hostname=life_cycle_manager.ui_hostname
+            ui_hostname=life_cycle_manager.ui_hostname,
+            facts=life_cycle_manager.remote_facts
         )
         for ip_address in life_cycle_manager.services_vm_ips:
             workflow.download_workflows(
@@ -9,6 +9,7 @@ from . import dit
 from . import configuration
 from . import ci
 from . import lcm
+from . import lcm_db
 from . import openstack
 from . import sed
 from . import utils
@@ -17,7 +18,7 @@ from . import workflows
 from . import cli_parameter
 
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 # pylint: disable=W0221
@@ -201,7 +202,7 @@ class CIENMRollbackDeployment(Command):
             )
             life_cycle_manager.update_server_group(is_vio_deployment=is_vio_deployment)
             life_cycle_manager.update_security_group()
-            vnf_lcm_db_0 = lcm.LifeCycleManagerDb(
+            vnf_lcm_db_0 = lcm_db.LifeCycleManagerDb(
                 volume_instance_count=0,
                 deployment_id=vnf_lcm_sed_object.sed_data['parameter_defaults']['deployment_id'],
                 ip_address=vnf_lcm_sed_object.sed_data['parameter_defaults']
@@ -212,17 +213,13 @@ class CIENMRollbackDeployment(Command):
             if vnf_lcm_db_0.does_volume_snapshot_exist():
                 vnf_lcm_db_0.create_backup_volume()
             if life_cycle_manager.is_ha_deployment is True:
-                vnf_lcm_stack_params = openstack.get_resource_attribute(
-                    identifier=life_cycle_manager.vnflcm_stack.name,
-                    resource_type='stack',
-                    attribute='parameters'
-                )
+                vnf_lcm_stack_params = life_cycle_manager.vnflcm_stack.snapshot.parameters
                 LOG.info('Retrieved internal_ipv4_for_db_vm from VNF-LCM stack: %s',
                          vnf_lcm_stack_params['internal_ipv4_for_db_vm'])
                 db_1_ip_address = vnf_lcm_stack_params['internal_ipv4_for_db_vm'].split(',')[1]
                 db_1_ip_address = db_1_ip_address.replace('u\'', '').replace('\']', '').strip()
 
-                vnf_lcm_db_1 = lcm.LifeCycleManagerDb(
+                vnf_lcm_db_1 = lcm_db.LifeCycleManagerDb(
                     volume_instance_count=1,
                     deployment_id=vnf_lcm_sed_object.sed_data['parameter_defaults']
                     ['deployment_id'],
@@ -279,7 +276,8 @@ documentation to determine when the environment is fully ready.'
             username=self.lcm_username,
             private_key=self.private_key_file_path,
             https_enabled=life_cycle_manager.is_https_supported,
-            ui_hostname=life_cycle_manager.ui_hostname
+            ui_hostname=life_cycle_manager.ui_hostname,
+            facts=life_cycle_manager.remote_facts
         )
         workflow.rollback_workflows_versions(
             workflows_name=CONFIG.get('workflows', 'deploy_ENM'),
@@ -12,7 +12,7 @@ from . import utils
 from . import cli_parameter
 
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 # pylint: disable=W0221
@@ -9,6 +9,7 @@ from . import ci
 from . import configuration
 from . import dit
 from . import lcm
+from . import lcm_db
 from . import openstack
 from . import sed
 from . import utils
@@ -17,7 +18,7 @@ from . import workflows
 from . import cli_parameter
 
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 # pylint: disable=W0221
@@ -56,6 +57,7 @@ class CIENMSnapshotDeployment(Command):
             parser (object): list parameters for 'deployer ci enm snapshot deployment --help'
             usage: deployer ci enm snapshot deployment [-h] --deployment-name [DEPLOYMENT_NAME]
                                --snapshot-tag SNAPSHOT_TAG
+                               [--prestage-lcm-backup-volume]
                                [--workflow-max-check-attempts WORKFLOW_MAX_CHECK_ATTEMPTS]
                                --product-set [PRODUCT_SET_STRING]
 
@@ -65,6 +67,7 @@ class CIENMSnapshotDeployment(Command):
         parser = cli_parameter.add_deployment_name_param(parser)
         parser = cli_parameter.add_snapshot_tag_param(parser)
         parser = cli_parameter.add_workflow_max_check_attempts(parser)
+        parser = cli_parameter.add_prestage_lcm_backup_volume(parser)
         if self.cis_access is True:
             parser = cli_parameter.add_product_set_params(parser)
         else:
@@ -90,6 +93,7 @@ class CIENMSnapshotDeployment(Command):
                 artifact_json_url (str)
                 snapshot_tag (str)
                 workflow_max_check_attempts (int)
+                prestage_lcm_backup_volume (boolean)
 
         """
         # pylint: disable=R0914, R0915
@@ -185,7 +189,7 @@ class CIENMSnapshotDeployment(Command):
         )
         lcm_ip_address = (vnf_lcm_sed_object.sed_data['parameter_defaults']
                           ['external_ipv4_for_services_vm'].split(',')[0])
-        vnf_lcm_db_0 = lcm.LifeCycleManagerDb(
+        vnf_lcm_db_0 = lcm_db.LifeCycleManagerDb(
             volume_instance_count=0,
             deployment_id=vnf_lcm_sed_object.sed_data['parameter_defaults']['deployment_id'],
             ip_address=vnf_lcm_sed_object.sed_data['parameter_defaults']
@@ -193,10 +197,12 @@ class CIENMSnapshotDeployment(Command):
             volume_size=vnf_lcm_sed_object.sed_data['parameter_defaults']['vnflafdb_volume_size']
         )
         vnf_lcm_db_0.create_snapshot_volume()
+        if args.prestage_lcm_backup_volume is True:
+            vnf_lcm_db_0.prestage_backup_volume()
         if life_cycle_manager.is_ha_deployment:
             lcm_ip_address = (vnf_lcm_sed_object.sed_data['parameter_defaults']
                               ['external_ipv4_vip_for_services'])
-            vnf_lcm_db_1 = lcm.LifeCycleManagerDb(
+            vnf_lcm_db_1 = lcm_db.LifeCycleManagerDb(
                 volume_instance_count=1,
                 deployment_id=vnf_lcm_sed_object.sed_data['parameter_defaults']['deployment_id'],
                 ip_address=vnf_lcm_sed_object.sed_data['parameter_defaults']
@@ -205,12 +211,15 @@ class CIENMSnapshotDeployment(Command):
                 ['vnflafdb_volume_size']
             )
             vnf_lcm_db_1.create_snapshot_volume()
+            if args.prestage_lcm_backup_volume is True:
+                vnf_lcm_db_1.prestage_backup_volume()
         workflow = workflows.Workflows(
             ip_address=lcm_ip_address,
             username=self.lcm_username,
             private_key=self.private_key_file_path,
             https_enabled=life_cycle_manager.is_https_supported,
-            ui_hostname=life_cycle_manager.ui_hostname
+            ui_hostname=life_cycle_manager.ui_hostname,
+            facts=life_cycle_manager.remote_facts
         )
         workflows_version = workflow.get_workflows_version(
             workflows_name='enmdeploymentworkflows',
@@ -11,6 +11,7 @@ from . import dit
 from . import openstack
 from . import oqs
 from . import lcm
+from . import lcm_db
 from . import sed
 from . import utils
 from . import workflows
@@ -18,7 +19,7 @@ from . import vio
 from . import cli_parameter
 
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 # pylint: disable=W0221
@@ -59,6 +60,7 @@ class CIENMUpgrade(Command):
                                [--image-name-postfix IMAGE_NAME_POSTFIX]
                                [--workflow-max-check-attempts WORKFLOW_MAX_CHECK_ATTEMPTS]
                                [--create-lcm-backup-volume]
+                               [--prestage-lcm-backup-volume]
                                [--product-option {ENM,VNF-LCM}]
                                --product-set [PRODUCT_SET_STRING]
                                [--rpm-versions RPM_VERSIONS]
@@ -71,6 +73,7 @@ class CIENMUpgrade(Command):
         parser = cli_parameter.add_image_name_postfix_param(parser)
         parser = cli_parameter.add_workflow_max_check_attempts(parser)
         parser = cli_parameter.add_create_lcm_backup_volume(parser)
+        parser = cli_parameter.add_prestage_lcm_backup_volume(parser)
         parser = cli_parameter.add_product_option_param(parser)
         if self.cis_access is True:
             parser = cli_parameter.add_product_set_params(parser)
@@ -102,6 +105,7 @@ class CIENMUpgrade(Command):
                 artifact_json_file (str)
                 artifact_json_url (str)
                 create_lcm_backup_volume (boolean)
+                prestage_lcm_backup_volume (boolean)
                 workflow_max_check_attempts (int)
 
         """
@@ -262,9 +266,10 @@ class CIENMUpgrade(Command):
             username=self.lcm_username,
             private_key=self.private_key_file_path,
             https_enabled=life_cycle_manager.is_https_supported,
-            ui_hostname=life_cycle_manager.ui_hostname
+            ui_hostname=life_cycle_manager.ui_hostname,
+            facts=life_cycle_manager.remote_facts
         )
-        vnf_lcm_db_0 = lcm.LifeCycleManagerDb(
+        vnf_lcm_db_0 = lcm_db.LifeCycleManagerDb(
             volume_instance_count=0,
             deployment_id=vnf_lcm_sed_object.sed_data['parameter_defaults']['deployment_id'],
             ip_address=vnf_lcm_sed_object.sed_data['parameter_defaults']
@@ -291,7 +296,7 @@ class CIENMUpgrade(Command):
                 )
             if (life_cycle_manager.is_ha_deployment is True and
                     life_cycle_manager.is_ha_configuration is True):
-                vnf_lcm_db_1 = lcm.LifeCycleManagerDb(
+                vnf_lcm_db_1 = lcm_db.LifeCycleManagerDb(
                     volume_instance_count=1,
                     deployment_id=vnf_lcm_sed_object.sed_data['parameter_defaults']
                     ['deployment_id'],
@@ -315,6 +320,10 @@ class CIENMUpgrade(Command):
                 vnf_lcm_db_0.create_backup_volume()
                 if life_cycle_manager.is_ha_deployment is True:
                     vnf_lcm_db_1.create_backup_volume()
+            elif args.prestage_lcm_backup_volume is True:
+                vnf_lcm_db_0.prestage_backup_volume()
+                if vnf_lcm_db_1 is not None:
+                    vnf_lcm_db_1.prestage_backup_volume()
             if (life_cycle_manager.is_ha_deployment is False and
                     life_cycle_manager.is_ha_configuration is True):
                 life_cycle_manager.create_vip_ports_stack()
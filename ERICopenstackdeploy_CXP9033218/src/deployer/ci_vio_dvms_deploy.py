@@ -13,8 +13,7 @@ from . import openstack
 from . import utils
 from . import cli_parameter
 
-CONFIG = configuration.DeployerConfig()
-AUTH = configuration.FunctionalIdConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 # pylint: disable=W0221
@@ -96,11 +95,10 @@ class CIVIODvmsDeploy(Command):
             try:
                 dvms_media_file_path = utils.download_file(
                     url=media_url,
-                    destination_directory=utils.get_temporary_directory_path()
+                    destination_directory=utils.get_temporary_directory_path(),
+                    mirror_urls=ci.get_artifact_mirror_urls(url=media_url)
                 )
-                utils.unzip_tar_gz(dvms_media_file_path, utils.get_temporary_directory_path())
-                dvms_image_file_path = f'{dvms_media_file_path.split("-", -1)[0]}.vmdk'
-                dvms_image.create_image_from_local_file(dvms_image_file_path)
+                dvms_image.create_image_from_tar_gz(dvms_media_file_path)
             except Exception:
                 dvms_image.temporary_image_cleanup(temp_image_id)
                 raise
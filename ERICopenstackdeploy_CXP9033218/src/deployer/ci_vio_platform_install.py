@@ -14,7 +14,7 @@ from . import utils
 from . import vio
 from . import cli_parameter
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 # pylint: disable=W0221
@@ -135,7 +135,7 @@ class CIVIOPlatformInstall(Command):
             password=dvms_password,
             document_file_path=vnf_lcm_sed_file_path
         )
-        extracted_edp_filename = utils.extract_gunzipfile_contents(
+        edp_tarfile_contents = utils.extract_remote_tar_gz(
             ip_address=dvms_ip_address,
             username=dvms_username,
             password=dvms_password,
@@ -144,29 +144,14 @@ class CIVIOPlatformInstall(Command):
                 artifacts.get_artifact_url(artifact_name='edp_autodeploy_details')
             )
         )
-        edp_tarfile_contents = utils.get_remote_tarfile_contents(
-            ip_address=dvms_ip_address,
-            username=dvms_username,
-            password=dvms_password,
-            file_path=CONFIG.get('vio', 'artifacts_dir'),
-            package_name=extracted_edp_filename
-        )
         edp_packages = [item for item in edp_tarfile_contents if '.rpm' in item]
-        utils.extract_remote_tarfile(
+        utils.install_rpm_packages(
             ip_address=dvms_ip_address,
             username=dvms_username,
             password=dvms_password,
             file_path=CONFIG.get('vio', 'artifacts_dir'),
-            package_name=extracted_edp_filename
-        )
-        for package_name in edp_packages:
-            utils.install_rpm_package(
-                ip_address=dvms_ip_address,
-                username=dvms_username,
-                password=dvms_password,
-                file_path=CONFIG.get('vio', 'artifacts_dir'),
-                package_name=package_name
-            )
+            package_names=edp_packages
+        )
         dvms.configure_dvms_for_platform(profile=CONFIG.get('vio', 'install_init_dvms'))
         dvms.install_vio_platform(
             vio_profile_list=args.vio_profile_list
@@ -243,6 +243,20 @@ def add_create_lcm_backup_volume(parser):
     return parser
 
 
+def add_prestage_lcm_backup_volume(parser):
+    """Append pre-stage VNF-LCM backup volume parameter to the parser."""
+    parser.add_argument(
+        '--prestage-lcm-backup-volume',
+        help="""
+        This parameter should only be defined if the VNF-LCM backup volume should be created in the
+        background from the VNF-LCM volume snapshot, so that a later rollback can reuse it.
+        """,
+        required=False,
+        action='store_true'
+    )
+    return parser
+
+
 def add_delete_image_param(parser):
     """Append the delete image name parameter to the parser."""
     parser.add_argument(
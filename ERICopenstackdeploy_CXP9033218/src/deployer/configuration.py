@@ -5,14 +5,36 @@ This module handles the importing of the default
 and any custom configuration files
 """
 
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
 from configparser import ConfigParser
 from os.path import expanduser, join, dirname
 from urllib.request import urlopen
 from urllib.error import HTTPError, URLError
-from io import StringIO
+from . import cache
 
 # pylint: disable=R0901
 
+LOG = logging.getLogger(__name__)
+DEPLOYER_CONFIG_FILES = [
+    join(dirname(__file__), 'etc/deployer.ini'),
+    expanduser('~/.deployer.ini')
+]
+COMPILED_OFFERINGS_CACHE_ENTRY = 'product_offerings.json'
+DEPLOYER_CONFIG = None
+DEPLOYER_CONFIG_LOCK = threading.RLock()
+PRODUCT_OFFERINGS = None
+FUNCTIONAL_ID_CONFIG = None
+FUNCTIONAL_ID_CONFIG_LOCK = threading.Lock()
+FUNCTIONAL_ID_CACHE_ENTRY = 'deployer_cfg.ini'
+
+
+class ImmutableConfigException(Exception):
+    """Custom exception for expressing an attempt to modify the deployer configuration."""
+
 
 class DeployerConfig(ConfigParser):
     """
@@ -22,15 +44,138 @@ class DeployerConfig(ConfigParser):
     and preruns the read function so that it
     first reads the packages deployer.ini, followed
     by a users deployer.ini in their home directory
+
+    The files are only parsed once per process,
+    use get_deployer_config to retrieve the shared
+    instance. It cannot be modified once read.
     """
 
     def __init__(self):
         """Initialize a DeployerConfig object."""
+        self.frozen = False
         ConfigParser.__init__(self)
-        self.read([
-            join(dirname(__file__), 'etc/deployer.ini'),
-            expanduser('~/.deployer.ini')
-        ], encoding=None)
+        self.read(DEPLOYER_CONFIG_FILES, encoding=None)
+        self.frozen = True
+
+    def check_mutable(self):
+        """
+        Raise an exception if the configuration has already been read.
+
+        Raises:
+            ImmutableConfigException: if the configuration has already been read
+        """
+        if self.frozen:
+            raise ImmutableConfigException('The deployer configuration cannot be modified')
+
+    def read(self, filenames, encoding=None):
+        """Read and parse configuration files, only allowed before the configuration is frozen."""
+        self.check_mutable()
+        return ConfigParser.read(self, filenames, encoding=encoding)
+
+    def read_file(self, f, source=None):
+        """Read and parse a file object, only allowed before the configuration is frozen."""
+        self.check_mutable()
+        return ConfigParser.read_file(self, f, source=source)
+
+    def read_string(self, string, source='<string>'):
+        """Read and parse a string, only allowed before the configuration is frozen."""
+        self.check_mutable()
+        return ConfigParser.read_string(self, string, source=source)
+
+    def read_dict(self, dictionary, source='<dict>'):
+        """Read and parse a dictionary, only allowed before the configuration is frozen."""
+        self.check_mutable()
+        return ConfigParser.read_dict(self, dictionary, source=source)
+
+    def add_section(self, section):
+        """Add a section, only allowed before the configuration is frozen."""
+        self.check_mutable()
+        return ConfigParser.add_section(self, section)
+
+    def set(self, section, option, value=None):
+        """Set an option, only allowed before the configuration is frozen."""
+        self.check_mutable()
+        return ConfigParser.set(self, section, option, value)
+
+    def remove_option(self, section, option):
+        """Remove an option, only allowed before the configuration is frozen."""
+        self.check_mutable()
+        return ConfigParser.remove_option(self, section, option)
+
+    def remove_section(self, section):
+        """Remove a section, only allowed before the configuration is frozen."""
+        self.check_mutable()
+        return ConfigParser.remove_section(self, section)
+
+
+MediaDetail = namedtuple(
+    'MediaDetail',
+    ['friendly_name', 'cxp_number', 'stack_param_name', 'media_param_name', 'parent_artifact']
+)
+
+SedKeyMapping = namedtuple('SedKeyMapping', ['sed_key', 'artifact_name', 'cxp_number'])
+
+
+ProductOffering = namedtuple(
+    'ProductOffering',
+    ['name', 'details', 'media_details', 'image_map', 'stack_groups', 'sed_key_mappings',
+     'ci_floating_ip_keys']
+)
+
+
+def compile_product_offering(**kwargs):
+    """
+    Return the compiled details of a product offering.
+
+    Args:
+        name (str): product offering name
+        details (dict): offering details merged with the defaults, as defined in deployer.ini
+
+    Returns:
+        (ProductOffering): the name and details, along with the MediaDetail of every image
+            and media, the same keyed by cxp number, the stack short names of every stack
+            group, the SedKeyMapping of every media that has a SED key and the SED keys
+            holding CI floating ip addresses
+    """
+    name = kwargs.pop('name')
+    details = kwargs.pop('details')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    media_details = tuple(
+        MediaDetail(
+            friendly_name=media.get('friendly_name'),
+            cxp_number=media.get('cxp_number'),
+            stack_param_name=media.get('stack_param_name'),
+            media_param_name=media.get('media_param_name'),
+            parent_artifact=media.get('parent_artifact')
+        ) for media in details.get('media_details', [])
+    )
+    sed_key_mappings = []
+    for artifact_name, artifact_details in details.items():
+        if isinstance(artifact_details, list):
+            sed_key_mappings.extend(
+                SedKeyMapping(media['media_param_name'], artifact_name, media['cxp_number'])
+                for media in artifact_details
+                if isinstance(media, dict) and media.get('media_param_name')
+            )
+        elif isinstance(artifact_details, dict) and artifact_details.get('media_param_name'):
+            sed_key_mappings.append(SedKeyMapping(
+                artifact_details['media_param_name'], artifact_name,
+                artifact_details['cxp_number']
+            ))
+    return ProductOffering(
+        name=name,
+        details=details,
+        media_details=media_details,
+        image_map={media.cxp_number: media for media in media_details},
+        stack_groups=tuple(
+            tuple(stack_group) for stack_group in details.get('stack_groups', [])
+        ),
+        sed_key_mappings=tuple(sed_key_mappings),
+        ci_floating_ip_keys=tuple(details.get('ci_floating_ip_keys', []))
+    )
 
 
 class VersionConfig(ConfigParser):
@@ -59,30 +204,227 @@ class FunctionalIdConfig(ConfigParser):
     A class to read the functional ID and password to access REST API that require authentication.
 
     This class extends the SafeConfigParser
-    and the read function reads the deployer
-    functional id authentication config file.
+    and reads the deployer functional id
+    authentication config file the first
+    time any of its values are requested.
 
+    The file is kept in the deployer cache.
+    A cached copy older than the configured
+    time to live is still used, but is
+    refreshed from Nexus in the background
+    for the next run. A cached copy older
+    than the configured maximum age is
+    refreshed before it is used.
     """
 
     def __init__(self):
-        """Initialize a DeployerConfig object."""
+        """Initialize a FunctionalIdConfig object."""
         ConfigParser.__init__(self)
-        try:
-            auth_config_file = get_auth_config_file()
-            self.read_file(auth_config_file)
-        except (TypeError, AttributeError):
-            pass
+        self.loaded = False
+        self.load_lock = threading.Lock()
+
+    def load(self):
+        """
+        Read the functional id configuration unless it has already been read.
+
+        Raises:
+            RuntimeError: if there is no cached copy and it could not be retrieved
+        """
+        with self.load_lock:
+            if self.loaded:
+                return
+            config = get_deployer_config()
+            config_file_content = cache.read_entry(name=FUNCTIONAL_ID_CACHE_ENTRY)
+            cache_entry_age = cache.get_entry_age(name=FUNCTIONAL_ID_CACHE_ENTRY)
+            if config_file_content is None or \
+                    cache_entry_age > config.getint('functional_id', 'cache_max_age'):
+                config_file_content = refresh_auth_config_file() or config_file_content
+            elif cache_entry_age > config.getint('functional_id', 'cache_ttl'):
+                revalidation = threading.Thread(target=refresh_auth_config_file)
+                revalidation.daemon = True
+                revalidation.start()
+            if config_file_content is None:
+                raise RuntimeError(
+                    'Unable to retrieve the functional id configuration from %s' %
+                    config.get('functional_id', 'config_url')
+                )
+            self.read_string(config_file_content)
+            self.loaded = True
+
+    def get(self, section, option, **kwargs):  # pylint: disable=W0221
+        """Return the value of an option, reading the configuration first if required."""
+        self.load()
+        return ConfigParser.get(self, section, option, **kwargs)
+
+    def sections(self):
+        """Return the list of sections, reading the configuration first if required."""
+        self.load()
+        return ConfigParser.sections(self)
+
+    def has_section(self, section):
+        """Return whether a section exists, reading the configuration first if required."""
+        self.load()
+        return ConfigParser.has_section(self, section)
+
+    def has_option(self, section, option):
+        """Return whether an option exists, reading the configuration first if required."""
+        self.load()
+        return ConfigParser.has_option(self, section, option)
+
 
+def get_deployer_config():
+    """
+    Return the process wide DeployerConfig instance.
+
+    Returns:
+        (DeployerConfig): deployer configuration
+    """
+    global DEPLOYER_CONFIG  # pylint: disable=W0603
+    with DEPLOYER_CONFIG_LOCK:
+        if DEPLOYER_CONFIG is None:
+            DEPLOYER_CONFIG = DeployerConfig()
+        return DEPLOYER_CONFIG
+
+
+def get_product_offering(**kwargs):
+    """
+    Return the compiled details of a product offering.
+
+    The offering details in deployer.ini are compiled the first
+    time any offering is requested. When enabled, the compiled
+    offerings are also kept in the deployer cache, keyed by the
+    paths and modification times of the configuration files.
+
+    Args:
+        product_offering (str): product offering
+
+    Returns:
+        (ProductOffering): product offering details
+    """
+    product_offering = kwargs.pop('product_offering')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    global PRODUCT_OFFERINGS  # pylint: disable=W0603
+    with DEPLOYER_CONFIG_LOCK:
+        if PRODUCT_OFFERINGS is None:
+            PRODUCT_OFFERINGS = load_product_offerings()
+    return PRODUCT_OFFERINGS[product_offering]
+
+
+def load_product_offerings():
+    """
+    Compile the details of every product offering defined in deployer.ini.
+
+    Returns:
+        (dict): ProductOffering objects, keyed by product offering name
+    """
+    config = get_deployer_config()
+    use_compiled_cache = config.getboolean('offering_cache', 'enabled')
+    config_files_key = [
+        [config_file, os.stat(config_file).st_mtime_ns if os.path.isfile(config_file) else None]
+        for config_file in DEPLOYER_CONFIG_FILES
+    ]
+    if use_compiled_cache:
+        cache_entry = cache.read_json_entry(name=COMPILED_OFFERINGS_CACHE_ENTRY) or {}
+        if cache_entry.get('key') == config_files_key:
+            try:
+                return {
+                    name: load_compiled_product_offering(compiled_offering=compiled_offering)
+                    for name, compiled_offering in cache_entry['offerings'].items()
+                }
+            except (KeyError, TypeError, ValueError, AttributeError):
+                pass
+
+    offering_details = json.loads(config.get('OFFERING_DETAILS', 'offering_details'))
+    product_offerings = {}
+    for name, details in offering_details.items():
+        if name == 'defaults':
+            continue
+        merged_details = {}
+        merged_details.update(offering_details['defaults'])
+        merged_details.update(details)
+        product_offerings[name] = compile_product_offering(name=name, details=merged_details)
+
+    if use_compiled_cache:
+        cache.write_json_entry(
+            name=COMPILED_OFFERINGS_CACHE_ENTRY,
+            data={
+                'key': config_files_key,
+                'offerings': {
+                    name: product_offering._asdict()
+                    for name, product_offering in product_offerings.items()
+                }
+            }
+        )
+    return product_offerings
 
-def get_auth_config_file():
-    """Retrieve authentication configuration file."""
-    nexus_url = 'https://arm1s11-eiffel004.eiffel.gic.ericsson.se:8443/nexus/content/repositories'
+
+def load_compiled_product_offering(**kwargs):
+    """
+    Rebuild a ProductOffering from its json form in the deployer cache.
+
+    Args:
+        compiled_offering (dict): the fields of the ProductOffering
+
+    Returns:
+        (ProductOffering): product offering details
+    """
+    compiled_offering = kwargs.pop('compiled_offering')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    media_details = tuple(MediaDetail(*media) for media in compiled_offering['media_details'])
+    return ProductOffering(
+        name=compiled_offering['name'],
+        details=compiled_offering['details'],
+        media_details=media_details,
+        image_map={media.cxp_number: media for media in media_details},
+        stack_groups=tuple(
+            tuple(stack_group) for stack_group in compiled_offering['stack_groups']
+        ),
+        sed_key_mappings=tuple(
+            SedKeyMapping(*mapping) for mapping in compiled_offering['sed_key_mappings']
+        ),
+        ci_floating_ip_keys=tuple(compiled_offering['ci_floating_ip_keys'])
+    )
+
+
+def get_functional_id_config():
+    """
+    Return the process wide FunctionalIdConfig instance.
+
+    Creating the instance is cheap, the configuration
+    file is only fetched when a value is first requested.
+
+    Returns:
+        (FunctionalIdConfig): functional id configuration
+    """
+    global FUNCTIONAL_ID_CONFIG  # pylint: disable=W0603
+    with FUNCTIONAL_ID_CONFIG_LOCK:
+        if FUNCTIONAL_ID_CONFIG is None:
+            FUNCTIONAL_ID_CONFIG = FunctionalIdConfig()
+        return FUNCTIONAL_ID_CONFIG
+
+
+def refresh_auth_config_file():
+    """
+    Retrieve the authentication configuration file from Nexus and store it in the cache.
+
+    Returns:
+        (str): configuration file content, or None if it could not be retrieved
+    """
+    config = get_deployer_config()
     try:
         auth_config_file = urlopen(
-            f'{nexus_url}/releases/com/ericsson/de/ERICopenstackdeploy_CXP9033218/deployer_cfg.ini')
+            config.get('functional_id', 'config_url'),
+            timeout=config.getint('functional_id', 'timeout')
+        )
         config_file_content = auth_config_file.read().decode('utf-8')
-        config_file = StringIO(config_file_content)
-        config_file.seek(0)
-        return config_file
-    except (HTTPError, URLError):
-        pass
+    except (HTTPError, URLError, OSError) as exception:
+        LOG.warning('Unable to retrieve the functional id configuration: %s', exception)
+        return None
+    cache.write_entry(name=FUNCTIONAL_ID_CACHE_ENTRY, content=config_file_content, private=True)
+    return config_file_content
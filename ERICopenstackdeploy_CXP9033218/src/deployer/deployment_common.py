@@ -7,7 +7,7 @@ from . import openstack
 from . import utils
 
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 
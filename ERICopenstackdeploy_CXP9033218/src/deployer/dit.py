@@ -1,16 +1,278 @@
 """This file contains logic relating to the deployment inventory tool."""
 
+import copy
 import json
 import logging
-import requests
-import urllib3
+import re
+import threading
+import warnings
+from concurrent.futures import Future
 from retrying import retry
-from deployer.utils import cached
 from . import configuration
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from .lazy import lazy_import
+warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+requests = lazy_import('requests')  # pylint: disable=C0103
 
-AUTH = configuration.FunctionalIdConfig()
+AUTH = configuration.get_functional_id_config()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
+DOCUMENT_FIELDS = {
+    'deployments': '_id,name,project_id,enm,documents',
+    'documents': '_id,name,content,schema_id',
+    'pods': '_id,name,authUrl,content',
+    'projects': '_id,name,username,password,pod_id,content',
+    'schemas': '_id,name,version,content'
+}
+
+
+class DocumentIdentityMap:
+    """
+    Holds every document fetched from the deployment inventory tool during this run.
+
+    Documents are keyed by their collection and database id, so each
+    document is only fetched once however many objects refer to it.
+    A document is fetched by the first caller asking for it, any other
+    caller asking for it at the same time waits for that fetch. A
+    document is dropped from the map when it is updated through
+    execute_dit_put_rest_call, so the next access fetches it again.
+
+    Callers are given a copy of the document, so changing it does
+    not change what any other caller sees.
+
+    Only the fields the deployer uses are requested from DIT,
+    see DOCUMENT_FIELDS.
+    """
+
+    def __init__(self):
+        """Initialize a DocumentIdentityMap object."""
+        self.lock = threading.Lock()
+        self.documents = {}
+        self.names = {}
+
+    def get(self, **kwargs):
+        """
+        Return a document, fetching it if it has not been fetched yet.
+
+        If another caller is fetching the document and that fetch
+        fails, the document is fetched again once.
+
+        Args:
+            collection (str): DIT collection, e.g. projects
+            database_id (str): database id
+
+        Returns:
+            (dict): copy of the document
+        """
+        collection = kwargs.pop('collection')
+        database_id = kwargs.pop('database_id')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        document_future, fetched_here = self.__get_document_future(collection, database_id)
+        try:
+            document = document_future.result()
+        except Exception as exception:  # pylint: disable=W0703
+            if fetched_here:
+                raise
+            LOG.info('Fetching %s %s again as a concurrent fetch failed: %s',
+                     collection, database_id, exception)
+            document = self.__get_document_future(collection, database_id)[0].result()
+        return copy.deepcopy(document)
+
+    def __get_document_future(self, collection, database_id):
+        """
+        Return the future of a document, fetching it if no fetch has been started.
+
+        A failed fetch is dropped from the identity map, so the next
+        call fetches the document again.
+
+        Args:
+            collection (str): DIT collection
+            database_id (str): database id
+
+        Returns:
+            (tuple): future of the document and True if it was fetched by this call
+        """
+        with self.lock:
+            document_future = self.documents.get((collection, database_id))
+            fetch_required = document_future is None
+            if fetch_required:
+                document_future = Future()
+                self.documents[(collection, database_id)] = document_future
+
+        if fetch_required:
+            payload = None
+            if collection in DOCUMENT_FIELDS:
+                payload = {'fields': DOCUMENT_FIELDS[collection]}
+            try:
+                document_future.set_result(
+                    execute_dit_get_rest_call(f'/api/{collection}/{database_id}', payload)
+                )
+            except Exception as exception:  # pylint: disable=W0703
+                self.invalidate(collection=collection, database_id=database_id)
+                document_future.set_exception(exception)
+        return document_future, fetch_required
+
+    def get_by_name(self, **kwargs):
+        """
+        Return a document by name, querying DIT if it has not been fetched yet.
+
+        Args:
+            collection (str): DIT collection, e.g. deployments
+            name (str): document name
+            on_fetch (function, optional): called with the document when it has been
+                fetched from DIT rather than the identity map, defaults to None
+
+        Returns:
+            (dict): copy of the document
+
+        Raises:
+            RuntimeError: if no document with the given name exists
+        """
+        collection = kwargs.pop('collection')
+        name = kwargs.pop('name')
+        on_fetch = kwargs.pop('on_fetch', None)
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        with self.lock:
+            database_id = self.names.get((collection, name))
+            is_known = (collection, database_id) in self.documents
+        if is_known:
+            return self.get(collection=collection, database_id=database_id)
+
+        payload = {'q': f'name={name}'}
+        if collection in DOCUMENT_FIELDS:
+            payload['fields'] = DOCUMENT_FIELDS[collection]
+        documents = execute_dit_get_rest_call(f'/api/{collection}/', payload)
+        if not documents:
+            raise RuntimeError(
+                'Couldn\'t find a %s called "%s" in the Deployment Inventory Tool' %
+                (collection[:-1], name)
+            )
+        self.register(collection=collection, document=documents[0])
+        with self.lock:
+            self.names[(collection, name)] = documents[0]['_id']
+        if on_fetch:
+            on_fetch(documents[0])
+        return copy.deepcopy(documents[0])
+
+    def prefetch(self, **kwargs):
+        """
+        Fetch a document in the background unless it is already in the identity map.
+
+        Failures are only logged. A caller waiting for a prefetch
+        that fails fetches the document again once, and the first
+        caller asking for it afterwards fetches it again.
+
+        Args:
+            collection (str): DIT collection
+            database_id (str): database id
+            on_fetch (function, optional): called with the document once fetched,
+                defaults to None
+        """
+        collection = kwargs.pop('collection')
+        database_id = kwargs.pop('database_id')
+        on_fetch = kwargs.pop('on_fetch', None)
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        with self.lock:
+            if not database_id or (collection, database_id) in self.documents:
+                return
+
+        def fetch_document():
+            try:
+                document = self.get(collection=collection, database_id=database_id)
+            except Exception as exception:  # pylint: disable=W0703
+                LOG.debug('Unable to prefetch %s %s: %s', collection, database_id, exception)
+                return
+            if on_fetch:
+                on_fetch(document)
+
+        prefetch_thread = threading.Thread(target=fetch_document)
+        prefetch_thread.daemon = True
+        prefetch_thread.start()
+
+    def register(self, **kwargs):
+        """
+        Add a document fetched by other means to the identity map.
+
+        Args:
+            collection (str): DIT collection
+            document (dict): document, including its _id
+        """
+        collection = kwargs.pop('collection')
+        document = kwargs.pop('document')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        document_future = Future()
+        document_future.set_result(document)
+        with self.lock:
+            self.documents[(collection, document['_id'])] = document_future
+
+    def invalidate(self, **kwargs):
+        """
+        Drop a document from the identity map.
+
+        Args:
+            collection (str): DIT collection
+            database_id (str): database id
+        """
+        collection = kwargs.pop('collection')
+        database_id = kwargs.pop('database_id')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        with self.lock:
+            self.documents.pop((collection, database_id), None)
+
+
+DOCUMENTS = DocumentIdentityMap()
+
+
+def prefetch_deployment_graph(deployment_document):
+    """
+    Fetch every document a deployment refers to in parallel.
+
+    The project, SED and attached documents are requested as soon as
+    the deployment document is available, followed by the pod of the
+    project and the schema of each document as soon as those arrive.
+
+    Args:
+        deployment_document (dict): deployment document
+    """
+    if not CONFIG.getboolean('dit', 'prefetch'):
+        return
+
+    def prefetch_schema(document):
+        DOCUMENTS.prefetch(collection='schemas', database_id=document.get('schema_id'))
+
+    def prefetch_pod(project):
+        DOCUMENTS.prefetch(collection='pods', database_id=project.get('pod_id'))
+
+    DOCUMENTS.prefetch(
+        collection='projects',
+        database_id=deployment_document.get('project_id'),
+        on_fetch=prefetch_pod
+    )
+    DOCUMENTS.prefetch(
+        collection='documents',
+        database_id=(deployment_document.get('enm') or {}).get('sed_id'),
+        on_fetch=prefetch_schema
+    )
+    for attached_document in deployment_document.get('documents') or []:
+        DOCUMENTS.prefetch(
+            collection='documents',
+            database_id=attached_document.get('document_id'),
+            on_fetch=prefetch_schema
+        )
 
 
 class Deployment:
@@ -81,20 +343,13 @@ class Deployment:
         )
 
     @property
-    @cached
     def rest(self):
         """dict: Return the response from the DIT API for this deployment."""
-        deployments = execute_dit_get_rest_call(
-            '/api/deployments/', {'q': f'name={self.deployment_name}'}
+        return DOCUMENTS.get_by_name(
+            collection='deployments',
+            name=self.deployment_name,
+            on_fetch=prefetch_deployment_graph
         )
-        deployment_count = len(deployments)
-        if deployment_count == 0:
-            raise RuntimeError(
-                'Couldn\'t find a deployment called "%s" in the Deployment Inventory Tool' %
-                self.deployment_name
-            )
-
-        return deployments[0]
 
 
 class Project:
@@ -157,25 +412,12 @@ class Project:
         return self.rest['name']
 
     @property
-    @cached
     def rest(self):
         """dict: the response from the DIT API for this project."""
         if self.project_name != '':
-            projects = execute_dit_get_rest_call(
-                '/api/projects/', {'q': 'name=' + self.project_name}
-            )
-            project_count = len(projects)
-            if project_count == 0:
-                raise RuntimeError(
-                    'Couldn\'t find a project called "%s" in the Deployment Inventory Tool' %
-                    self.project_name
-                )
+            return DOCUMENTS.get_by_name(collection='projects', name=self.project_name)
 
-            return projects[0]
-
-        return execute_dit_get_rest_call(
-            f'/api/projects/{self.database_id}'
-        )
+        return DOCUMENTS.get(collection='projects', database_id=self.database_id)
 
 
 class Pod:
@@ -209,12 +451,9 @@ class Pod:
         return self.rest['authUrl']
 
     @property
-    @cached
     def rest(self):
         """obj: Return the response from the DIT API for this pod."""
-        return execute_dit_get_rest_call(
-            f'/api/pods/{self.database_id}'
-        )
+        return DOCUMENTS.get(collection='pods', database_id=self.database_id)
 
 
 class Sed:
@@ -247,9 +486,7 @@ class Sed:
     @property
     def rest(self):
         """dict: Return the response from the DIT API for this sed."""
-        return execute_dit_get_rest_call(
-            f'/api/documents/{self.database_id}'
-        )
+        return DOCUMENTS.get(collection='documents', database_id=self.database_id)
 
 
 class VNFLCMSed:
@@ -285,12 +522,9 @@ class VNFLCMSed:
         )
 
     @property
-    @cached
     def rest(self):
         """dict: Return the response from the DIT API for this sed."""
-        return execute_dit_get_rest_call(
-            f'/api/documents/{self.database_id}'
-        )
+        return DOCUMENTS.get(collection='documents', database_id=self.database_id)
 
 
 class Schema:
@@ -324,13 +558,9 @@ class Schema:
         return self.rest['version']
 
     @property
-    @cached
     def rest(self):
         """dict: Return the response from the DIT API for this schema."""
-        return execute_dit_get_rest_call(
-            f'/api/schemas/{self.database_id}',
-            {'fields': 'name,version,content'}
-        )
+        return DOCUMENTS.get(collection='schemas', database_id=self.database_id)
 
 
 class VIODVMS:
@@ -361,12 +591,9 @@ class VIODVMS:
         )
 
     @property
-    @cached
     def rest(self):
         """dict: Return the response from the DIT API for this document."""
-        return execute_dit_get_rest_call(
-            f'/api/documents/{self.database_id}'
-        )
+        return DOCUMENTS.get(collection='documents', database_id=self.database_id)
 
 
 def is_connection_error(exception):
@@ -435,6 +662,12 @@ def execute_dit_put_rest_call(url_string, json_data):
         LOG.error('Rest Call failed with the following error: %s %s', response, response.json())
         raise requests.HTTPError
 
+    updated_document = re.match(r'/api/(\w+)/(\w+)/?$', url_string)
+    if updated_document:
+        DOCUMENTS.invalidate(
+            collection=updated_document.group(1),
+            database_id=updated_document.group(2)
+        )
     LOG.info('REST call completed')
     return response.json()
 
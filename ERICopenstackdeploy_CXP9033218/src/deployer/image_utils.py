@@ -3,12 +3,14 @@
 import logging
 import re
 import os
+import tarfile
 from deployer.openstack import openstack_client_command
+from . import ci
 from . import configuration
 from . import openstack
 from . import utils
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 
@@ -86,7 +88,8 @@ class Image:
                 if not os.path.isfile(Image.local_image_path):
                     utils.download_file(
                         url=self.nexus_url,
-                        destination_directory=self.temp_directory
+                        destination_directory=self.temp_directory,
+                        mirror_urls=ci.get_artifact_mirror_urls(url=self.nexus_url)
                     )
                 self.create_image_from_local_file(Image.local_image_path)
             except Exception:
@@ -116,17 +119,61 @@ class Image:
 
     def create_image_from_local_file(self, local_file_path):
         """Create image in glance from local file."""
+        self.__create_image(file_argument=f'--file {local_file_path}')
+
+    def create_image_from_tar_gz(self, tar_gz_file_path):
+        """
+        Create image in glance from the image member of a local tar.gz file.
+
+        The member is decompressed and streamed to glance in chunks, it is
+        never extracted to disk.
+
+        Args:
+            tar_gz_file_path (str): tar.gz file path
+
+        Raises:
+            FileNotFoundError: if the tar.gz file has no member of the image disk format
+        """
+        with tarfile.open(tar_gz_file_path, 'r|gz') as tar_gz_file:
+            for member in tar_gz_file:
+                if member.isfile() and member.name.endswith(f'.{self.disk_format}'):
+                    LOG.info('Streaming %s from %s to glance', member.name,
+                             os.path.basename(tar_gz_file_path))
+                    self.__create_image(
+                        file_argument='',
+                        input_stream=tar_gz_file.extractfile(member)
+                    )
+                    return
+        raise FileNotFoundError(
+            f'No .{self.disk_format} image found in {os.path.basename(tar_gz_file_path)}'
+        )
+
+    def __create_image(self, **kwargs):
+        """
+        Create image in glance.
+
+        Args:
+            file_argument (str): --file argument, empty to read the image from input_stream
+            input_stream (obj, optional): image data stream, defaults to None
+        """
+        file_argument = kwargs.pop('file_argument')
+        input_stream = kwargs.pop('input_stream', None)
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
         extra_vmdk_properties = ''
         if self.disk_format == 'vmdk':
             extra_vmdk_properties = ' --property vmware_disktype="preallocated" ' + \
                                     '--property vmware_adaptertype="ide" '
         arguments = f'--public --container-format bare --disk-format {self.disk_format} \
-{extra_vmdk_properties} --file {local_file_path} {self.modified_image_name}'
+{extra_vmdk_properties} {file_argument} {self.modified_image_name}'
         openstack_client_command(
             command_type='openstack',
             object_type='image',
             action='create',
-            arguments=arguments
+            arguments=arguments,
+            input_stream=input_stream
         )
 
     def wait(self):
@@ -186,15 +233,14 @@ class ImageListFromConfig:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
         self.image_objects = []
-        self.product_offering_details = utils.get_product_offering_details(
+        self.product_offering = configuration.get_product_offering(
             product_offering=product_offering
         )
-        image_definitions = self.product_offering_details['media_details']
-        for image_definition in image_definitions:
-            if self.artifact_json['media_details'].get(image_definition['cxp_number']):
+        for image_definition in self.product_offering.media_details:
+            if self.artifact_json['media_details'].get(image_definition.cxp_number):
                 image_object = Image(
-                    cxp=image_definition['cxp_number'],
-                    stack_param_name=image_definition['stack_param_name'],
+                    cxp=image_definition.cxp_number,
+                    stack_param_name=image_definition.stack_param_name,
                     artifact_json=self.artifact_json,
                     image_name_postfix=image_name_postfix
                 )
@@ -225,16 +271,11 @@ class ImageListFromConfig:
         for image in self.image_objects:
             sed_key_values_list.append([image.stack_param_name, image.modified_image_name])
 
-        for media_name, media_details in self.product_offering_details.items():
-            if isinstance(media_details, list):
-                for media in media_details:
-                    if media.get('media_param_name'):
-                        sed_key_values_list.append([media.get('media_param_name'),
-                                                    os.path.basename(self.artifact_json[media_name]
-                                                                     [media.get('cxp_number')])])
-            elif media_details.get('media_param_name'):
-                sed_key_values_list.append([media_details.get('media_param_name'),
-                                            os.path.basename(self.artifact_json[media_name]
-                                                             [media_details.get('cxp_number')])])
+        for sed_key_mapping in self.product_offering.sed_key_mappings:
+            sed_key_values_list.append([
+                sed_key_mapping.sed_key,
+                os.path.basename(self.artifact_json[sed_key_mapping.artifact_name]
+                                 [sed_key_mapping.cxp_number])
+            ])
 
         return sed_key_values_list
@@ -0,0 +1,32 @@
+"""
+This module contains logic relating to importing modules on first use.
+
+The deployer is started many times a day for short commands that never
+open an SSH connection or make a REST call, so third party modules that
+are slow to import are only executed when one of their attributes is
+first accessed.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Return a module that is only executed when one of its attributes is first accessed.
+
+    Args:
+        name (str): module name
+
+    Returns:
+        (module): the module, already executed if it had been imported before
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    module_spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(module_spec.loader)
+    module_spec.loader = loader
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -2,17 +2,183 @@
 
 import os
 import logging
+import concurrent.futures
+import threading
 import time
-import timeout_decorator
-import semantic_version
 from deployer.utils import cached
+from . import cache
 from . import configuration
 from . import openstack
 from . import utils
+from .lazy import lazy_import
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
+semantic_version = lazy_import('semantic_version')  # pylint: disable=C0103
+
+REMOTE_FACTS = {}
+REMOTE_FACTS_LOCK = threading.Lock()
+REMOTE_FACTS_COMMAND = '; '.join([
+    'echo "### vnf_lcm_version"',
+    'sudo -i vnflcm version 2>/dev/null | grep -i "vnflcm version"',
+    'echo "### workflow_bundles"',
+    'sudo /opt/ericsson/ERICwfmgrruntimetools_CXP9032765/wfmgr bundle list 2>/dev/null',
+    'true'
+])
+
+
+class RemoteFacts:
+    """
+    Represents the facts the deployer needs about a VNF-LCM services VM.
+
+    The VNF-LCM version and the installed workflow bundles are gathered in
+    one SSH command. They are kept until a deployer action that changes them
+    calls invalidate.
+
+    Attributes:
+        ip_address (str): services vm ip address
+        username (str): user name
+        private_key (str): private key
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize a RemoteFacts object."""
+        self.ip_address = kwargs.pop('ip_address')
+        self.username = kwargs.pop('username')
+        self.private_key = kwargs.pop('private_key')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        self.lock = threading.Lock()
+        self.facts = None
+
+    @property
+    def vnf_lcm_version(self):
+        """str: Return installed VNF-LCM media version."""
+        return self.get_facts()['vnf_lcm_version']
+
+    @property
+    def workflow_bundles(self):
+        """list: Return the lines of the installed workflow bundle list."""
+        return self.get_facts()['workflow_bundles']
+
+    def get_facts(self):
+        """
+        Return the facts, gathering them from the services VM if not already known.
+
+        Returns:
+            (dict): facts
+
+        Raises:
+            Exception: if the VNF-LCM version can not be retrieved
+        """
+        with self.lock:
+            if self.facts is None:
+                self.facts = self.gather_facts()
+            return self.facts
+
+    def gather_facts(self):
+        """
+        Gather the facts from the services VM in one SSH command.
+
+        Returns:
+            (dict): facts
+
+        Raises:
+            Exception: if the VNF-LCM version can not be retrieved
+        """
+        max_attempts = 10
+        attempt = 1
+        while attempt <= max_attempts:
+            facts = self.parse_facts(
+                output=utils.run_ssh_command(
+                    ip_address=self.ip_address,
+                    username=self.username,
+                    private_key=self.private_key,
+                    command=REMOTE_FACTS_COMMAND,
+                    suppress_exception=True
+                )
+            )
+            if semantic_version.validate(facts['vnf_lcm_version']):
+                LOG.info('Installed VNF-LCM artifacts version: %s', facts['vnf_lcm_version'])
+                return facts
+            LOG.info('Retrying retrieval of VNF-LCM version attempt: %d of %d',
+                     attempt, max_attempts)
+            time.sleep(10)
+            attempt += 1
+        raise Exception('Unable to retrieve VNF-LCM version, check VNF-LCM services VM.')
+
+    @classmethod
+    def parse_facts(cls, **kwargs):
+        """
+        Parse the output of the remote facts command.
+
+        Args:
+            output (str): command output
+
+        Returns:
+            (dict): facts
+        """
+        output = kwargs.pop('output')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        sections = {}
+        section = None
+        for line in output.splitlines():
+            if line.startswith('### '):
+                section = line[4:].strip()
+                sections[section] = []
+            elif section and line.strip():
+                sections[section].append(line)
+
+        vnf_lcm_version = ''
+        for line in sections.get('vnf_lcm_version', []):
+            LOG.info(line)
+            if ':' in line:
+                vnf_lcm_version = line.split(':')[1].strip()
+        return {
+            'vnf_lcm_version': vnf_lcm_version,
+            'workflow_bundles': sections.get('workflow_bundles', [])
+        }
+
+    def invalidate(self):
+        """Forget the facts so they are gathered again on next access."""
+        with self.lock:
+            self.facts = None
+
+
+def get_remote_facts(**kwargs):
+    """
+    Return the remote facts of a VNF-LCM services VM, shared for the whole run.
+
+    Args:
+        ip_address (str): services vm ip address
+        username (str): user name
+        private_key (str): private key
+
+    Returns:
+        (RemoteFacts): remote facts
+    """
+    ip_address = kwargs.pop('ip_address')
+    username = kwargs.pop('username')
+    private_key = kwargs.pop('private_key')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    with REMOTE_FACTS_LOCK:
+        if (ip_address, username) not in REMOTE_FACTS:
+            REMOTE_FACTS[(ip_address, username)] = RemoteFacts(
+                ip_address=ip_address,
+                username=username,
+                private_key=private_key
+            )
+        return REMOTE_FACTS[(ip_address, username)]
+
 
 class LifeCycleManager:
     """
@@ -130,11 +296,7 @@ class LifeCycleManager:
     @cached
     def is_ha_deployment(self):
         """bool: Return true if VNF-LCM stack is HA."""
-        stack_params = openstack.get_resource_attribute(
-            identifier=self.vnflcm_stack.name,
-            resource_type='stack',
-            attribute='parameters'
-        )
+        stack_params = self.vnflcm_stack.snapshot.parameters
         return stack_params['db_vm_count'] == '2' or stack_params['services_vm_count'] == '2'
 
     @property
@@ -157,35 +319,22 @@ class LifeCycleManager:
         return (self.sed_object.sed_data['parameter_defaults']
                 ['external_ipv4_for_services_vm'].split(','))
 
+    @property
+    def remote_facts(self):
+        """obj: Return the remote facts of the first VNF-LCM services VM."""
+        return get_remote_facts(
+            ip_address=self.services_vm_ips[0],
+            username=self.username,
+            private_key=self.private_key
+        )
+
     @property
     def vnf_lcm_version(self):
         """str: Return installed VNF-LCM media version."""
-        max_attempts = 10
-        attempt = 1
-        vnf_lcm_version = ''
-        while attempt <= max_attempts:
-            vnf_lcm_version = utils.run_ssh_command(
-                ip_address=self.sed_object.sed_data['parameter_defaults']
-                ['external_ipv4_for_services_vm'].split(',')[0],
-                username=self.username,
-                private_key=self.private_key,
-                command="sudo -i vnflcm version | grep -i \"vnflcm version\" "
-            )
-            LOG.info(vnf_lcm_version)
-            if ':' not in vnf_lcm_version:
-                time.sleep(10)
-                LOG.info('Retrying retrieval of VNF-LCM version attempt: %d of %d',
-                         attempt, max_attempts)
-                attempt += 1
-                continue
-            vnf_lcm_version = vnf_lcm_version.split(':')[1].strip()
-            if semantic_version.validate(vnf_lcm_version):
-                LOG.info('Installed VNF-LCM artifacts version: %s', vnf_lcm_version)
-                return vnf_lcm_version
-            attempt += 1
-        raise Exception('Unable to retrieve VNF-LCM version, check VNF-LCM services VM.')
+        return self.remote_facts.vnf_lcm_version
 
     @property
+    @cached
     def ui_hostname(self):
         """str: Return UI hostname based on if FFE deployment or not."""
         ffe_hostname = f'{self.sed_object.sed_data["parameter_defaults"]["deployment_id"]}-vnflcm'
@@ -224,14 +373,38 @@ class LifeCycleManager:
         if kwargs:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-        utils.download_file(
+        if openstack.is_template_cache_enabled(url=self.heat_templates_url):
+            cache_entry_name = os.path.join('templates',
+                                            os.path.basename(self.heat_templates_url))
+            templates_dir = cache.get_directory_entry(name=cache_entry_name)
+            if templates_dir is None:
+                templates_dir = cache.populate_directory_entry(
+                    name=cache_entry_name,
+                    populate=self.__extract_templates
+                )
+            else:
+                LOG.info('Using cached VNF-LCM cloud templates: %s', templates_dir)
+            if templates_dir is not None:
+                for entry in os.listdir(templates_dir):
+                    link_path = os.path.join(destination_directory, entry)
+                    if os.path.lexists(link_path):
+                        LOG.info('Not linking cached %s, it already exists', link_path)
+                        continue
+                    os.symlink(os.path.join(templates_dir, entry), link_path)
+                LOG.info('VNF-LCM cloud templates linked into: %s', destination_directory)
+                return
+
+        self.__extract_templates(destination_directory)
+
+    def __extract_templates(self, destination_directory):
+        """Download and extract VNF-LCM templates into the given directory."""
+        templates_file_path = utils.download_file(
             url=self.heat_templates_url,
             destination_directory=destination_directory
         )
         LOG.info('VNF-LCM cloud templates download complete.')
-        utils.unzip_tar_gz(os.path.join(destination_directory,
-                                        os.path.basename(self.heat_templates_url)),
-                           destination_directory)
+        utils.unzip_tar_gz(templates_file_path, destination_directory)
+        os.remove(templates_file_path)
         LOG.info('VNF-LCM cloud templates extracted to: %s', destination_directory)
 
     def create_security_group(self):
@@ -242,6 +415,9 @@ class LifeCycleManager:
 
     def update_security_group(self):
         """Update VNF-LCM security group stack."""
+        if not self.security_group_stack.is_update_required():
+            LOG.info('%s is up to date, skipping update.', self.security_group_stack.name)
+            return
         self.security_group_stack.update()
         self.security_group_stack.wait_until_updated()
         LOG.info('%s updated.', self.security_group_stack.name)
@@ -254,6 +430,9 @@ class LifeCycleManager:
 
     def update_vip_ports_stack(self):
         """Update virtual IP ports stack."""
+        if not self.vip_ports_stack.is_update_required():
+            LOG.info('%s is up to date, skipping update.', self.vip_ports_stack.name)
+            return
         self.vip_ports_stack.update()
         self.vip_ports_stack.wait_until_updated()
         LOG.info('%s updated.', self.vip_ports_stack.name)
@@ -273,26 +452,34 @@ class LifeCycleManager:
     def __update_server_group_resource(self):
         """Perform VNF-LCM server group workaround for VIO."""
         LOG.info('Performing VNF-LCM server group workaround for VIO.')
-        server_group_resources = self.server_group_stack.get_resource_list(
-            additional_arguments='-n3'
+        server_group_resources = [
+            (resource['stack_name'], resource['resource_name'])
+            for resource in self.server_group_stack.get_resource_list(additional_arguments='-n3')
+            if resource['resource_type'] == 'OS::Nova::ServerGroup'
+        ]
+        if not server_group_resources:
+            LOG.info('No VNF-LCM server group resources found, workaround not required.')
+            return
+
+        def mark_unhealthy(resource):
+            openstack.openstack_client_command(
+                command_type='openstack',
+                object_type='stack',
+                action='resource mark unhealthy',
+                arguments=f'{resource[0]} {resource[1]}',
+                return_an_object=False
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(server_group_resources)) as executor:
+            list(executor.map(mark_unhealthy, server_group_resources))
+        self.server_group_stack.snapshot.invalidate()
+        openstack.wait_for_stack_resources_state(
+            resources=server_group_resources,
+            required_state='CHECK_FAILED',
+            attempts=360,
+            sleep_period=10
         )
-        for resource in server_group_resources:
-            if resource['resource_type'] == 'OS::Nova::ServerGroup':
-                openstack.openstack_client_command(
-                    command_type='openstack',
-                    object_type='stack',
-                    action='resource mark unhealthy',
-                    arguments=f'{resource["stack_name"]} {resource["resource_name"]}',
-                    return_an_object=False
-                )
-                openstack.wait_for_stack_resource_state(
-                    identifier=self.server_group_stack.name,
-                    arguments='-n3',
-                    resource_type='OS::Nova::ServerGroup',
-                    required_state='CHECK_FAILED',
-                    attempts=360,
-                    sleep_period=10
-                )
         LOG.info('VNF-LCM server group upgrade workaround for VIO complete.')
 
     def update_server_group(self, **kwargs):
@@ -309,6 +496,9 @@ class LifeCycleManager:
 
         if is_vio_deployment is True:
             self.__update_server_group_resource()
+        elif not self.server_group_stack.is_update_required():
+            LOG.info('%s is up to date, skipping update.', self.server_group_stack.name)
+            return
         self.server_group_stack.update()
         self.server_group_stack.wait_until_updated()
 
@@ -333,52 +523,31 @@ class LifeCycleManager:
         if kwargs:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
+        deployment_id = self.sed_object.sed_data['parameter_defaults']['deployment_id']
+        server_group_0 = ('server group', f'{deployment_id}_vnflcm_servergroup-0')
+        server_group_1 = ('server group', f'{deployment_id}_vnflcm_servergroup-1')
+        vim_tenant = ('project', self.sed_object.sed_data['parameter_defaults']['vim_tenant_name'])
+        external_network = ('network', external_network_name)
+        internal_network = ('network', internal_network_name)
+        security_group = ('security group', self.security_group_stack.name)
+        resources = [server_group_0, vim_tenant, external_network, internal_network,
+                     security_group]
+        if self.is_ha_configuration is True:
+            resources.append(server_group_1)
+        resources_details = openstack.get_resources_details(resources=resources)
+
         db_volume_id = volume_0_id
-        server_group_id = openstack.get_resource_attribute(
-            identifier=self.sed_object.sed_data['parameter_defaults']['deployment_id'] +
-            '_vnflcm_servergroup-0',
-            resource_type='server group',
-            attribute='id'
-        )
+        server_group_id = resources_details[server_group_0]['id']
         db_server_group_id = server_group_id
         if self.is_ha_configuration is True:
             db_volume_id = f'{db_volume_id},{volume_1_id}'
-            db_server_group_id = openstack.get_resource_attribute(
-                identifier=self.sed_object.sed_data['parameter_defaults']['deployment_id'] +
-                '_vnflcm_servergroup-1',
-                resource_type='server group',
-                attribute='id'
-            )
-        vim_tenant_id = openstack.get_resource_attribute(
-            identifier=self.sed_object.sed_data['parameter_defaults']['vim_tenant_name'],
-            resource_type='project',
-            attribute='id'
-        )
-        external_net_id = openstack.get_resource_attribute(
-            identifier=external_network_name,
-            resource_type='network',
-            attribute='id'
-        )
-        external_mtu_value = openstack.get_resource_attribute(
-            identifier=external_network_name,
-            resource_type='network',
-            attribute='mtu'
-        )
-        internal_net_id = openstack.get_resource_attribute(
-            identifier=internal_network_name,
-            resource_type='network',
-            attribute='id'
-        )
-        internal_mtu_value = openstack.get_resource_attribute(
-            identifier=internal_network_name,
-            resource_type='network',
-            attribute='mtu'
-        )
-        security_group_id = openstack.get_resource_attribute(
-            identifier=self.security_group_stack.name,
-            resource_type='security group',
-            attribute='id'
-        )
+            db_server_group_id = resources_details[server_group_1]['id']
+        vim_tenant_id = resources_details[vim_tenant]['id']
+        external_net_id = resources_details[external_network]['id']
+        external_mtu_value = resources_details[external_network]['mtu']
+        internal_net_id = resources_details[internal_network]['id']
+        internal_mtu_value = resources_details[internal_network]['mtu']
+        security_group_id = resources_details[security_group]['id']
         if not is_vio_deployment:
             self.sed_object.sed_data['parameter_defaults']['external_mtu'] = external_mtu_value
             self.sed_object.sed_data['parameter_defaults']['internal_mtu'] = internal_mtu_value
@@ -399,31 +568,136 @@ class LifeCycleManager:
         """Delete the VNF-LCM stack."""
         self.vnflcm_stack.delete()
         self.vnflcm_stack.wait_until_deleted()
+        self.remote_facts.invalidate()
         LOG.info('%s deleted.', self.vnflcm_stack.name)
 
     def create_stack(self):
         """Create the VNF-LCM stack."""
         self.vnflcm_stack.create()
         self.vnflcm_stack.wait_until_created()
-        LOG.info('Wait 10 mins before attempting to change the default VNF-LCM password...')
-        time.sleep(600)
-        for ip_address in self.services_vm_ips:
+        self.remote_facts.invalidate()
+        self.wait_for_services_vms()
+        LOG.info('%s created.', self.vnflcm_stack.name)
+
+    def wait_for_services_vms(self):
+        """
+        Wait for all VNF-LCM services VMs to be ready, probing them concurrently.
+
+        Each services VM moves through the readiness stages on its own, see
+        wait_for_services_vm. Progress is logged each time a VM passes a stage.
+
+        Raises:
+            RuntimeError: if a services VM is not ready within the readiness timeout
+        """
+        progress = {ip_address: 'tcp' for ip_address in self.services_vm_ips}
+        progress_lock = threading.Lock()
+        cancelled = threading.Event()
+
+        def report_progress(ip_address, stage):
+            with progress_lock:
+                progress[ip_address] = stage
+                LOG.info(
+                    'VNF-LCM services VM readiness: %s',
+                    ', '.join(f'{ip}: {progress[ip]}' for ip in sorted(progress))
+                )
+
+        deadline = time.time() + CONFIG.getint('vnflcm', 'readiness_timeout')
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(self.services_vm_ips)) as executor:
+            futures = [
+                executor.submit(
+                    self.wait_for_services_vm,
+                    ip_address=ip_address,
+                    deadline=deadline,
+                    cancelled=cancelled,
+                    report_progress=report_progress
+                )
+                for ip_address in self.services_vm_ips
+            ]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            finally:
+                cancelled.set()
+
+    def wait_for_services_vm(self, **kwargs):
+        """
+        Wait for a VNF-LCM services VM to pass each readiness stage in turn.
+
+        The stages are: port 22 reachable, ssh authentication with the initial
+        password, password reset, cloud-init finished, configenv available and
+        JBoss running. Commands can only be run once the password has been reset
+        so cloud-init is checked after the reset.
+
+        Args:
+            ip_address (str): services vm ip address
+            deadline (float): time by which the VM must be ready
+            cancelled (obj): threading.Event set when waiting should stop
+            report_progress (function): called with the ip address and the stage reached
+
+        Returns:
+            (dict): seconds spent in each stage
+
+        Raises:
+            RuntimeError: if the VM does not pass a stage before the deadline
+        """
+        ip_address = kwargs.pop('ip_address')
+        deadline = kwargs.pop('deadline')
+        cancelled = kwargs.pop('cancelled')
+        report_progress = kwargs.pop('report_progress')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        def probe(command, expected_output=''):
+            output = utils.probe_ssh_command(
+                ip_address=ip_address,
+                username=self.username,
+                private_key=self.private_key,
+                command=command
+            )
+            return output is not None and expected_output in output
+
+        def reset_password():
             self.__reset_password(
                 ip_address=ip_address,
                 current_password=CONFIG.get('vnflcm', 'initial_password'),
                 new_password=CONFIG.get('vnflcm', 'password')
             )
-            self.__wait_for_lcm_services_vm(
-                ip_address=ip_address,
-                max_attempts=360,
-                wait_interval=10
-            )
-            self.__wait_for_jboss_instance(
+            return True
+
+        stages = [
+            ('tcp', lambda: utils.is_port_open(ip_address=ip_address, port=22)),
+            ('ssh', lambda: utils.can_authenticate_over_ssh(
                 ip_address=ip_address,
-                max_attempts=90,
-                wait_interval=10
+                username=self.username,
+                password=CONFIG.get('vnflcm', 'initial_password')
+            )),
+            ('password reset', reset_password),
+            ('cloud-init', lambda: probe('test -f /var/lib/cloud/instance/boot-finished')),
+            ('configenv', lambda: probe('systemctl list-unit-files | grep -i configenv', 'static')),
+            ('jboss', lambda: probe('sudo service jboss status', 'jboss-as is running'))
+        ]
+        poll_interval = CONFIG.getint('vnflcm', 'readiness_poll_interval')
+        stage_timings = {}
+        for stage, is_stage_passed in stages:
+            report_progress(ip_address, stage)
+            stage_start_time = time.time()
+            while not is_stage_passed():
+                if cancelled.is_set() or time.time() > deadline:
+                    raise RuntimeError(
+                        'VNF-LCM services VM %s did not pass the %s readiness stage' %
+                        (ip_address, stage)
+                    )
+                cancelled.wait(poll_interval)
+            stage_timings[stage] = round(time.time() - stage_start_time, 1)
+            LOG.info(
+                'VNF-LCM services VM %s passed the %s stage in %s seconds',
+                ip_address, stage, stage_timings[stage]
             )
-        LOG.info('%s created.', self.vnflcm_stack.name)
+        report_progress(ip_address, 'ready')
+        LOG.info('VNF-LCM services VM %s stage timings: %s', ip_address, stage_timings)
+        return stage_timings
 
     def is_upgrade_workaround_required(self):
         """
@@ -519,79 +793,6 @@ class LifeCycleManager:
             new_password=new_password
         )
 
-    @timeout_decorator.timeout(3600)
-    def __wait_for_lcm_services_vm(self, **kwargs):
-        """
-        Wait for running VNF-LCM services VM to be available.
-
-        Args:
-            ip_address (str): vm ip address
-            max_attempts (int): number of attempts
-            wait_interval (int): wait interval in seconds
-        """
-        ip_address = kwargs.pop('ip_address')
-        max_attempts = kwargs.pop('max_attempts')
-        wait_interval = kwargs.pop('wait_interval')
-
-        if kwargs:
-            raise TypeError('Unexpected **kwargs: %r' % kwargs)
-
-        attempt = 1
-        ssh_command = 'systemctl list-unit-files | grep -i configenv'
-        while attempt < max_attempts:
-            LOG.info('waiting for VNF-LCM services VM to be available. Attempt: %d of %d',
-                     attempt, max_attempts)
-            status_check = utils.run_ssh_command(
-                ip_address=ip_address,
-                username=self.username,
-                private_key=self.private_key,
-                command=ssh_command,
-                suppress_exception=True
-            )
-            if 'static' in status_check:
-                break
-
-            LOG.info('Sleeping for %d seconds as VNF-LCM services VM not available.', wait_interval)
-            time.sleep(wait_interval)
-            attempt = attempt + 1
-
-    @timeout_decorator.timeout(1200)
-    def __wait_for_jboss_instance(self, **kwargs):
-        """
-        Wait for running Jboss instance on VNF LAF services.
-
-        Args:
-            ip_address (str): vm ip address
-            max_attempts (int): number of attempts
-            wait_interval (int): wait interval in seconds
-        """
-        ip_address = kwargs.pop('ip_address')
-        max_attempts = kwargs.pop('max_attempts')
-        wait_interval = kwargs.pop('wait_interval')
-
-        if kwargs:
-            raise TypeError('Unexpected **kwargs: %r' % kwargs)
-
-        attempt = 1
-        ssh_command = 'sudo service jboss status'
-        while attempt < max_attempts:
-            LOG.info('waiting for running Jboss instance on VNF-LCM services VM. Attempt: %d of %d',
-                     attempt, max_attempts)
-            jboss_status = utils.run_ssh_command(
-                ip_address=ip_address,
-                username=self.username,
-                private_key=self.private_key,
-                command=ssh_command,
-                suppress_exception=True
-            )
-            if 'jboss-as is running' in jboss_status:
-                break
-
-            LOG.info('Sleeping for %d seconds as there is no running Jboss instance on the \
-VNF-LCM services VM not available.', wait_interval)
-            time.sleep(wait_interval)
-            attempt = attempt + 1
-
     def enable_https(self):
         """Enable HTTPS."""
         if not self.is_https_supported:
@@ -619,141 +820,3 @@ sudo mount nfsdata:/ericsson/data/credm/ /ericsson/tor/data/credm/'
             command='sudo /opt/ericsson/ERICcredentialmanagercli/bin/credentialmanager.sh -i -x \
 /ericsson/credm/data/xmlfiles/VNFLCM_CertRequest.xml'
         )
-
-
-class LifeCycleManagerDb:
-    """
-    Represents a life cycle manager Database instance.
-
-    This class represents a lcm DB instance and provides
-    functions to manage lcm DB related tasks.
-
-    Attributes:
-        volume_instance_count (int): volume instance count identifier
-        deployment_id (str): deployment id
-        ip_address (str): ip address
-        volume_size (str): size of the volume
-    """
-
-    def __init__(self, **kwargs):
-        """Initialize a Life Cycle Manager DB object."""
-        self.volume_instance_count = kwargs.pop('volume_instance_count')
-        self.deployment_id = kwargs.pop('deployment_id')
-        self.ip_address = kwargs.pop('ip_address')
-        self.volume_size = kwargs.pop('volume_size')
-
-        if kwargs:
-            raise TypeError('Unexpected **kwargs: %r' % kwargs)
-
-    @property
-    def server_id(self):
-        """str: Return VNF-LCM DB server id."""
-        return openstack.get_server_id(
-            ip_address=self.ip_address
-        )
-
-    @property
-    def volume_id(self):
-        """str: Return attached volume id."""
-        server_details = openstack.openstack_client_command(
-            command_type='openstack',
-            object_type='server',
-            action='show',
-            arguments=self.server_id,
-            return_an_object=True
-        )
-        try:
-            attached_volume_id = server_details['volumes_attached'][0]['id']
-        except IndexError:
-            LOG.error('No volume is attached to the VNF-LCM DB with the ID: %s', self.server_id)
-            raise
-
-        return attached_volume_id
-
-    @property
-    def volume_name(self):
-        """str: Return VNF-LCM DB volume name."""
-        return f'{self.deployment_id}_vnflcm_volume_{self.volume_instance_count}'
-
-    @property
-    def volume_snapshot_name(self):
-        """str: Return VNF-LCM DB volume snapshot name."""
-        return f'{self.volume_name}_snapshot'
-
-    @property
-    def backup_volume_name(self):
-        """str: Return VNF-LCM DB backup volume name."""
-        return f'{self.volume_name}_backup'
-
-    @property
-    def backup_volume_id(self):
-        """str: Return VNF-LCM DB volume id."""
-        backup_volume_object = openstack.openstack_client_command(
-            command_type='openstack',
-            object_type='volume',
-            action='show',
-            arguments=self.backup_volume_name,
-            return_an_object=True
-        )
-        return backup_volume_object['id']
-
-    def create_snapshot_volume(self):
-        """Create VNF-LCM volume snapshot."""
-        openstack.delete_volume_snapshot(
-            volume_snapshot_name=self.volume_snapshot_name
-        )
-        openstack.create_volume_snapshot(
-            volume_id=self.volume_id,
-            snapshot_name=self.volume_snapshot_name
-        )
-
-    def does_volume_snapshot_exist(self):
-        """
-        Return True if volume snapshot exists.
-
-        Returns:
-            (bool): True | False
-        """
-        snapshot_list = openstack.openstack_client_command(
-            command_type='openstack',
-            object_type='volume snapshot',
-            action='list',
-            arguments='--limit 1000000',
-            return_an_object=True
-        )
-        return any(snapshot['Name'] == self.volume_snapshot_name for snapshot in snapshot_list)
-
-    def create_backup_volume(self):
-        """Create VNF-LCM backup volume."""
-        openstack.delete_volume(
-            volume_name=self.backup_volume_name
-        )
-        openstack.create_volume(
-            volume_size=self.volume_size,
-            volume_name=self.backup_volume_name,
-            arguments=f'--snapshot {self.volume_snapshot_name}'
-        )
-        self.delete_volume_snapshot()
-
-    def delete_volume(self):
-        """Delete DB volume."""
-        openstack.delete_volume(
-            volume_name=self.volume_name
-        )
-
-    def delete_volume_snapshot(self):
-        """Delete VNF-LCM volume snapshot."""
-        openstack.delete_volume_snapshot(
-            volume_snapshot_name=self.volume_snapshot_name
-        )
-
-    def reset_volume_name(self):
-        """Reset backup volume name to volume name."""
-        openstack.openstack_client_command(
-            command_type='openstack',
-            object_type='volume',
-            action='set',
-            arguments=f'{self.backup_volume_id} --name {self.volume_name}',
-            return_an_object=False
-        )
-        LOG.info('%s name successfully reset to %s', self.backup_volume_name, self.volume_name)
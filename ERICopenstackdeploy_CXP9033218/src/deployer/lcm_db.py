@@ -0,0 +1,262 @@
+"""This file contains logic relating to the life cycle manager database."""
+
+import logging
+import re
+from . import openstack
+from . import utils
+
+LOG = logging.getLogger(__name__)
+
+PRESTAGED_FROM_SNAPSHOT_PROPERTY = 'deployer_prestaged_from_snapshot'
+
+
+class LifeCycleManagerDb:
+    """
+    Represents a life cycle manager Database instance.
+
+    This class represents a lcm DB instance and provides
+    functions to manage lcm DB related tasks.
+
+    Attributes:
+        volume_instance_count (int): volume instance count identifier
+        deployment_id (str): deployment id
+        ip_address (str): ip address
+        volume_size (str): size of the volume
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize a Life Cycle Manager DB object."""
+        self.volume_instance_count = kwargs.pop('volume_instance_count')
+        self.deployment_id = kwargs.pop('deployment_id')
+        self.ip_address = kwargs.pop('ip_address')
+        self.volume_size = kwargs.pop('volume_size')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    @property
+    def server_id(self):
+        """str: Return VNF-LCM DB server id."""
+        return openstack.get_server_id(
+            ip_address=self.ip_address
+        )
+
+    @property
+    def volume_id(self):
+        """str: Return attached volume id."""
+        server_details = openstack.openstack_client_command(
+            command_type='openstack',
+            object_type='server',
+            action='show',
+            arguments=self.server_id,
+            return_an_object=True
+        )
+        try:
+            attached_volume_id = server_details['volumes_attached'][0]['id']
+        except IndexError:
+            LOG.error('No volume is attached to the VNF-LCM DB with the ID: %s', self.server_id)
+            raise
+
+        return attached_volume_id
+
+    @property
+    def volume_name(self):
+        """str: Return VNF-LCM DB volume name."""
+        return f'{self.deployment_id}_vnflcm_volume_{self.volume_instance_count}'
+
+    @property
+    def volume_snapshot_name(self):
+        """str: Return VNF-LCM DB volume snapshot name."""
+        return f'{self.volume_name}_snapshot'
+
+    @property
+    def backup_volume_name(self):
+        """str: Return VNF-LCM DB backup volume name."""
+        return f'{self.volume_name}_backup'
+
+    @property
+    def backup_volume_id(self):
+        """str: Return VNF-LCM DB volume id."""
+        backup_volume_object = openstack.openstack_client_command(
+            command_type='openstack',
+            object_type='volume',
+            action='show',
+            arguments=self.backup_volume_name,
+            return_an_object=True
+        )
+        return backup_volume_object['id']
+
+    @property
+    def volume_snapshot_id(self):
+        """str: Return VNF-LCM DB volume snapshot id."""
+        volume_snapshot_object = openstack.openstack_client_command(
+            command_type='openstack',
+            object_type='volume snapshot',
+            action='show',
+            arguments=self.volume_snapshot_name,
+            return_an_object=True
+        )
+        return volume_snapshot_object['id']
+
+    def create_snapshot_volume(self):
+        """Create VNF-LCM volume snapshot."""
+        if self.__get_prestaged_snapshot_id(self.__get_backup_volume()) is not None:
+            LOG.info('Deleting backup volume pre-staged from the previous volume snapshot')
+            openstack.delete_volume(
+                volume_name=self.backup_volume_name
+            )
+        openstack.delete_volume_snapshot(
+            volume_snapshot_name=self.volume_snapshot_name
+        )
+        openstack.create_volume_snapshot(
+            volume_id=self.volume_id,
+            snapshot_name=self.volume_snapshot_name
+        )
+
+    def does_volume_snapshot_exist(self):
+        """
+        Return True if volume snapshot exists.
+
+        Returns:
+            (bool): True | False
+        """
+        snapshot_list = openstack.openstack_client_command(
+            command_type='openstack',
+            object_type='volume snapshot',
+            action='list',
+            arguments='--limit 1000000',
+            return_an_object=True
+        )
+        return any(snapshot['Name'] == self.volume_snapshot_name for snapshot in snapshot_list)
+
+    def prestage_backup_volume(self):
+        """
+        Start creating the VNF-LCM backup volume from the volume snapshot, without waiting.
+
+        The volume is given the backup volume name and a property holding the id
+        of the snapshot it is created from, so a later rollback can reuse it. A
+        backup volume left over from an earlier snapshot is deleted first.
+        """
+        openstack.delete_volume(
+            volume_name=self.backup_volume_name
+        )
+        volume_snapshot_id = self.volume_snapshot_id
+        openstack.openstack_client_command(
+            command_type='openstack',
+            object_type='volume',
+            action='create',
+            arguments=f'--size {self.volume_size} --snapshot {volume_snapshot_id} \
+--property {PRESTAGED_FROM_SNAPSHOT_PROPERTY}={volume_snapshot_id} {self.backup_volume_name}'
+        )
+        LOG.info(
+            'Pre-staging backup volume %s from %s in the background',
+            self.backup_volume_name, self.volume_snapshot_name
+        )
+
+    def __get_backup_volume(self):
+        """
+        Return the details of the backup volume.
+
+        Returns:
+            (dict): backup volume details, or None if there is no backup volume
+        """
+        try:
+            return openstack.openstack_client_command(
+                command_type='openstack',
+                object_type='volume',
+                action='show',
+                arguments=self.backup_volume_name,
+                return_an_object=True
+            )
+        except utils.CliNonZeroExitCodeException:
+            return None
+
+    @staticmethod
+    def __get_prestaged_snapshot_id(backup_volume):
+        """
+        Return the id of the volume snapshot the backup volume was pre-staged from.
+
+        Args:
+            backup_volume (dict): backup volume details, or None
+
+        Returns:
+            (str): volume snapshot id, or None if the backup volume was not pre-staged
+        """
+        if backup_volume is None:
+            return None
+        properties = backup_volume.get('properties') or {}
+        if isinstance(properties, str):
+            match = re.search(f"{PRESTAGED_FROM_SNAPSHOT_PROPERTY}='([^']*)'", properties)
+            return match.group(1) if match else None
+        return properties.get(PRESTAGED_FROM_SNAPSHOT_PROPERTY)
+
+    def __is_backup_volume_prestaged(self, backup_volume):
+        """
+        Return True if the backup volume was pre-staged from the current volume snapshot.
+
+        Args:
+            backup_volume (dict): backup volume details, or None
+
+        Returns:
+            (bool): True | False
+        """
+        prestaged_snapshot_id = self.__get_prestaged_snapshot_id(backup_volume)
+        if prestaged_snapshot_id is None:
+            return False
+        try:
+            return prestaged_snapshot_id == self.volume_snapshot_id
+        except utils.CliNonZeroExitCodeException:
+            return False
+
+    def create_backup_volume(self):
+        """
+        Create VNF-LCM backup volume, reusing a pre-staged one if there is one.
+
+        A pre-staged backup volume that ends up in a bad state is replaced by
+        one created from the volume snapshot.
+        """
+        if self.__is_backup_volume_prestaged(self.__get_backup_volume()):
+            LOG.info('Reusing pre-staged backup volume: %s', self.backup_volume_name)
+            try:
+                openstack.wait_for_openstack_object_state(
+                    'volume', self.backup_volume_name, 'available', 420, 10
+                )
+                self.delete_volume_snapshot()
+                return
+            except openstack.BadOpenstackObjectStateException:
+                LOG.warning(
+                    'The pre-staged backup volume %s failed, creating it again',
+                    self.backup_volume_name
+                )
+        openstack.delete_volume(
+            volume_name=self.backup_volume_name
+        )
+        openstack.create_volume(
+            volume_size=self.volume_size,
+            volume_name=self.backup_volume_name,
+            arguments=f'--snapshot {self.volume_snapshot_name}'
+        )
+        self.delete_volume_snapshot()
+
+    def delete_volume(self):
+        """Delete DB volume."""
+        openstack.delete_volume(
+            volume_name=self.volume_name
+        )
+
+    def delete_volume_snapshot(self):
+        """Delete VNF-LCM volume snapshot."""
+        openstack.delete_volume_snapshot(
+            volume_snapshot_name=self.volume_snapshot_name
+        )
+
+    def reset_volume_name(self):
+        """Reset backup volume name to volume name."""
+        openstack.openstack_client_command(
+            command_type='openstack',
+            object_type='volume',
+            action='set',
+            arguments=f'{self.backup_volume_id} --name {self.volume_name}',
+            return_an_object=False
+        )
+        LOG.info('%s name successfully reset to %s', self.backup_volume_name, self.volume_name)
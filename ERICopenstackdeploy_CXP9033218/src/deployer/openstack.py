@@ -5,19 +5,26 @@ It contains logic relating to interaction with the openstack clients
 """
 
 import logging
+import concurrent.futures
 import json
 import os.path
 import time
 import re
 import pprint
-import yaml
+import threading
 from deployer.utils import CliNonZeroExitCodeException
 import deployer.utils as utils
 from deployer.utils import cached
+from . import cache
 from . import configuration
+from .lazy import lazy_import
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
+yaml = lazy_import('yaml')  # pylint: disable=C0103
+STACK_SNAPSHOTS = {}
+STACK_SNAPSHOTS_LOCK = threading.Lock()
+HEAT_NOT_FOUND_PATTERN = re.compile(r'\b(Stack|Stack or resource|Resource) not found: ')
 
 # pylint: disable=C0302
 
@@ -61,6 +68,8 @@ def openstack_client_command(**kwargs):
         arguments (str): arguments
         return_an_object (boolean, optional): return an object, defaults to True
         is_vio_deployment (boolean, optional): is vio deployment, defaults to False
+        input_stream (obj, optional): file like object streamed to the command's
+            standard input, defaults to None
 
     Returns:
         (obj): Command line response
@@ -72,6 +81,7 @@ def openstack_client_command(**kwargs):
     arguments = kwargs.pop('arguments')
     return_an_object = kwargs.pop('return_an_object', True)
     is_vio_deployment = kwargs.pop('is_vio_deployment', False)
+    input_stream = kwargs.pop('input_stream', None)
 
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
@@ -84,15 +94,18 @@ def openstack_client_command(**kwargs):
     if return_an_object:
         command_and_arguments += ' -f json'
 
+    # The region is set for this command only, as commands run concurrently
+    environment = dict(os.environ)
     if command_requires_region and is_vio_deployment is False:
-        os.environ['OS_REGION_NAME'] = 'regionOne'
+        environment['OS_REGION_NAME'] = 'regionOne'
     elif command_requires_region and is_vio_deployment is True:
-        os.environ['OS_REGION_NAME'] = 'nova'
+        environment['OS_REGION_NAME'] = 'nova'
     else:
-        if 'OS_REGION_NAME' in os.environ:
-            del os.environ['OS_REGION_NAME']
+        environment.pop('OS_REGION_NAME', None)
 
-    cli_command_output = utils.run_cli_command(command_and_arguments)
+    cli_command_output = utils.run_cli_command(
+        command_and_arguments, input_stream=input_stream, environment=environment
+    )
     cli_command_standard_output = cli_command_output['standard_output']
     return json.loads(cli_command_standard_output) if return_an_object else None
 
@@ -131,7 +144,7 @@ def wait_for_openstack_object_state(
         },
         'volume': {
             'state_key': 'status',
-            'bad_states': ['CREATE_FAILED', 'DELETE_FAILED'],
+            'bad_states': ['CREATE_FAILED', 'DELETE_FAILED', 'error'],
             'does_not_exist_string': f"No volume with a name or ID of '{identifier}' exists."
         },
         'volume snapshot': {
@@ -200,25 +213,25 @@ Current State: %s', identifier, object_type, required_state, object_details[stat
     raise Exception('The object wasnt in a good state after the given number of attempts')
 
 
-def wait_for_stack_resource_state(**kwargs):
+def wait_for_stack_resources_state(**kwargs):
     """
-    Wait for the given openstack stack resource to be in the required state.
+    Wait for the given stack resources to all be in the required state.
+
+    Only the resources not yet in the required state are shown on each
+    attempt, concurrently.
 
     Args:
-        identifier (str): identifier
-        arguments (str): additional arguments
-        resource_type (str): stack resource type
-        required_state (str): stack required state
-        attempts (str): number of attempts
-        sleep_period (str): sleep period in seconds
+        resources (list): (stack name, resource name) tuples
+        required_state (str): stack resource required state
+        attempts (int): number of attempts
+        sleep_period (int): sleep period in seconds
 
     Raises:
-        OpenstackObjectDoesNotExist: if openstack object does not exists
-        CliNonZeroExitCodeException: if the commands fails with a non-zero exit code
+        OpenstackObjectDoesNotExist: if a stack resource does not exist
+        BadOpenstackObjectStateException: if a stack resource is in a failed state
+        Exception: if the resources are not in the required state after the given attempts
     """
-    identifier = kwargs.pop('identifier')
-    arguments = kwargs.pop('arguments')
-    resource_type = kwargs.pop('resource_type')
+    resources = kwargs.pop('resources')
     required_state = kwargs.pop('required_state')
     attempts = kwargs.pop('attempts')
     sleep_period = kwargs.pop('sleep_period')
@@ -226,46 +239,48 @@ def wait_for_stack_resource_state(**kwargs):
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    bad_states = {'bad_states': ['CREATE_FAILED', 'DELETE_FAILED', 'UPDATE_FAILED']}
-    does_not_exist_string = {'does_not_exist_string': f'Stack not found: {identifier}'}
-
+    bad_states = ['CREATE_FAILED', 'DELETE_FAILED', 'UPDATE_FAILED']
+    pending_resources = [f'{stack_name} {resource_name}' for stack_name, resource_name in resources]
     LOG.info(
-        'Waiting until stack resource (%s) is in the required state (%s)',
-        identifier, required_state
+        'Waiting until stack resources (%s) are in the required state (%s)',
+        ', '.join(pending_resources), required_state
     )
     count = 1
-    while count < attempts:
+    while pending_resources and count < attempts:
         try:
-            stack_resource_details = openstack_client_command(
-                command_type='openstack',
-                object_type='stack',
-                action='resource list',
-                arguments=f'{identifier} {arguments}'
+            resources_details = get_resources_details(
+                resources=[('stack resource', resource) for resource in pending_resources]
             )
-            resource_details = next(resource for resource in stack_resource_details
-                                    if resource['resource_type'] == resource_type)
         except CliNonZeroExitCodeException as exception:
-            if does_not_exist_string in str(exception):
+            if HEAT_NOT_FOUND_PATTERN.search(str(exception)):
                 raise OpenstackObjectDoesNotExist(
-                    'The stack resource (%s) does not exist' % identifier
-                )
+                    'A stack resource (%s) does not exist' % ', '.join(pending_resources)
+                ) from exception
             raise
 
-        if resource_details['resource_status'] in bad_states:
-            determine_and_raise_exception(resource_details, 'stack', identifier, 'resource_status')
-
-        if resource_details['resource_status'] == required_state:
-            LOG.info('Now the stack resource (%s) is in the required state.', identifier)
-            return resource_details
+        for resource in list(pending_resources):
+            resource_details = resources_details[('stack resource', resource)]
+            if resource_details['resource_status'] in bad_states:
+                determine_and_raise_exception(
+                    resource_details, 'stack', resource, 'resource_status'
+                )
+            if resource_details['resource_status'] == required_state:
+                LOG.info('Now the stack resource (%s) is in the required state.', resource)
+                pending_resources.remove(resource)
+
+        if pending_resources:
+            LOG.info(
+                'Sleeping as stack resources (%s) are not in the required state (%s) yet',
+                ', '.join(pending_resources), required_state
+            )
+            count += 1
+            time.sleep(sleep_period)
 
-        LOG.info(
-            'Sleeping as stack resource (%s) is not in the required state yet. Required State: %s. \
-            Current State: %s', required_state, identifier, resource_details['resource_status']
+    if pending_resources:
+        raise Exception(
+            'The stack resources (%s) werent in the expected state after the given number of \
+attempts' % ', '.join(pending_resources)
         )
-        count += 1
-        time.sleep(sleep_period)
-
-    raise Exception('The object wasnt in the expected state after the given number of attempts')
 
 
 def determine_and_raise_exception(object_details, object_type, identifier, state_key):
@@ -607,7 +622,9 @@ def download_and_extract_templates(**kwargs):
     Download the cloud templates package and extracts them.
 
     Depending on whether the cloud templates are in zip or rpm format,
-    they are either extracted, or yum installed
+    they are either unzipped, or the rpm payload is extracted. Released
+    packages are extracted once into the deployer cache and reused by later
+    commands, SNAPSHOT packages are always downloaded again.
 
     Args:
         url (str): cloud templates url
@@ -620,35 +637,93 @@ def download_and_extract_templates(**kwargs):
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    templates_extracted_dir_base = os.path.join(
-        utils.get_temporary_directory_path(),
-        'cloud-templates'
-    )
-    os.makedirs(templates_extracted_dir_base)
+    if is_template_cache_enabled(url=url):
+        cache_entry_name = os.path.join('templates', os.path.basename(url))
+        templates_dir_base = cache.get_directory_entry(name=cache_entry_name)
+        if templates_dir_base is None:
+            templates_dir_base = cache.populate_directory_entry(
+                name=cache_entry_name,
+                populate=lambda directory: extract_templates(url=url, directory=directory)
+            )
+        else:
+            LOG.info('Using cached cloud templates: %s', templates_dir_base)
+        if templates_dir_base is not None:
+            return get_extracted_templates_dir(url=url, directory=templates_dir_base)
+
+    templates_dir_base = os.path.join(utils.get_temporary_directory_path(), 'cloud-templates')
+    os.makedirs(templates_dir_base)
+    extract_templates(url=url, directory=templates_dir_base)
+    return get_extracted_templates_dir(url=url, directory=templates_dir_base)
+
+
+def is_template_cache_enabled(**kwargs):
+    """
+    Return True if the extracted templates of the given package can be cached.
+
+    Args:
+        url (str): templates package url
+
+    Returns:
+        (bool): True | False
+    """
+    url = kwargs.pop('url')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    return (CONFIG.getboolean('template_cache', 'enabled') and
+            'SNAPSHOT' not in os.path.basename(url).upper())
+
+
+def extract_templates(**kwargs):
+    """
+    Download a cloud templates package and extract it into a directory.
+
+    The downloaded package is removed once it is extracted.
+
+    Args:
+        url (str): cloud templates url
+        directory (str): directory to extract to
+    """
+    url = kwargs.pop('url')
+    directory = kwargs.pop('directory')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
     cloud_templates_file_path = utils.download_file(
         url=url,
-        destination_directory=templates_extracted_dir_base
+        destination_directory=directory
     )
     if cloud_templates_file_path.endswith('.zip'):
-        utils.unzip_file(cloud_templates_file_path, templates_extracted_dir_base)
-        first_extracted_subdirectory = next(os.walk(templates_extracted_dir_base))[1][0]
-        cloud_templates_extracted_dir = os.path.join(
-            templates_extracted_dir_base,
-            first_extracted_subdirectory
-        )
+        utils.unzip_file(cloud_templates_file_path, directory)
     else:
-        if os.geteuid() == 0:
-            sudo_string = ''
-        else:
-            sudo_string = 'sudo'
-        artifact_id = os.path.basename(url).split('-')[0]
-        utils.run_cli_command(
-            f'{sudo_string} yum remove -y {artifact_id}'
-        )
-        utils.run_cli_command(f'{sudo_string} rpm -iv --nodeps {cloud_templates_file_path}')
-        cloud_templates_extracted_dir = os.path.join(CONFIG.get('enm', 'rpm_install_path'),
-                                                     artifact_id)
-    return cloud_templates_extracted_dir
+        utils.extract_rpm(file_path=cloud_templates_file_path, extract_directory=directory)
+    os.remove(cloud_templates_file_path)
+
+
+def get_extracted_templates_dir(**kwargs):
+    """
+    Return the cloud templates directory within an extracted templates package.
+
+    Args:
+        url (str): cloud templates url
+        directory (str): directory the package was extracted to
+
+    Returns:
+        (str): cloud templates extracted directory
+    """
+    url = kwargs.pop('url')
+    directory = kwargs.pop('directory')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    if os.path.basename(url).endswith('.zip'):
+        return os.path.join(directory, next(os.walk(directory))[1][0])
+    artifact_id = os.path.basename(url).split('-')[0]
+    return os.path.join(directory, CONFIG.get('enm', 'rpm_install_path').lstrip('/'),
+                        artifact_id)
 
 
 @cached
@@ -723,6 +798,36 @@ def get_resource_attribute(**kwargs):
     return resource_details[attribute]
 
 
+def get_resources_details(**kwargs):
+    """
+    Return the details of several resources, shown concurrently.
+
+    Each distinct resource is only shown once, however often it is listed.
+
+    Args:
+        resources (list): (resource type, identifier) tuples
+
+    Returns:
+        (dict): resource details keyed by (resource type, identifier)
+    """
+    resources = kwargs.pop('resources')
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    unique_resources = list(dict.fromkeys(resources))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(unique_resources)) as executor:
+        resources_details = executor.map(
+            lambda resource: openstack_client_command(
+                command_type='openstack',
+                object_type=resource[0],
+                action='show',
+                arguments=resource[1]
+            ),
+            unique_resources
+        )
+        return dict(zip(unique_resources, resources_details))
+
+
 def get_server_id(**kwargs):
     """
     Return the server id from a given ip address.
@@ -827,6 +932,191 @@ def delete_existing_key_pair(key_pair_name):
     LOG.info('Existing key pair: %s deleted', key_pair_name)
 
 
+class StackSnapshot:
+    """
+    Represents a stack as last fetched from Heat.
+
+    The stack details (status, outputs and parameters) are fetched with one
+    stack show, the template with one stack template show, and each resource
+    list once per set of arguments, until the snapshot is invalidated by a
+    create, update or delete of the stack.
+
+    Attributes:
+        name (str): stack name
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize a StackSnapshot object."""
+        self.name = kwargs.pop('name')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        self.lock = threading.Lock()
+        self.details = None
+        self.template = None
+        self.resource_lists = {}
+
+    def get_details(self):
+        """
+        Return the stack details, fetching them if not already known.
+
+        Returns:
+            (dict): stack show response
+        """
+        with self.lock:
+            if self.details is None:
+                self.details = openstack_client_command(
+                    command_type='openstack',
+                    object_type='stack',
+                    action='show',
+                    arguments=self.name
+                )
+            return self.details
+
+    def get_template(self):
+        """
+        Return the template the stack was last created or updated with.
+
+        Returns:
+            (dict): stack template show response
+        """
+        with self.lock:
+            if self.template is None:
+                self.template = openstack_client_command(
+                    command_type='openstack',
+                    object_type='stack',
+                    action='template show',
+                    arguments=self.name
+                )
+            return self.template
+
+    @property
+    def status(self):
+        """str: Return the stack status."""
+        return self.get_details()['stack_status']
+
+    @property
+    def outputs(self):
+        """dict: Return the stack output values keyed by output key."""
+        return {
+            output['output_key']: output['output_value']
+            for output in self.get_details().get('outputs') or []
+        }
+
+    @property
+    def parameters(self):
+        """dict: Return the stack parameters."""
+        return self.get_details()['parameters']
+
+    def get_resource_list(self, **kwargs):
+        """
+        Return the stack resource list, fetching it if not already known.
+
+        Args:
+            additional_arguments (str, optional): additional arguments, defaults to empty string
+
+        Returns:
+            (obj): Command line response
+        """
+        additional_arguments = kwargs.pop('additional_arguments', '')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        with self.lock:
+            if additional_arguments not in self.resource_lists:
+                self.resource_lists[additional_arguments] = openstack_client_command(
+                    command_type='openstack',
+                    object_type='stack resource',
+                    action='list',
+                    arguments=f'{self.name} {additional_arguments}'
+                )
+            return self.resource_lists[additional_arguments]
+
+    def invalidate(self):
+        """Forget the fetched details and resource lists."""
+        with self.lock:
+            self.details = None
+            self.template = None
+            self.resource_lists = {}
+
+
+def normalize_comma_delimited_list(value):
+    """
+    Return a comma delimited list parameter value as a list of stripped strings.
+
+    Args:
+        value (obj): list or comma separated string
+
+    Returns:
+        (list): list items
+    """
+    if isinstance(value, list):
+        value = ','.join(str(item) for item in value)
+    return [item.strip() for item in str(value).split(',')]
+
+
+PARAMETER_VALUE_NORMALIZERS = {
+    'number': float,
+    'boolean': lambda value: str(value).lower(),
+    'comma_delimited_list': normalize_comma_delimited_list,
+    'json': lambda value: json.loads(value) if isinstance(value, str) else value
+}
+
+
+def parameter_values_match(**kwargs):
+    """
+    Return True if a local parameter value equals the value Heat shows for it.
+
+    Heat shows every parameter value as a string, so both values are
+    normalized for the parameter type before they are compared.
+
+    Args:
+        parameter_type (str): heat parameter type
+        local_value (obj): local parameter value
+        stack_value (str): parameter value shown by heat
+
+    Returns:
+        (bool): True | False
+    """
+    parameter_type = kwargs.pop('parameter_type')
+    local_value = kwargs.pop('local_value')
+    stack_value = kwargs.pop('stack_value')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    if local_value is None or stack_value is None:
+        return local_value is None and stack_value is None
+    normalize = PARAMETER_VALUE_NORMALIZERS.get(parameter_type, str)
+    try:
+        return normalize(local_value) == normalize(stack_value)
+    except ValueError:
+        return False
+
+
+def get_stack_snapshot(**kwargs):
+    """
+    Return the snapshot of the given stack, shared for the whole run.
+
+    Args:
+        stack_name (str): stack name
+
+    Returns:
+        (StackSnapshot): stack snapshot
+    """
+    stack_name = kwargs.pop('stack_name')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    with STACK_SNAPSHOTS_LOCK:
+        if stack_name not in STACK_SNAPSHOTS:
+            STACK_SNAPSHOTS[stack_name] = StackSnapshot(name=stack_name)
+        return STACK_SNAPSHOTS[stack_name]
+
+
 class Stack:
     """
     This object contains fields and methods relating to a stack.
@@ -837,6 +1127,7 @@ class Stack:
         param_file_path (str, optional): parameter file path directory, defaults to None
         heat_stack_details (dict): heat stack details
         extra_arguments (str, optional): extra arguments, defaults to empty string
+        snapshot (StackSnapshot): stack as last fetched from Heat
     """
 
     def __init__(self, name, stack_file_path, param_file_path=None, extra_arguments=''):
@@ -846,10 +1137,12 @@ class Stack:
         self.param_file_path = param_file_path
         self.heat_stack_details = {}
         self.extra_arguments = extra_arguments
+        self.snapshot = get_stack_snapshot(stack_name=name)
 
     def create(self):
         """obj: Create the given stack in openstack."""
         param_file_args = f' -e {self.param_file_path}' if self.param_file_path is not None else ''
+        self.snapshot.invalidate()
         self.heat_stack_details = openstack_client_command(
             command_type='openstack',
             object_type='stack',
@@ -861,6 +1154,7 @@ class Stack:
 
     def update(self):
         """Update the given stack in openstack."""
+        self.snapshot.invalidate()
         self.heat_stack_details = openstack_client_command(
             command_type='openstack',
             object_type='stack',
@@ -869,6 +1163,93 @@ class Stack:
 {self.extra_arguments}'
         )
 
+    def is_update_required(self):
+        """
+        Return True if updating the stack with its template and parameters could change it.
+
+        The local template and the parameters it declares, resolved from the
+        parameter file and the template defaults, are compared with the
+        template and parameters Heat holds for the stack. Anything that cannot
+        be compared reliably counts as a change, see _needs_forced_update and
+        _find_change.
+
+        Returns:
+            (bool): True | False
+        """
+        reason = self._needs_forced_update()
+        if reason is None:
+            with open(self.stack_file_path, 'r') as file_object:
+                local_template = json.loads(json.dumps(yaml.safe_load(file_object), default=str))
+            with open(self.param_file_path, 'r') as file_object:
+                environment = yaml.safe_load(file_object) or {}
+            reason = self._find_change(local_template=local_template, environment=environment)
+        if reason is not None:
+            LOG.info('An update of %s is required: %s', self.name, reason)
+            return True
+        LOG.info('The template and parameters of %s are unchanged', self.name)
+        return False
+
+    def _needs_forced_update(self):
+        """
+        Return why the stack must be updated without comparing it, if it must.
+
+        A stack that is not in a COMPLETE state, or that is updated with extra
+        arguments or without a parameter file, is always updated.
+
+        Returns:
+            (str): the reason, or None if the stack can be compared
+        """
+        status = self.snapshot.status
+        if not status.endswith('_COMPLETE') or status.startswith('DELETE'):
+            return f'the stack is {status}'
+        if self.extra_arguments.strip() or self.param_file_path is None:
+            return 'extra arguments are used or there is no parameter file'
+        return None
+
+    def _find_change(self, **kwargs):
+        """
+        Return the first difference between the local and the deployed stack definition.
+
+        A parameter file with more than parameter_defaults, a template using
+        get_file or nested templates, and hidden parameters count as a change
+        as they can not be compared reliably.
+
+        Args:
+            local_template (dict): local template
+            environment (dict): local parameter file
+
+        Returns:
+            (str): the difference, or None if there is none
+        """
+        local_template = kwargs.pop('local_template')
+        environment = kwargs.pop('environment')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        template_parameters = local_template.get('parameters') or {}
+        if set(environment) - {'parameter_defaults'}:
+            return 'the parameter file has more than parameter_defaults'
+        if 'get_file' in json.dumps(local_template) or any(
+                '/' in str(resource.get('type', '')) or
+                str(resource.get('type', '')).endswith(('.yaml', '.yml', '.template'))
+                for resource in (local_template.get('resources') or {}).values()):
+            return 'the template uses files or nested templates'
+        if any(parameter.get('hidden') for parameter in template_parameters.values()):
+            return 'the template has hidden parameters'
+        if local_template != self.snapshot.get_template():
+            return 'the template has changed'
+
+        parameter_defaults = environment.get('parameter_defaults') or {}
+        stack_parameters = self.snapshot.parameters
+        for parameter_name, parameter in template_parameters.items():
+            if not parameter_values_match(
+                    parameter_type=parameter.get('type', 'string'),
+                    local_value=parameter_defaults.get(parameter_name, parameter.get('default')),
+                    stack_value=stack_parameters.get(parameter_name)):
+                return f'parameter {parameter_name} has changed'
+        return None
+
     def set_lvs_vip_to_fip_ips(self, port_id):
         """Set the floating ips for the lvs router."""
         floating_ip = \
@@ -961,6 +1342,7 @@ class Stack:
         Raises:
             CliNonZeroExitCodeException: if the commands fails with a non-zero exit code
         """
+        self.snapshot.invalidate()
         if not self.already_exists():
             LOG.info('A stack of name %s does not exist, nothing to delete', self.name)
         else:
@@ -981,18 +1363,21 @@ class Stack:
         wait_for_openstack_object_state(
             'stack', self.heat_stack_details['stack_name'], 'CREATE_COMPLETE', 360, 10
         )
+        self.snapshot.invalidate()
 
     def wait_until_updated(self):
         """Wait for the stack to be updated."""
         wait_for_openstack_object_state(
             'stack', self.heat_stack_details['stack_name'], 'UPDATE_COMPLETE', 360, 10
         )
+        self.snapshot.invalidate()
 
     def wait_until_deleted(self):
         """Wait for the stack to be deleted."""
         wait_for_os_object_to_delete(
             'stack', self.name, 360, 10
         )
+        self.snapshot.invalidate()
 
     def already_exists(self):
         """
@@ -1023,12 +1408,7 @@ class Stack:
 
         if kwargs:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
-        return openstack_client_command(
-            command_type='openstack',
-            object_type='stack',
-            action='output show',
-            arguments=f'{self.name} {output_key}'
-        )['output_value']
+        return self.snapshot.outputs[output_key]
 
     def get_resource_list(self, **kwargs):
         """
@@ -1045,12 +1425,7 @@ class Stack:
         if kwargs:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-        return openstack_client_command(
-            command_type='openstack',
-            object_type='stack resource',
-            action='list',
-            arguments=f'{self.name} {additional_arguments}'
-        )
+        return self.snapshot.get_resource_list(additional_arguments=additional_arguments)
 
 
 def get_external_subnet_id(**kwargs):
@@ -1469,15 +1844,10 @@ def get_private_ssh_key(**kwargs):
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    stack = openstack_client_command(
-        command_type='openstack',
-        object_type='stack',
-        action='show',
-        arguments=key_pair_stack_name
-    )
+    stack_outputs = get_stack_snapshot(stack_name=key_pair_stack_name).outputs
     try:
-        return {'private_key': key.get('output_value') for key in stack.get('outputs')
-                if 'private' in key.get('output_key')}['private_key']
+        return {'private_key': output_value for output_key, output_value in stack_outputs.items()
+                if 'private' in output_key}['private_key']
     except KeyError:
         raise Exception('Unable to retrieve the private SSH key from: %s stack' %
                         key_pair_stack_name)
@@ -1500,15 +1870,10 @@ def get_public_ssh_key(**kwargs):
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    stack = openstack_client_command(
-        command_type='openstack',
-        object_type='stack',
-        action='show',
-        arguments=key_pair_stack_name
-    )
+    stack_outputs = get_stack_snapshot(stack_name=key_pair_stack_name).outputs
     try:
-        return {'public_key': key.get('output_value') for key in stack.get('outputs')
-                if 'public' in key.get('output_key')}['public_key']
+        return {'public_key': output_value for output_key, output_value in stack_outputs.items()
+                if 'public' in output_key}['public_key']
     except KeyError:
         raise Exception(
             'Unable to retrieve the public SSH key from: %s stack' % key_pair_stack_name
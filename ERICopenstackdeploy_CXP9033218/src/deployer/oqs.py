@@ -3,14 +3,14 @@
 import json
 import logging
 import time
-import requests
-from requests.exceptions import RequestException
 from retrying import retry
 from . import configuration
+from .lazy import lazy_import
 
-AUTH = configuration.FunctionalIdConfig()
+AUTH = configuration.get_functional_id_config()
 LOG = logging.getLogger(__name__)
 MAX_RETRY = 3
+requests = lazy_import('requests')  # pylint: disable=C0103
 
 
 class OqsException(Exception):
@@ -55,7 +55,7 @@ class Deployment:
                     "jobType": job_type
                 })
             )['newDeployment']['_id']
-        except RequestException as err:
+        except requests.exceptions.RequestException as err:
             raise err
 
     @staticmethod
@@ -64,7 +64,7 @@ class Deployment:
         try:
             deployment = execute_oqs_get_rest_call('/api/deployments/' + Deployment.deployment_id)
             return deployment['queueStatus']
-        except RequestException as err:
+        except requests.exceptions.RequestException as err:
             LOG.warning("%s: Unable to retrieve Deployment from OpenStack Queuing Solution. %s",
                         type(err).__name__, str(err))
 
@@ -77,7 +77,7 @@ class Deployment:
                     f'/api/deployments/{Deployment.deployment_id}',
                     json.dumps({"queueStatus": Deployment.finish_state})
                 )
-            except RequestException as err:
+            except requests.exceptions.RequestException as err:
                 LOG.warning("%s: Unable to update Deployment in OpenStack Queuing Solution. %s",
                             type(err).__name__, str(err))
 
@@ -94,7 +94,7 @@ def get_deployment_by_name(deployment_name):
 
     Raises:
         OqsException: if deployment does not exists in OQS
-        RequestException: if deployment does not exists in OQS
+        requests.exceptions.RequestException: if deployment does not exists in OQS
     """
     try:
         deployments = execute_oqs_get_rest_call(
@@ -104,7 +104,7 @@ def get_deployment_by_name(deployment_name):
             raise OqsException()
 
         return deployments[0]
-    except RequestException as err:
+    except requests.exceptions.RequestException as err:
         LOG.warning('%s: Unable to retrieve Deployment from OpenStack Queuing Solution. %s',
                     type(err).__name__, str(err))
     except OqsException:
@@ -120,13 +120,13 @@ def delete_deployment_by_name(deployment_name):
         deployment_name (str): Deployment name
 
     Raises:
-        RequestException: if unable to delete the Deployment from OQS
+        requests.exceptions.RequestException: if unable to delete the Deployment from OQS
     """
     deployment = get_deployment_by_name(deployment_name)
     if deployment and deployment['_id']:
         try:
             execute_oqs_delete_rest_call(f'/api/deployments/{deployment["_id"]}')
-        except RequestException as err:
+        except requests.exceptions.RequestException as err:
             LOG.warning("%s: Unable to remove Deployment from OpenStack Queuing Solution. %s",
                         type(err).__name__, str(err))
 
@@ -173,7 +173,7 @@ def add_deployment_to_queue(deployment_name, pod_name, product_set, job_type):
         job_type (str): job type
 
     Raises:
-        RequestException: if unable to add the Deployment to OQS
+        requests.exceptions.RequestException: if unable to add the Deployment to OQS
     """
     for post_attempt in range(0, 3):
         LOG.info('Adding Deployment to OpenStack Queuing Solution. [Attempt No. %s/%s]',
@@ -186,7 +186,7 @@ def add_deployment_to_queue(deployment_name, pod_name, product_set, job_type):
                 job_type=job_type
             )
             return
-        except RequestException as err:
+        except requests.exceptions.RequestException as err:
             LOG.warning('%s: Unable to add Deployment to OpenStack Queuing Solution.',
                         type(err).__name__)
             if is_connection_error(err):
@@ -217,7 +217,7 @@ def execute_oqs_get_rest_call(query):
         response (dict): REST request response
 
     Raises:
-        RequestException: if REST request fails
+        requests.exceptions.RequestException: if REST request fails
     """
     base_url = AUTH.get('openstack_queuing_solution', 'base_url')
     user_id = AUTH.get('FUNCTIONAL_ID', 'user_id')
@@ -228,7 +228,7 @@ def execute_oqs_get_rest_call(query):
     headers = {"Content-Type": "application/json"}
     response = requests.get(full_url, auth=(user_id, password), headers=headers, verify=False)
     if response.status_code != 200:
-        raise RequestException(response.json()['message'])
+        raise requests.exceptions.RequestException(response.json()['message'])
     return response.json()
 
 
@@ -245,7 +245,7 @@ def execute_oqs_post_rest_call(query, json_data):
         response (dict): REST request response
 
     Raises:
-        RequestException: if REST request fails
+        requests.exceptions.RequestException: if REST request fails
     """
     base_url = AUTH.get('openstack_queuing_solution', 'base_url')
     user_id = AUTH.get('FUNCTIONAL_ID', 'user_id')
@@ -258,7 +258,7 @@ def execute_oqs_post_rest_call(query, json_data):
     response = requests.post(full_url, auth=(user_id, password),
                              data=json_data, headers=headers, verify=False)
     if response.status_code != 201:
-        raise RequestException(response.json()['message'])
+        raise requests.exceptions.RequestException(response.json()['message'])
     return response.json()
 
 
@@ -283,7 +283,7 @@ def execute_oqs_put_rest_call(query, json_data):
     response = requests.put(full_url, auth=(user_id, password),
                             data=json_data, headers=headers, verify=False)
     if response.status_code != 200:
-        raise RequestException(response.json()['message'])
+        raise requests.exceptions.RequestException(response.json()['message'])
     return response.json()
 
 
@@ -299,7 +299,7 @@ def execute_oqs_delete_rest_call(query):
         response (dict): REST request response
 
     Raises:
-        RequestException: if REST request fails
+        requests.exceptions.RequestException: if REST request fails
     """
     base_url = AUTH.get('openstack_queuing_solution', 'base_url')
     user_id = AUTH.get('FUNCTIONAL_ID', 'user_id')
@@ -310,5 +310,5 @@ def execute_oqs_delete_rest_call(query):
     headers = {"Content-Type": "application/json"}
     response = requests.delete(full_url, auth=(user_id, password), headers=headers, verify=False)
     if response.status_code != 200:
-        raise RequestException(response.json()['message'])
+        raise requests.exceptions.RequestException(response.json()['message'])
     return response.json()
@@ -3,14 +3,15 @@
 import logging
 import json
 import os
-import yaml
 from . import configuration
 from . import dit
 from . import openstack
 from . import utils
+from .lazy import lazy_import
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
+yaml = lazy_import('yaml')  # pylint: disable=C0103
 
 
 class Sed:
@@ -52,12 +53,9 @@ class Sed:
                     document=sed_document,
                     new_version=schema_version
                 )
-            sed_document = dit.execute_dit_get_rest_call(
-                url_string=f'/api/documents/{sed_document.database_id}'
-            )
             utils.save_json_string_to_disk(
                 file_path=sed_document_path,
-                json_string=sed_document['content']
+                json_string=sed_document.rest['content']
             )
             self.sed_file_path = sed_document_path
         self.download_if_url_given()
@@ -106,11 +104,10 @@ class Sed:
         unsupported_offerings = ['enm', 'vio_platform', 'vio_platform_ivms']
         if self.product_offering in unsupported_offerings or openstack.get_distro_type() == 'ecee':
             return
-        product_offering_details = utils.get_product_offering_details(
+        ci_floating_ip_keys = configuration.get_product_offering(
             product_offering=self.product_offering
-        )
-        ci_floating_ip_key_details = product_offering_details['ci_floating_ip_keys']
-        for key in ci_floating_ip_key_details:
+        ).ci_floating_ip_keys
+        for key in ci_floating_ip_keys:
             self.sed_data['parameter_defaults'][key] = ''
 
     def replace_values(self, **kwargs):
@@ -2,15 +2,103 @@
 
 import sys
 import logging
+import importlib
+import inspect
+from collections import namedtuple
+from configparser import ConfigParser
+from os.path import dirname, join
 
+from cliff import help as cliff_help
 from cliff.app import App
 from cliff.commandmanager import CommandManager
 from . import configuration
-from . import image_utils
-from . import oqs
 
 CONFIG = configuration.VersionConfig()
 LOG = logging.getLogger(__name__)
+COMMAND_REGISTRY_FILE = join(dirname(__file__), 'etc/commands.ini')
+
+
+class LazyEntryPoint(namedtuple('LazyEntryPoint', ['name', 'value', 'summary'])):
+    """
+    Represents a command read from the static command registry.
+
+    The module implementing the command is only imported
+    when cliff loads the command.
+
+    Attributes:
+        name (str): command name
+        value (str): command module and class name
+        summary (str): first line of the command class docstring
+    """
+
+    __slots__ = ()
+
+    def load(self):
+        """Import and return the command class."""
+        module_name, class_name = self.value.split(':')
+        return getattr(importlib.import_module(module_name), class_name)
+
+
+class DeployerCommandManager(CommandManager):
+    """
+    Command manager reading commands from the static command registry.
+
+    The registry is generated from the entry points in setup.py
+    when the package is built or installed in development mode,
+    so starting the deployer does not scan the installed packages
+    or import every command. It falls back to the entry point
+    scan when the registry is not available.
+    """
+
+    def load_commands(self, namespace):
+        """Load all the commands of a namespace."""
+        registry = ConfigParser(delimiters=['='], interpolation=None)
+        registry.optionxform = str
+        registry.read(COMMAND_REGISTRY_FILE)
+        if not registry.has_section(namespace):
+            return super().load_commands(namespace)
+        self.group_list.append(namespace)
+        for command_name, command_value in registry.items(namespace):
+            self.commands[command_name] = LazyEntryPoint(
+                name=command_name,
+                value=command_value,
+                summary=registry.get('deployer.command_summaries', command_name, fallback=None)
+            )
+        return None
+
+
+class DeployerHelpAction(cliff_help.HelpAction):
+    """
+    Lists the commands of the deployer along with their summaries.
+
+    Commands read from the static command registry use the
+    summary stored there, so listing them does not import
+    every command module.
+    """
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """Print the help message and the list of commands, then exit."""
+        app = self.default
+        parser.print_help(app.stdout)
+        app.stdout.write('\nCommands:\n')
+        for command_name, entry_point in sorted(app.command_manager):
+            summary = getattr(entry_point, 'summary', None)
+            if summary is None:
+                summary = (inspect.getdoc(entry_point.load()) or '').split('\n', 1)[0]
+            app.stdout.write(f'  {command_name:<13}  {summary.rstrip(".")}\n')
+        raise cliff_help.HelpExit()
+
+
+class DeployerHelpCommand(cliff_help.HelpCommand):
+    """print detailed help for another command"""
+
+    def take_action(self, parsed_args):
+        """Print the help of a command, or list the commands when none is given."""
+        if parsed_args.cmd:
+            return super().take_action(parsed_args)
+        action = DeployerHelpAction(None, None, default=self.app)
+        action(self.app.parser, self.app.options, None, None)
+        return 0
 
 
 class Deployer(App):
@@ -25,21 +113,28 @@ class Deployer(App):
 
     def __init__(self):
         """Initialize the Deployer application."""
-        super(Deployer, self).__init__(
+        super().__init__(
             description=__doc__.strip(),
             version=CONFIG.get('VERSION', 'version'),
-            command_manager=CommandManager('deployer.commands'),
+            command_manager=DeployerCommandManager('deployer.commands'),
             deferred_help=True,
         )
+        self.command_manager.add_command('help', DeployerHelpCommand)
 
     def build_option_parser(self, description, version, argparse_kwargs=None):
         """Return the main parser object for the deployer."""
-        parser = super(Deployer, self).build_option_parser(
+        parser = super().build_option_parser(
             description,
             version)
 
         return parser
 
+    def print_help_if_requested(self):
+        """Print the help message and exit if --help was given."""
+        if self.deferred_help and self.options.deferred_help:
+            action = DeployerHelpAction(None, None, default=self)
+            action(self.parser, self.options, None, None)
+
 
 def main(argv=sys.argv[1:]):
     """
@@ -52,9 +147,12 @@ def main(argv=sys.argv[1:]):
         myapp = Deployer()
         return myapp.run(argv)
     except KeyboardInterrupt:
-        image_utils.Image.temporary_image_cleanup()
+        # Only commands that imported these modules can have anything to clean up
+        if 'deployer.image_utils' in sys.modules:
+            sys.modules['deployer.image_utils'].Image.temporary_image_cleanup()
     finally:
-        oqs.Deployment.update_deployment_queue_status()
+        if 'deployer.oqs' in sys.modules:
+            sys.modules['deployer.oqs'].Deployment.update_deployment_queue_status()
 
 
 if __name__ == '__main__':
@@ -4,10 +4,9 @@ import logging
 import os
 from retrying import retry
 from . import configuration
-from . import utils
 from . import openstack
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 
@@ -99,10 +98,9 @@ class StackGroupListFromConfig(StackGroupList):
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
         stack_group_objects = []
-        product_offering_details = utils.get_product_offering_details(
+        stack_group_definitions = configuration.get_product_offering(
             product_offering=self.product_offering
-        )
-        stack_group_definitions = product_offering_details['stack_groups']
+        ).stack_groups
 
         stacks_subdirectory_prefix = ''
 
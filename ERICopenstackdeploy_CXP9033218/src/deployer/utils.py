@@ -3,6 +3,8 @@
 
 import os
 import logging
+import re
+import select
 import socket
 import subprocess
 import shlex
@@ -11,22 +13,33 @@ import tarfile
 import shutil
 import tempfile
 import json
+import hashlib
+import threading
 import time
 import ssl
 from functools import wraps
 from urllib.parse import urlparse
-import urllib3
-import semantic_version
 from retrying import retry
-import paramiko
-from paramiko import SSHClient, SSHException
-import timeout_decorator
-import requests
 from . import configuration
+from .lazy import lazy_import
 
+# pylint: disable=C0103
+paramiko = lazy_import('paramiko')
+requests = lazy_import('requests')
+semantic_version = lazy_import('semantic_version')
+timeout_decorator = lazy_import('timeout_decorator')
+urllib3 = lazy_import('urllib3')
+# pylint: enable=C0103
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
+SHELL_PROMPT_PATTERN = re.compile(r'[\]~][$#] $')
+CURRENT_PASSWORD_PROMPT_PATTERN = re.compile(r'\(current\) UNIX password: $|Current password: $')
+NEW_PASSWORD_PROMPT_PATTERN = re.compile(r'New password: $')
+RETYPE_PASSWORD_PROMPT_PATTERN = re.compile(r'Retype new password: $')
+PASSWORD_CHANGE_FAILED_PATTERN = re.compile(
+    r'BAD PASSWORD|Authentication token manipulation error|passwd: .*fail', re.IGNORECASE
+)
 
 
 class CliNonZeroExitCodeException(Exception):
@@ -40,7 +53,7 @@ class CliNonZeroExitCodeException(Exception):
 
 def is_ssh_exception(exception):
     """bool: Return True if SSH exception."""
-    return isinstance(exception, SSHException)
+    return isinstance(exception, paramiko.SSHException)
 
 
 def is_cli_exit_code_exception(exception):
@@ -48,12 +61,16 @@ def is_cli_exit_code_exception(exception):
     return isinstance(exception, CliNonZeroExitCodeException)
 
 
-def run_cli_command(command):
+def run_cli_command(command, input_stream=None, environment=None):
     """
     Run the given cli command and return the result.
 
     Args:
         command (str): The first parameter
+        input_stream (obj, optional): file like object streamed to the command's
+            standard input in chunks, defaults to None
+        environment (dict, optional): environment variables of the command,
+            defaults to None to use those of the deployer
 
     Returns:
         dictionary containing two keys,
@@ -64,12 +81,42 @@ def run_cli_command(command):
     """
     LOG.info('Running cli command (%s)', command)
     run_cli_command.previous_command_successful = False
-    process = subprocess.Popen(
-        shlex.split(command),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
-    process_standard_output, process_standard_error = process.communicate()
+    if input_stream is None:
+        process = subprocess.Popen(
+            shlex.split(command),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=environment
+        )
+        process_standard_output, process_standard_error = process.communicate()
+    else:
+        with tempfile.TemporaryFile() as standard_output, \
+                tempfile.TemporaryFile() as standard_error:
+            with subprocess.Popen(
+                    shlex.split(command),
+                    stdin=subprocess.PIPE,
+                    stdout=standard_output,
+                    stderr=standard_error,
+                    env=environment
+            ) as process:
+                try:
+                    shutil.copyfileobj(input_stream, process.stdin, 1 << 20)
+                except BrokenPipeError:
+                    LOG.warning('The command stopped reading its input before the end')
+                except Exception:
+                    LOG.error('Unable to read the input of the command, stopping it')
+                    process.kill()
+                    raise
+                finally:
+                    try:
+                        process.stdin.close()
+                    except BrokenPipeError:
+                        pass
+                process.wait()
+            standard_output.seek(0)
+            standard_error.seek(0)
+            process_standard_output = standard_output.read()
+            process_standard_error = standard_error.read()
     if process.returncode != 0:
         raise CliNonZeroExitCodeException(
             'The command failed with exit code ' + str(process.returncode) +
@@ -90,15 +137,21 @@ def download_file(**kwargs):
     """
     Download a file to a given directory.
 
+    Large files are fetched from all the given mirrors at once when more
+    than one mirror is available. If that fails the file is downloaded
+    from the given url alone.
+
     Args:
         url (str): url
         destination_directory (str): destination directory
+        mirror_urls (list, optional): urls of the same file on every mirror, defaults to None
 
     Returns:
         (str): local file path
     """
     url = kwargs.pop('url')
     destination_directory = kwargs.pop('destination_directory')
+    mirror_urls = kwargs.pop('mirror_urls', None)
 
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
@@ -106,6 +159,13 @@ def download_file(**kwargs):
     logging.getLogger('requests').setLevel(logging.WARNING)
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     local_file_path = os.path.join(destination_directory, os.path.basename(url))
+    if mirror_urls and len(mirror_urls) > 1:
+        try:
+            if StripedDownload(urls=mirror_urls, local_file_path=local_file_path).run():
+                return local_file_path
+        except (requests.exceptions.RequestException, ChecksumMismatchException) as exception:
+            LOG.warning('Striped download of %s failed, downloading it from a single mirror: %s',
+                        os.path.basename(local_file_path), exception)
     LOG.info('Downloading: %s to %s', url, local_file_path)
     with open(local_file_path, 'wb') as handle:
         response = requests.get(url, stream=True, verify=False)
@@ -119,6 +179,403 @@ def download_file(**kwargs):
     return local_file_path
 
 
+class InteractiveSession:
+    """
+    Represents an interactive shell on an ssh channel driven expect style.
+
+    The channel is waited on with select, so no CPU is used while the remote
+    side is silent, and each prompt is matched as soon as it arrives.
+
+    Attributes:
+        channel (obj): paramiko channel with an invoked shell
+        timeout (int, optional): default seconds to wait for a prompt, defaults to 60
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize an InteractiveSession object."""
+        self.channel = kwargs.pop('channel')
+        self.timeout = kwargs.pop('timeout', 60)
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        self.output = ''
+
+    def expect(self, **kwargs):
+        """
+        Wait until the output matches one of the given patterns.
+
+        The output up to the end of the match is consumed.
+
+        Args:
+            patterns (list): compiled regular expressions
+            timeout (int, optional): seconds to wait, defaults to the session timeout
+
+        Returns:
+            (int): index of the pattern that matched
+
+        Raises:
+            RuntimeError: if none of the patterns match before the timeout or the
+                channel is closed
+        """
+        patterns = kwargs.pop('patterns')
+        timeout = kwargs.pop('timeout', self.timeout)
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        deadline = time.time() + timeout
+        while True:
+            for index, pattern in enumerate(patterns):
+                match = pattern.search(self.output)
+                if match:
+                    self.output = self.output[match.end():]
+                    return index
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise RuntimeError(
+                    'Timed out waiting for %s, last output: %r' %
+                    ([pattern.pattern for pattern in patterns], self.output[-200:])
+                )
+            if self.channel.closed:
+                raise RuntimeError(
+                    'The channel closed while waiting for %s, last output: %r' %
+                    ([pattern.pattern for pattern in patterns], self.output[-200:])
+                )
+            readable, _, _ = select.select([self.channel], [], [], remaining)
+            if readable:
+                data = self.channel.recv(9999)
+                if not data:
+                    self.channel.close()
+                    continue
+                self.output += data.decode('utf-8', errors='replace')
+
+    def send_line(self, line):
+        """
+        Send a line of input to the shell.
+
+        Args:
+            line (str): input without the line ending
+        """
+        self.channel.sendall(line + '\n')
+
+    def wait_until_closed(self, **kwargs):
+        """
+        Wait until the remote side closes the channel.
+
+        Args:
+            timeout (int, optional): seconds to wait, defaults to the session timeout
+
+        Returns:
+            (bool): True if the channel closed before the timeout
+        """
+        timeout = kwargs.pop('timeout', self.timeout)
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        deadline = time.time() + timeout
+        while not self.channel.closed:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self.channel], [], [], remaining)
+            if readable:
+                data = self.channel.recv(9999)
+                if not data:
+                    break
+                self.output += data.decode('utf-8', errors='replace')
+        return True
+
+
+class ChecksumMismatchException(Exception):
+    """Custom exception for expressing a downloaded file not matching its published checksum."""
+
+
+class DownloadRange:
+    """
+    This class represents a byte range of a file being downloaded.
+
+    The end of a range can be moved back while it is being downloaded so that
+    the remainder can be handed over to a faster mirror. A range is only
+    changed while the lock of its StripedDownload is held.
+
+    Attributes:
+        position (int): offset of the next byte to download
+        end (int): offset after the last byte of the range
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize a DownloadRange object."""
+        self.position = kwargs.pop('start')
+        self.end = kwargs.pop('end')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    @property
+    def remaining(self):
+        """int: Return the number of bytes left to download."""
+        return self.end - self.position
+
+    def split(self):
+        """
+        Move the end of the range back to its middle and return the second half.
+
+        Returns:
+            (DownloadRange): the second half of the range
+        """
+        split_position = self.position + self.remaining // 2
+        second_half = DownloadRange(start=split_position, end=self.end)
+        self.end = split_position
+        return second_half
+
+    def advance(self, block):
+        """
+        Move the position past a downloaded block, dropping any bytes beyond the end.
+
+        Args:
+            block (bytes): downloaded block
+
+        Returns:
+            (tuple): the part of the block within the range and its offset in the file
+        """
+        block = block[:max(self.remaining, 0)]
+        offset = self.position
+        self.position += len(block)
+        return block, offset
+
+
+class StripedDownload:
+    """
+    This class represents a download striped across several mirrors of the same file.
+
+    The file is split into ranges which the workers of every mirror take from
+    a shared queue, so a faster mirror ends up downloading more of the file.
+    Once the queue is empty, idle workers take over the second half of the
+    largest range still being downloaded. The ranges are written to a
+    temporary file next to the local file, which only replaces the local
+    file once it matches the checksum published next to it on the mirrors.
+
+    Attributes:
+        urls (list): urls of the file on every mirror
+        local_file_path (str): local file path
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize a StripedDownload object."""
+        self.urls = kwargs.pop('urls')
+        self.local_file_path = kwargs.pop('local_file_path')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        self.lock = threading.Lock()
+        self.pending_ranges = []
+        self.active_ranges = []
+        self.bytes_downloaded = {}
+        self.timeout = CONFIG.getint('striped_download', 'timeout')
+
+    def get_striping_urls(self):
+        """
+        Return the urls that support ranged requests and agree on the file size.
+
+        Returns:
+            (tuple): the usable urls and the file size
+        """
+        file_sizes = {}
+        for url in self.urls:
+            try:
+                response = requests.head(url, verify=False, allow_redirects=True,
+                                         timeout=self.timeout)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as exception:
+                LOG.info('Not using %s for this download: %s', urlparse(url).netloc, exception)
+                continue
+            if response.headers.get('Accept-Ranges') == 'bytes' and \
+                    response.headers.get('Content-Length'):
+                file_sizes[url] = int(response.headers['Content-Length'])
+        if not file_sizes:
+            return [], None
+        file_size = max(set(file_sizes.values()), key=list(file_sizes.values()).count)
+        return [url for url, size in file_sizes.items() if size == file_size], file_size
+
+    def run(self):
+        """
+        Download the file from every usable mirror.
+
+        Returns:
+            (bool): False if the file is not suitable for a striped download
+
+        Raises:
+            requests.exceptions.RequestException: if no mirror could complete the download
+            ChecksumMismatchException: if the file does not match its published checksum
+        """
+        urls, file_size = self.get_striping_urls()
+        if len(urls) < 2 or file_size < CONFIG.getint('striped_download', 'threshold'):
+            return False
+
+        LOG.info('Downloading: %s to %s from %s mirrors', os.path.basename(self.local_file_path),
+                 self.local_file_path, len(urls))
+        range_size = CONFIG.getint('striped_download', 'range_size')
+        self.pending_ranges = [
+            DownloadRange(start=start, end=min(start + range_size, file_size))
+            for start in range(0, file_size, range_size)
+        ]
+        file_descriptor, temporary_file_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.local_file_path)),
+            prefix=f'.{os.path.basename(self.local_file_path)}.',
+            suffix='.part'
+        )
+        try:
+            os.ftruncate(file_descriptor, file_size)
+            os.close(file_descriptor)
+            start_time = time.time()
+            workers = []
+            for url in urls:
+                self.bytes_downloaded[url] = 0
+                for _ in range(CONFIG.getint('striped_download', 'connections_per_mirror')):
+                    worker = threading.Thread(target=self.download_ranges,
+                                              args=(url, temporary_file_path))
+                    worker.daemon = True
+                    worker.start()
+                    workers.append(worker)
+            for worker in workers:
+                worker.join()
+
+            if self.pending_ranges or self.active_ranges:
+                raise requests.exceptions.RequestException(
+                    'Unable to download %s from any of its mirrors' % self.local_file_path
+                )
+            elapsed_time = max(time.time() - start_time, 0.001)
+            for url, bytes_downloaded in self.bytes_downloaded.items():
+                LOG.info('%s MiB downloaded from %s at %.1f MiB/s', bytes_downloaded >> 20,
+                         urlparse(url).netloc, bytes_downloaded / elapsed_time / (1 << 20))
+            verify_published_checksum(file_path=temporary_file_path, urls=urls)
+            os.replace(temporary_file_path, self.local_file_path)
+        finally:
+            if os.path.exists(temporary_file_path):
+                os.remove(temporary_file_path)
+        LOG.info('Download complete')
+        return True
+
+    def get_next_range(self):
+        """
+        Return the next range to download, splitting the largest active range if none is left.
+
+        Returns:
+            (DownloadRange): next range, or None if the download is complete
+        """
+        with self.lock:
+            if self.pending_ranges:
+                download_range = self.pending_ranges.pop(0)
+            else:
+                minimum_split_size = CONFIG.getint('striped_download', 'minimum_split_size')
+                largest_range = max(self.active_ranges, key=lambda active: active.remaining,
+                                    default=None)
+                if largest_range is None or largest_range.remaining < 2 * minimum_split_size:
+                    return None
+                download_range = largest_range.split()
+            self.active_ranges.append(download_range)
+            return download_range
+
+    def download_ranges(self, url, file_path):
+        """
+        Download ranges from the given mirror until none are left or the mirror keeps failing.
+
+        Args:
+            url (str): url of the file on the mirror
+            file_path (str): path of the file the ranges are written to
+        """
+        failures = 0
+        file_descriptor = os.open(file_path, os.O_WRONLY)
+        try:
+            while failures < CONFIG.getint('striped_download', 'max_failures_per_mirror'):
+                download_range = self.get_next_range()
+                if download_range is None:
+                    return
+                try:
+                    self.download_range(url, download_range, file_descriptor)
+                except requests.exceptions.RequestException as exception:
+                    failures += 1
+                    LOG.info('Range download from %s failed: %s', urlparse(url).netloc,
+                             exception)
+                with self.lock:
+                    self.active_ranges.remove(download_range)
+                    if download_range.remaining > 0:
+                        self.pending_ranges.insert(0, download_range)
+        finally:
+            os.close(file_descriptor)
+
+    def download_range(self, url, download_range, file_descriptor):
+        """
+        Download a single range from the given mirror into the file.
+
+        Args:
+            url (str): url of the file on the mirror
+            download_range (DownloadRange): range to download
+            file_descriptor (int): file descriptor of the file
+        """
+        headers = {'Range': f'bytes={download_range.position}-{download_range.end - 1}'}
+        with requests.get(url, headers=headers, stream=True, verify=False,
+                          timeout=self.timeout) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise requests.exceptions.RequestException(
+                    f'{url} ignored the requested range'
+                )
+            for block in response.iter_content(chunk_size=1 << 20):
+                with self.lock:
+                    block, offset = download_range.advance(block)
+                    self.bytes_downloaded[url] += len(block)
+                os.pwrite(file_descriptor, block, offset)
+                if download_range.remaining <= 0:
+                    break
+
+
+def verify_published_checksum(**kwargs):
+    """
+    Verify a downloaded file against the checksum published next to it on its mirrors.
+
+    Args:
+        file_path (str): local file path
+        urls (list): urls the file was downloaded from
+
+    Raises:
+        ChecksumMismatchException: if the file does not match the published checksum
+    """
+    file_path = kwargs.pop('file_path')
+    urls = kwargs.pop('urls')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    for algorithm in ['sha1', 'md5']:
+        for url in urls:
+            try:
+                response = requests.get(f'{url}.{algorithm}', verify=False, timeout=60)
+                response.raise_for_status()
+            except requests.exceptions.RequestException:
+                continue
+            published_checksum = response.text.split()[0].lower() if response.text.split() \
+                else ''
+            file_hash = hashlib.new(algorithm)
+            with open(file_path, 'rb') as handle:
+                block = handle.read(1 << 20)
+                while block:
+                    file_hash.update(block)
+                    block = handle.read(1 << 20)
+            if file_hash.hexdigest() != published_checksum:
+                raise ChecksumMismatchException(
+                    f'{file_path} {algorithm} checksum {file_hash.hexdigest()} does not match '
+                    f'the published checksum {published_checksum}'
+                )
+            LOG.info('Verified %s checksum of %s', algorithm, os.path.basename(file_path))
+            return
+    LOG.warning('No published checksum found for %s, skipping verification',
+                os.path.basename(file_path))
+
+
 def unzip_file(filename, extract_directory):
     """
     Unzip a given file to the given directory.
@@ -145,6 +602,38 @@ def unzip_tar_gz(filename, extract_directory):
     tar.close()
 
 
+def extract_rpm(**kwargs):
+    """
+    Extract the payload of an rpm file to the given directory without installing it.
+
+    Args:
+        file_path (str): rpm file path
+        extract_directory (str): the directory to extract to
+
+    Raises:
+        CliNonZeroExitCodeException: if rpm2cpio or cpio fails
+    """
+    file_path = kwargs.pop('file_path')
+    extract_directory = kwargs.pop('extract_directory')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    LOG.info('Extracting %s to %s', os.path.basename(file_path), extract_directory)
+    with subprocess.Popen(['rpm2cpio', file_path], stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE) as rpm2cpio:
+        cpio = subprocess.run(['cpio', '-idm', '--quiet'], stdin=rpm2cpio.stdout,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              cwd=extract_directory, check=False)
+        rpm2cpio.stdout.close()
+        rpm2cpio_standard_error = rpm2cpio.stderr.read()
+    if rpm2cpio.returncode != 0 or cpio.returncode != 0:
+        raise CliNonZeroExitCodeException(
+            f'Failed to extract {file_path}. Error: '
+            f'{rpm2cpio_standard_error.decode("utf-8")}{cpio.stderr.decode("utf-8")}'
+        )
+
+
 def load_json_file(**kwargs):
     """
     Create a json object of the json content within a file.
@@ -358,13 +847,7 @@ def get_product_offering_details(**kwargs):
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    rollout_details = json.loads(
-        CONFIG.get('OFFERING_DETAILS', 'offering_details')
-    )
-    product_offering_details = {}
-    product_offering_details.update(rollout_details['defaults'])
-    product_offering_details.update(rollout_details[product_offering])
-    return product_offering_details
+    return dict(configuration.get_product_offering(product_offering=product_offering).details)
 
 
 @cached
@@ -457,6 +940,9 @@ def run_notimeout_ssh_command(**kwargs):
         command (str): command
         suppress_exception (boolean, optional): suppress_exception, defaults to False
 
+    Returns:
+        (str): command output
+
     Raises:
         CliNonZeroExitCodeException: if the commands fails with a non zero exit code
     """
@@ -471,7 +957,7 @@ def run_notimeout_ssh_command(**kwargs):
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
     LOG.info('Running command (%s) over ssh on %s', command, ip_address)
-    client = SSHClient()
+    client = paramiko.SSHClient()
     client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
     logging.getLogger('paramiko').setLevel(logging.WARNING)
     if password is None:
@@ -481,13 +967,18 @@ def run_notimeout_ssh_command(**kwargs):
         client.connect(ip_address, username=username, password=password, look_for_keys=False)
     _, stdout, stderr = client.exec_command(command, get_pty=True)
 
-    while not stdout.channel.exit_status_ready():
-        print(stdout.channel.recv(1024).decode('utf-8'))
+    command_output = b''
+    data = stdout.channel.recv(1024)
+    while data:
+        print(data.decode('utf-8', errors='replace'))
+        command_output += data
+        data = stdout.channel.recv(1024)
     if stdout.channel.recv_exit_status() != 0 and not suppress_exception:
         raise CliNonZeroExitCodeException(
             'The remote ssh command failed: %s' % str(stderr)
         )
     client.close()
+    return command_output.decode('utf-8', errors='replace')
 
 
 def run_noretry_ssh_command(**kwargs):
@@ -505,6 +996,9 @@ def run_noretry_ssh_command(**kwargs):
         command (str): command
         suppress_exception (boolean, optional): suppress_exception, defaults to False
 
+    Returns:
+        (str): command output
+
     Raises:
         CliNonZeroExitCodeException: if the commands fails with a non zero exit code
     """
@@ -519,7 +1013,7 @@ def run_noretry_ssh_command(**kwargs):
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
     LOG.info('Running command (%s) over ssh on %s', command, ip_address)
-    client = SSHClient()
+    client = paramiko.SSHClient()
     client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
     logging.getLogger('paramiko').setLevel(logging.WARNING)
     if password is None:
@@ -529,13 +1023,117 @@ def run_noretry_ssh_command(**kwargs):
         client.connect(ip_address, username=username, password=password, look_for_keys=False)
     _, stdout, stderr = client.exec_command(command, get_pty=True)
 
-    while not stdout.channel.exit_status_ready():
-        print(stdout.channel.recv(1024).decode('utf-8'))
+    command_output = b''
+    data = stdout.channel.recv(1024)
+    while data:
+        print(data.decode('utf-8', errors='replace'))
+        command_output += data
+        data = stdout.channel.recv(1024)
     if stdout.channel.recv_exit_status() != 0 and not suppress_exception:
         raise CliNonZeroExitCodeException(
             'The remote ssh command failed: %s' % str(stderr)
         )
     client.close()
+    return command_output.decode('utf-8', errors='replace')
+
+
+def can_authenticate_over_ssh(**kwargs):
+    """
+    Return True if a user can authenticate on a remote server over ssh.
+
+    Only the authentication is attempted, no session is opened so this
+    also succeeds for a user whose password has expired.
+
+    Args:
+        ip_address (str): ip address
+        username (str): username
+        password (str, optional): user password, defaults to None
+        private_key (str, optional): private key, defaults to None
+        timeout (int, optional): timeout in seconds, defaults to 10
+
+    Returns:
+        (bool): True | False
+    """
+    ip_address = kwargs.pop('ip_address')
+    username = kwargs.pop('username')
+    password = kwargs.pop('password', None)
+    private_key = kwargs.pop('private_key', None)
+    timeout = kwargs.pop('timeout', 10)
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    logging.getLogger('paramiko').setLevel(logging.WARNING)
+    try:
+        with socket.create_connection((ip_address, 22), timeout=timeout) as sock:
+            transport = paramiko.Transport(sock)
+            transport.banner_timeout = timeout
+            transport.auth_timeout = timeout
+            try:
+                if password is None:
+                    pkey = paramiko.RSAKey.from_private_key_file(private_key)
+                    transport.connect(username=username, pkey=pkey)
+                else:
+                    transport.connect(username=username, password=password)
+                return transport.is_authenticated()
+            finally:
+                transport.close()
+    except (OSError, EOFError, paramiko.SSHException):
+        return False
+
+
+def probe_ssh_command(**kwargs):
+    """
+    Run a given command on a remote server via ssh once, without retrying.
+
+    Args:
+        ip_address (str): ip address
+        username (str): username
+        password (str, optional): user password, defaults to None
+        private_key (str, optional): private key, defaults to None
+        command (str): command
+        timeout (int, optional): timeout in seconds, defaults to 30
+
+    Returns:
+        (str): command output, None if the server could not be reached or the
+            command exited with a non zero exit code
+    """
+    ip_address = kwargs.pop('ip_address')
+    username = kwargs.pop('username')
+    password = kwargs.pop('password', None)
+    private_key = kwargs.pop('private_key', None)
+    command = kwargs.pop('command')
+    timeout = kwargs.pop('timeout', 30)
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    logging.getLogger('paramiko').setLevel(logging.WARNING)
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        connect_args = {
+            'username': username,
+            'look_for_keys': False,
+            'allow_agent': False,
+            'timeout': timeout,
+            'banner_timeout': timeout,
+            'auth_timeout': timeout
+        }
+        if password is None:
+            connect_args['pkey'] = paramiko.RSAKey.from_private_key_file(private_key)
+        else:
+            connect_args['password'] = password
+        client.connect(ip_address, **connect_args)
+        _, stdout, _ = client.exec_command(command, timeout=timeout)
+        output = stdout.read().decode('utf-8')
+        if stdout.channel.recv_exit_status() != 0:
+            return None
+        return output
+    except (OSError, EOFError, paramiko.SSHException):
+        return None
+    finally:
+        client.close()
 
 
 def run_ssh_command(**kwargs):
@@ -603,7 +1201,12 @@ def run_ssh_command(**kwargs):
         channel.get_pty()
         channel.exec_command(command)
         exit_code = channel.recv_exit_status()
-        ssh_response = channel.recv(9999).decode('utf-8')
+        ssh_response = b''
+        data = channel.recv(65536)
+        while data:
+            ssh_response += data
+            data = channel.recv(65536)
+        ssh_response = ssh_response.decode('utf-8')
         transport.close()
         if exit_code != 0 and not suppress_exception:
             LOG.error(
@@ -677,32 +1280,27 @@ def reset_password(**kwargs):
     channel = transport.open_channel(kind="session")
     channel.get_pty()
     channel.invoke_shell()
-    shell_output = ''
-    while 1:
-        shell_output += channel.recv(9999).decode('utf-8')
-        if shell_output.endswith('~]$ '):
+    session = InteractiveSession(channel=channel, timeout=120)
+    try:
+        prompt = session.expect(
+            patterns=[SHELL_PROMPT_PATTERN, CURRENT_PASSWORD_PROMPT_PATTERN]
+        )
+        if prompt == 0:
             LOG.info('The current password %s didn\'t require resetting', current_password)
             return current_password
-        if shell_output.endswith('UNIX password: '):
-            break
-    channel.send(current_password + '\n')
-
-    shell_output = ''
-    while not shell_output.endswith('New password: '):
-        shell_output += channel.recv(9999).decode('utf-8')
-    channel.send(new_password + '\n')
-
-    shell_output = ''
-    while not shell_output.endswith('Retype new password: '):
-        shell_output += channel.recv(9999).decode('utf-8')
-    channel.send(new_password + '\n')
-
-    max_wait_attempts = 30
-    wait_attempt = 1
-    while wait_attempt < max_wait_attempts:
-        if channel.closed:
-            break
-        time.sleep(1)
+        session.send_line(current_password)
+        session.expect(patterns=[NEW_PASSWORD_PROMPT_PATTERN])
+        session.send_line(new_password)
+        session.expect(patterns=[RETYPE_PASSWORD_PROMPT_PATTERN])
+        session.send_line(new_password)
+        if not session.wait_until_closed(timeout=30):
+            LOG.info('The session on %s is still open after changing the password', ip_address)
+        if PASSWORD_CHANGE_FAILED_PATTERN.search(session.output):
+            raise RuntimeError(
+                'Changing the password on %s failed: %s' % (ip_address, session.output.strip())
+            )
+    finally:
+        transport.close()
 
     LOG.info('Attempting to verify connection with the changed password now')
     transport = paramiko.Transport((ip_address, 22))
@@ -778,44 +1376,53 @@ def get_template_by_ip_type(**kwargs):
 
 
 @retry(retry_on_exception=is_ssh_exception, stop_max_attempt_number=10, wait_fixed=10000)
-def get_installed_artifact_version(**kwargs):
+def get_installed_artifact_versions(**kwargs):
     """
-    Get installed artifact information using rpm command.
+    Get installed artifact information for several artifacts using one rpm command.
 
     Args:
         ip_address (str): ip address
         username (str): username
         password (str): user password
-        artifact_name (str): artifact name
+        artifact_names (list): artifact names
 
     Returns:
-        (str): installed artifact version
+        (dict): artifact name to installed version, None if it is not installed
 
     Raises:
-        SSHException: if artifact is not installed or invalid artifact version
+        SSHException: if the output could not be read or has an invalid artifact version
     """
     ip_address = kwargs.pop('ip_address')
     username = kwargs.pop('username')
     password = kwargs.pop('password')
-    artifact_name = kwargs.pop('artifact_name')
+    artifact_names = kwargs.pop('artifact_names')
 
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    installed_artifact = run_ssh_command(
+    installed_artifacts = run_ssh_command(
         ip_address=ip_address,
         username=username,
         password=password,
-        command='rpm -q ' + artifact_name + ' --queryformat \'%{VERSION}-%{RELEASE}\'',
+        command=f'rpm -q {" ".join(artifact_names)} '
+                '--queryformat \'### %{NAME} %{VERSION}-%{RELEASE}\\n\'',
         suppress_exception=True
     )
-    if ('is not installed' not in installed_artifact and not
-            semantic_version.validate(installed_artifact)):
-        LOG.info('Retrying to get information on %s...', artifact_name)
-        raise SSHException()
-
-    LOG.info('Artifact information on %s: %s', ip_address, installed_artifact)
-    return installed_artifact.strip()
+    installed_versions = {}
+    for line in installed_artifacts.splitlines():
+        fields = line.split()
+        if len(fields) == 3 and fields[0] == '###':
+            installed_versions[fields[1]] = fields[2]
+        elif 'is not installed' in line and len(fields) > 1:
+            installed_versions[fields[1]] = None
+    for artifact_name in artifact_names:
+        installed_version = installed_versions.get(artifact_name, '')
+        if installed_version is not None and not semantic_version.validate(installed_version):
+            LOG.info('Retrying to get information on %s...', artifact_name)
+            raise paramiko.SSHException()
+
+    LOG.info('Artifact information on %s: %s', ip_address, installed_versions)
+    return installed_versions
 
 
 @retry(retry_on_exception=is_ssh_exception, stop_max_attempt_number=20, wait_fixed=10000)
@@ -849,7 +1456,7 @@ def get_file_content(**kwargs):
 
     if not file_contents:
         LOG.info('Retrying to get %s content...', file_path)
-        raise SSHException()
+        raise paramiko.SSHException()
 
     LOG.info('%s content: \n%s', file_path, file_contents)
 
@@ -891,54 +1498,111 @@ def get_latest_file_version(**kwargs):
 
     if not file_name:
         LOG.info('Retrying to get latest file name...')
-        raise SSHException()
+        raise paramiko.SSHException()
 
     LOG.info('Got file name: %s', file_name)
     return file_name
 
 
+def get_published_file_metadata(**kwargs):
+    """
+    Return the size and sha1 checksum published for a file on Nexus.
+
+    The size comes from the Content-Length of a HEAD request and the checksum
+    from the .sha1 file published next to the file.
+
+    Args:
+        url (str): file url
+
+    Returns:
+        (dict): size in bytes and sha1 checksum, either is None if not published
+    """
+    url = kwargs.pop('url')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    metadata = {'size': None, 'sha1': None}
+    try:
+        response = requests.head(url, verify=False, allow_redirects=True, timeout=60)
+        response.raise_for_status()
+        if response.headers.get('Content-Length'):
+            metadata['size'] = int(response.headers['Content-Length'])
+    except requests.exceptions.RequestException as exception:
+        LOG.info('Unable to read the size of %s: %s', os.path.basename(url), exception)
+    try:
+        response = requests.get(f'{url}.sha1', verify=False, timeout=60)
+        response.raise_for_status()
+        if response.text.split():
+            metadata['sha1'] = response.text.split()[0].lower()
+    except requests.exceptions.RequestException as exception:
+        LOG.info('No published sha1 checksum for %s: %s', os.path.basename(url), exception)
+    return metadata
+
+
 @retry(retry_on_exception=is_ssh_exception, stop_max_attempt_number=20, wait_fixed=10000)
-def media_already_exists(**kwargs):
+def get_remote_files_metadata(**kwargs):
     """
-    Return True if media file already exists.
+    Return the size and sha1 checksum of files in a remote location.
+
+    All of the files are checked in a single ssh command. The checksum of a
+    file is only calculated when a published checksum is given for it and its
+    size matches the published size, so truncated files are not read in full.
 
     Args:
         ip_address (str): ip address
         username (str): username
         password (str): user password
-        location (str): media file location
-        filename (str): media file name
+        location (str): remote directory
+        published_metadata (dict): file name to the published size and sha1 checksum
 
     Returns:
-        (bool): True | False
+        (dict): file name to the remote size and sha1 checksum, for files that exist
 
     Raises:
-        SSHException: if unable to retrieve media file
+        SSHException: if unable to check the files
     """
     ip_address = kwargs.pop('ip_address')
     username = kwargs.pop('username')
     password = kwargs.pop('password')
     location = kwargs.pop('location')
-    filename = kwargs.pop('filename')
+    published_metadata = kwargs.pop('published_metadata')
 
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
+    if not published_metadata:
+        return {}
+    file_entries = ' '.join(
+        shlex.quote(f'{filename} {metadata["size"] or "-"} {"yes" if metadata["sha1"] else "no"}')
+        for filename, metadata in published_metadata.items()
+    )
     command_output = run_ssh_command(
         ip_address=ip_address,
         username=username,
         password=password,
-        command=f'[ -f {os.path.join(location, filename)} ] && echo "Found" || echo "Not found"'
+        command=f'cd {location} 2>/dev/null && printf \'%s\\n\' {file_entries} | '
+                'while read -r name size checksum; do [ -f "$name" ] || continue; '
+                'actual=$(stat -c %s "$name"); sum=-; '
+                'if [ "$checksum" = yes ] && { [ "$size" = - ] || [ "$size" = "$actual" ]; }; '
+                'then sum=$(sha1sum "$name" | cut -d" " -f1); fi; '
+                'echo "### $name $actual $sum"; done; echo "### done"'
     )
 
-    if not command_output:
-        LOG.info('Retrying: does "%s" exist in this location "%s"...', filename, location)
-        raise SSHException()
+    if not command_output or '### done' not in command_output:
+        LOG.info('Retrying: which files exist in this location "%s"...', location)
+        raise paramiko.SSHException()
 
-    if 'Found' in str(command_output):
-        LOG.info('%s exists in this location %s...', filename, location)
-        return True
-    return False
+    remote_metadata = {}
+    for line in command_output.splitlines():
+        fields = line.split()
+        if len(fields) == 4 and fields[0] == '###':
+            remote_metadata[fields[1]] = {
+                'size': int(fields[2]),
+                'sha1': None if fields[3] == '-' else fields[3]
+            }
+    return remote_metadata
 
 
 def remove_contents_of_directory(**kwargs):
@@ -1032,94 +1696,95 @@ def save_private_key(**kwargs):
     return file_path
 
 
-@retry(stop_max_attempt_number=10, wait_fixed=3000)
-def get_host_response_time(**kwargs):
+def probe_http_transfer(**kwargs):
     """
-    Return the time taken to recieve a ping response from a host.
+    Return the latency and throughput measured while reading the start of a url.
+
+    A ranged GET request is used so that only the first probe_bytes of the
+    file are transferred, whatever the size of the file is.
 
     Args:
-        hostname (str): host name
+        url (str): url to probe
+        probe_bytes (int): number of bytes to read from the url
+        timeout (int): connection and read timeout in seconds
 
     Returns:
-        (str): host response time
+        (dict): time to first byte in seconds, throughput in bytes per second
+        and the size of the file in bytes, or None if it is unknown
 
     Raises:
-        CliNonZeroExitCodeException: if the commands fails with a non zero exit code
+        requests.exceptions.RequestException: if the url could not be read or was empty
     """
-    hostname = kwargs.pop('hostname')
+    url = kwargs.pop('url')
+    probe_bytes = kwargs.pop('probe_bytes')
+    timeout = kwargs.pop('timeout')
 
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    response_times = []
-    while len(response_times) < 3:
-        start_time = time.time()
-        ping_process = subprocess.Popen(
-            ['ping', '-c', '1', hostname],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        process_standard_output, process_standard_error = ping_process.communicate()
-        if ping_process.returncode != 0:
-            raise CliNonZeroExitCodeException(
-                'The command failed with exit code ' +
-                str(ping_process.returncode) + '. Heres the output: ' +
-                process_standard_output.decode() + '\nError: ' + process_standard_error.decode()
-            )
-        response_times.append(abs(start_time - time.time()))
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    start_time = time.time()
+    with requests.get(url, headers={'Range': f'bytes=0-{probe_bytes - 1}'},
+                      stream=True, verify=False, timeout=timeout) as response:
+        response.raise_for_status()
+        time_to_first_byte = time.time() - start_time
+        bytes_read = 0
+        for chunk in response.iter_content(chunk_size=65536):
+            bytes_read += len(chunk)
+            if bytes_read >= probe_bytes:
+                break
+        if bytes_read == 0:
+            raise requests.exceptions.RequestException(f'{url} returned no data')
+        transfer_time = max(time.time() - start_time - time_to_first_byte, 0.001)
+        file_size = get_content_size(headers=response.headers)
 
-    return min(response_times)
+    return {
+        'time_to_first_byte': time_to_first_byte,
+        'throughput': bytes_read / transfer_time,
+        'size': file_size
+    }
 
 
-@retry(retry_on_exception=is_ssh_exception, stop_max_attempt_number=20, wait_fixed=10000)
-def extract_gunzipfile_contents(**kwargs):
+def get_content_size(**kwargs):
     """
-    Return filename of extracted gunzip file.
+    Return the full size of a http resource from its response headers.
 
     Args:
-        ip_address (str): ip address
-        username (str): username
-        password (str): user password
-        file_path (str): gunzip file path
-        package_name (str): package name
+        headers (dict): http response headers
 
     Returns:
-        (str): gunzip filename
+        (int): size of the resource in bytes, or None if it is unknown
     """
-    ip_address = kwargs.pop('ip_address')
-    username = kwargs.pop('username')
-    password = kwargs.pop('password')
-    file_path = kwargs.pop('file_path')
-    package_name = kwargs.pop('package_name')
+    headers = kwargs.pop('headers')
 
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    package_path = os.path.join(file_path, package_name)
-    run_ssh_command(
-        ip_address=ip_address,
-        username=username,
-        password=password,
-        command=f'gunzip -fc {package_path} > {package_path.replace(".gz", "")}'
-    )
-    LOG.info('%s extracted...', package_name)
-    return package_name.replace('.gz', '')
+    content_range = headers.get('Content-Range', '')
+    if '/' in content_range and not content_range.endswith('/*'):
+        return int(content_range.rsplit('/', 1)[1])
+    if headers.get('Content-Length') and not content_range:
+        return int(headers['Content-Length'])
+    return None
 
 
 @retry(retry_on_exception=is_ssh_exception, stop_max_attempt_number=20, wait_fixed=10000)
-def get_remote_tarfile_contents(**kwargs):
+def extract_remote_tar_gz(**kwargs):
     """
-    Return the contents of a given tar file.
+    Extract a tar.gz file on a remote host in a single pass.
+
+    The file is decompressed with pigz when it is installed, otherwise with
+    gzip, and piped straight into tar. No uncompressed copy is written.
 
     Args:
         ip_address (str): ip address
         username (str): username
         password (str): user password
-        file_path (str): gunzip file path
+        file_path (str): directory holding the tar.gz file, it is extracted there
         package_name (str): package name
 
     Returns:
-        (list): Tar file content
+        (list): extracted members
 
     Raises:
         SSHException: if invalid/missing data exists
@@ -1133,107 +1798,160 @@ def get_remote_tarfile_contents(**kwargs):
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
+    LOG.info(
+        'Extracting package: %s on: %s as user: %s', package_name, ip_address, username
+    )
     contents = run_ssh_command(
         ip_address=ip_address,
         username=username,
         password=password,
-        command=f"echo $(tar -tf {os.path.join(file_path, package_name)})"
+        command=f'cd {file_path} && set -o pipefail && '
+                'if command -v pigz >/dev/null 2>&1; then decompress=pigz; else decompress=gzip; '
+                f'fi; $decompress -dc {package_name} | tar xvf -'
     )
-    LOG.info('%s contains: %s', package_name, str(contents))
-    if len(contents.split()) == 0:
+    members = [member.strip() for member in contents.splitlines() if member.strip()]
+    LOG.info('%s contains: %s', package_name, ' '.join(members))
+    if not members:
         LOG.warning('Missing/Invalid data returned: %s', str(contents))
-        raise SSHException()
-    return contents.split()
+        raise paramiko.SSHException()
+    return members
 
 
-def extract_remote_tarfile(**kwargs):
+def install_rpm_packages(**kwargs):
     """
-    Extract the contents of a given tar file.
+    Install packages, skipping those already at the required version.
+
+    The installed versions are read with one rpm command. Packages that are
+    not installed or are older are installed in one yum transaction, and
+    packages that are newer are downgraded in a second one, both run over a
+    single ssh connection, see run_yum_commands.
 
     Args:
         ip_address (str): ip address
         username (str): username
         password (str): user password
-        file_path (str): gunzip file path
-        package_name (str): package name
+        file_path (str): directory holding the packages
+        package_names (list): package file names
+
+    Returns:
+        (dict): package name to the action taken: install, downgrade or none
 
+    Raises:
+        CliNonZeroExitCodeException: if yum fails
     """
     ip_address = kwargs.pop('ip_address')
     username = kwargs.pop('username')
     password = kwargs.pop('password')
     file_path = kwargs.pop('file_path')
-    package_name = kwargs.pop('package_name')
+    package_names = kwargs.pop('package_names')
 
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
+    if not package_names:
+        return {}
     LOG.info(
-        'Extracting package: %s on: %s as user: %s', ip_address, package_name, username
+        'Installing packages: %s on: %s as user: %s', ', '.join(package_names), ip_address,
+        username
     )
-    ssh_command = f'cd {file_path}; tar xvf {package_name}'
-    run_ssh_command(
+    installed_versions = get_installed_artifact_versions(
         ip_address=ip_address,
         username=username,
         password=password,
-        command=ssh_command
+        artifact_names=sorted({package_name.split('-')[0] for package_name in package_names})
     )
+    package_actions = {}
+    for package_name in package_names:
+        package_actions[package_name] = 'install'
+        installed_version = installed_versions.get(package_name.split('-')[0])
+        if installed_version is None:
+            continue
+        artifact_version = get_artifact_version_from_url(package_name)
+        artifact_version = artifact_version.replace('.noarch', '')
+        if 'snapshot' not in installed_version.lower():
+            installed_version = installed_version.split('-')[0]
+        if (semantic_version.Version(installed_version) ==
+                semantic_version.Version(artifact_version)):
+            LOG.info('Versions are the same, not installing %s', package_name)
+            package_actions[package_name] = 'none'
+        elif (semantic_version.Version(installed_version) >
+              semantic_version.Version(artifact_version)):
+            LOG.info('Downgrading %s version.', package_name)
+            package_actions[package_name] = 'downgrade'
+
+    yum_commands = []
+    for yum_action in ['install', 'downgrade']:
+        package_paths = [
+            os.path.join(file_path, package_name) for package_name in package_names
+            if package_actions[package_name] == yum_action
+        ]
+        if package_paths:
+            yum_commands.append(f'yum {yum_action} -y {" ".join(package_paths)}')
+    if yum_commands:
+        run_yum_commands(
+            ip_address=ip_address,
+            username=username,
+            password=password,
+            yum_commands=yum_commands,
+            package_names=[
+                package_name for package_name in package_names
+                if package_actions[package_name] != 'none'
+            ]
+        )
+    for package_name in package_names:
+        LOG.info('%s: %s', package_name, package_actions[package_name])
+    return package_actions
 
 
-def install_rpm_package(**kwargs):
+def run_yum_commands(**kwargs):
     """
-    Install package.
+    Run yum commands one after the other over a single ssh connection.
+
+    The commands are given rpm_install_timeout_per_package seconds for
+    every package they change. If they fail, the yum output is logged.
 
     Args:
         ip_address (str): ip address
         username (str): username
         password (str): user password
-        file_path (str): gunzip file path
-        package_name (str): package name
+        yum_commands (list): yum commands
+        package_names (list): names of the packages the commands change
+
+    Raises:
+        CliNonZeroExitCodeException: if yum fails
     """
     ip_address = kwargs.pop('ip_address')
     username = kwargs.pop('username')
     password = kwargs.pop('password')
-    file_path = kwargs.pop('file_path')
-    package_name = kwargs.pop('package_name')
+    yum_commands = kwargs.pop('yum_commands')
+    package_names = kwargs.pop('package_names')
 
     if kwargs:
         raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-    LOG.info(
-        'Installing package: %s on: %s as user: %s', package_name, ip_address, username
-    )
-    install_rpm = True
-    yum_action = 'install'
-    artifact_name = package_name.split('-')[0]
-    installed_version = get_installed_artifact_version(
-        ip_address=ip_address,
-        username=username,
-        password=password,
-        artifact_name=artifact_name
-    )
-    artifact_version = get_artifact_version_from_url(package_name)
-    artifact_version = artifact_version.replace('.noarch', '')
-    if 'snapshot' not in installed_version.lower():
-        installed_version = installed_version.split('-')[0]
-
-    if 'is not installed' not in installed_version.lower():
-        if (semantic_version.Version(installed_version) ==
-                semantic_version.Version(artifact_version)):
-            LOG.info('Versions are the same, not installing %s', package_name)
-            install_rpm = False
-        elif (semantic_version.Version(installed_version) >
-              semantic_version.Version(artifact_version)):
-            LOG.info('Downgrading %s version.', package_name)
-            yum_action = 'downgrade'
-
-    if install_rpm is True:
-        ssh_command = f'yum {yum_action} -y {file_path}/{package_name}'
+    yum_log_path = '/tmp/deployer_rpm_install.log'
+    try:
         run_ssh_command(
             ip_address=ip_address,
             username=username,
             password=password,
-            command=ssh_command
+            command=f'{{ {" && ".join(yum_commands)}; }} > {yum_log_path} 2>&1; '
+                    f'yum_exit_code=$?; cat {yum_log_path}; exit $yum_exit_code',
+            timeout_value=CONFIG.getint('vio', 'rpm_install_timeout_per_package') *
+            len(package_names),
+            max_attempts=CONFIG.getint('vio', 'rpm_install_attempts')
         )
+    except CliNonZeroExitCodeException:
+        yum_output = run_ssh_command(
+            ip_address=ip_address,
+            username=username,
+            password=password,
+            command=f'tail -n 100 {yum_log_path}',
+            suppress_exception=True
+        )
+        LOG.error('Unable to install or downgrade %s on %s. yum output:\n%s',
+                  ', '.join(package_names), ip_address, yum_output)
+        raise
 
 
 def copy_file(**kwargs):
@@ -1266,3 +1984,29 @@ def is_valid_dns_hostname(**kwargs):
         return True
     except socket.gaierror:
         return False
+
+
+def is_port_open(**kwargs):
+    """
+    Return True if a TCP connection can be made to the given port.
+
+    Args:
+        ip_address (str): ip address
+        port (int): port
+        timeout (int, optional): timeout in seconds, defaults to 5
+
+    Returns:
+        (bool): True | False
+    """
+    ip_address = kwargs.pop('ip_address')
+    port = kwargs.pop('port')
+    timeout = kwargs.pop('timeout', 5)
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    try:
+        with socket.create_connection((ip_address, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
@@ -1,18 +1,18 @@
 """This file contains logic relating to the VIO Virtual Management Server."""
 
+import concurrent.futures
 import json
 import logging
 import os
 import re
 import threading
-import _thread
 
 from . import configuration
 from . import dit
 from . import openstack
 from . import utils
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
 
 
@@ -232,67 +232,235 @@ class DeploymentVirtualManagementServer:
     def download_vio_media(self):
         """Downloading Media to DVMS."""
         LOG.info('Downloading media on DVMS as as user: %s', self.username)
-        media_threads = []
-        thread_id = 1
         media_key = CONFIG.get('CXPNUMBERS', 'ENM_ISO')
-        media_key_value = self.artifact_json['media_details'][media_key]
-        media_file_name = os.path.basename(media_key_value)
-        media_already_exists = utils.media_already_exists(
-            ip_address=self.ip_address,
-            username=self.username,
-            password=self.password,
-            location=CONFIG.get('vio', 'artifacts_dir'),
-            filename=media_file_name
-        )
-        if '_KGB+N' in media_file_name:
+        media_urls = [self.artifact_json['media_details'][media_key]]
+        for artifact_json_key in self.artifact_json:
+            if artifact_json_key in ('media_details', 'vnflcm_details'):
+                continue
+            media_urls.append(list(self.artifact_json[artifact_json_key].values())[0])
+
+        enm_iso_file_name = os.path.basename(media_urls[0])
+        if '_KGB+N' in enm_iso_file_name:
             utils.sftp_file(
                 ip_address=self.ip_address,
                 username=self.username,
                 password=self.password,
-                local_file_path=os.path.join(self.temp_directory, media_file_name),
-                remote_file_path=os.path.join(self.artifact_directory, media_file_name)
+                local_file_path=os.path.join(self.temp_directory, enm_iso_file_name),
+                remote_file_path=os.path.join(self.artifact_directory, enm_iso_file_name)
             )
-        elif not media_already_exists:
-            media_thread = DownloadMediaThread(thread_id,
-                                               media_key,
-                                               media_key_value,
-                                               self.ip_address,
-                                               self.username,
-                                               self.password)
-            media_thread.daemon = True
-            media_threads.append(media_thread)
-            thread_id = thread_id + 1
-
-        for media_key in self.artifact_json:
-            if media_key in ('media_details', 'vnflcm_details'):
+            media_urls.pop(0)
+
+        self.sync_media_files(media_urls=media_urls)
+
+    def sync_media_files(self, **kwargs):
+        """
+        Make sure the DVMS artifacts directory holds a correct copy of each media file.
+
+        The remote size and sha1 checksum of every file are compared with the
+        metadata published on Nexus in one ssh command. Only missing or
+        mismatched files are downloaded. A file smaller than its published
+        size is resumed, any other mismatch is downloaded again. A file with
+        no published metadata is kept if it exists.
+
+        Args:
+            media_urls (list): media file urls
+        """
+        media_urls = kwargs.pop('media_urls')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        if not media_urls:
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(media_urls)) as executor:
+            published_metadata = dict(zip(
+                media_urls,
+                executor.map(lambda url: utils.get_published_file_metadata(url=url), media_urls)
+            ))
+        remote_metadata = utils.get_remote_files_metadata(
+            ip_address=self.ip_address,
+            username=self.username,
+            password=self.password,
+            location=self.artifact_directory,
+            published_metadata={
+                os.path.basename(media_url): metadata
+                for media_url, metadata in published_metadata.items()
+            }
+        )
+
+        media_downloads = []
+        for media_url in media_urls:
+            media_file_name = os.path.basename(media_url)
+            published = published_metadata[media_url]
+            remote = remote_metadata.get(media_file_name)
+            if remote is None:
+                LOG.info('%s is missing on the DVMS', media_file_name)
+                media_downloads.append({'media_url': media_url, 'resume': False})
+            elif published['size'] is not None and remote['size'] < published['size']:
+                LOG.info('%s is incomplete on the DVMS (%d of %d bytes), resuming',
+                         media_file_name, remote['size'], published['size'])
+                media_downloads.append({'media_url': media_url, 'resume': True})
+            elif (published['size'] is not None and remote['size'] != published['size']) or \
+                    (published['sha1'] is not None and remote['sha1'] != published['sha1']):
+                LOG.info('%s does not match the published size or checksum, downloading again',
+                         media_file_name)
+                media_downloads.append({'media_url': media_url, 'resume': False})
+            else:
+                LOG.info('%s is up to date on the DVMS', media_file_name)
+
+        self.download_media_files(
+            media_downloads=media_downloads,
+            published_metadata=published_metadata
+        )
+
+    def download_media_files(self, **kwargs):
+        """
+        Download media files onto the DVMS using a bounded pool of workers.
+
+        At most media_download_workers files are pulled at the same time. If a
+        download fails it is retried, resuming the partial file, without
+        restarting the other downloads. If it still fails, downloads that have
+        not started are cancelled and the error is raised once the running
+        downloads have finished.
+
+        Args:
+            media_downloads (list): dicts of media file url and whether to resume the file
+            published_metadata (dict): media file url to its published size and sha1 checksum
+
+        Raises:
+            CliNonZeroExitCodeException: if a media file could not be downloaded
+            ChecksumMismatchException: if a media file does not match its published metadata
+        """
+        media_downloads = kwargs.pop('media_downloads')
+        published_metadata = kwargs.pop('published_metadata')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        if not media_downloads:
+            LOG.info('All media already exists on the DVMS.')
+            return
+        cancelled = threading.Event()
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=CONFIG.getint('vio', 'media_download_workers')) as executor:
+            futures = [
+                executor.submit(
+                    self.download_media_file,
+                    media_url=media_download['media_url'],
+                    resume=media_download['resume'],
+                    published=published_metadata[media_download['media_url']],
+                    cancelled=cancelled
+                )
+                for media_download in media_downloads
+            ]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            except Exception:
+                cancelled.set()
+                for future in futures:
+                    future.cancel()
+                LOG.error('Cancelled the remaining media downloads on the DVMS.')
+                raise
+
+    def download_media_file(self, **kwargs):
+        """
+        Download a media file onto the DVMS, resuming a failed transfer.
+
+        The downloaded file is checked against its published metadata. If it
+        does not match it is downloaded again from the start.
+
+        Args:
+            media_url (str): media file url
+            resume (boolean): resume the partial file already on the DVMS
+            published (dict): published size and sha1 checksum of the file
+            cancelled (obj): threading.Event set when downloads should stop
+
+        Raises:
+            CliNonZeroExitCodeException: if the media file could not be downloaded
+            ChecksumMismatchException: if the media file does not match its published metadata
+        """
+        media_url = kwargs.pop('media_url')
+        resume = kwargs.pop('resume')
+        published = kwargs.pop('published')
+        cancelled = kwargs.pop('cancelled')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        media_file_name = os.path.basename(media_url)
+        media_file_path = os.path.join(self.artifact_directory, media_file_name)
+        max_attempts = CONFIG.getint('vio', 'media_download_attempts')
+        for attempt in range(1, max_attempts + 1):
+            if cancelled.is_set():
+                LOG.info('Skipping download of %s, downloads cancelled.', media_file_name)
+                return
+            LOG.info('Downloading %s (attempt %d of %d)', media_file_name, attempt, max_attempts)
+            try:
+                command_output = utils.run_notimeout_ssh_command(
+                    ip_address=self.ip_address,
+                    username=self.username,
+                    password=self.password,
+                    command=f'curl --fail --silent --show-error {"-C - " if resume else ""}'
+                            f'-w "### %{{size_download}} %{{time_total}} %{{speed_download}}\\n" '
+                            f'-o {media_file_path} {media_url}'
+                )
+            except utils.CliNonZeroExitCodeException:
+                if attempt == max_attempts:
+                    LOG.error('Failed to download %s after %d attempts', media_file_name,
+                              max_attempts)
+                    raise
+                LOG.warning('Failed to download %s, resuming the transfer', media_file_name)
+                resume = True
                 continue
+            match = re.search(r'### (\S+) (\S+) (\S+)', command_output)
+            if match:
+                size, total_time, speed = (float(value) for value in match.groups())
+                LOG.info('Downloaded %s: %.1f MB in %.1f s (%.1f MB/s)', media_file_name,
+                         size / 1000000, total_time, speed / 1000000)
+            else:
+                LOG.info('Downloaded %s', media_file_name)
+            if self._verify_remote_media(media_file_name=media_file_name, published=published):
+                return
+            if attempt == max_attempts:
+                raise utils.ChecksumMismatchException(
+                    f'{media_file_name} on the DVMS does not match its published size or checksum'
+                )
+            LOG.warning('%s does not match its published size or checksum, downloading again',
+                        media_file_name)
+            resume = False
+
+    def _verify_remote_media(self, **kwargs):
+        """
+        Return True if a media file on the DVMS matches its published metadata.
 
-            media_key_value = list(self.artifact_json[media_key].values())[0]
-            media_already_exists = utils.media_already_exists(
-                ip_address=self.ip_address,
-                username=self.username,
-                password=self.password,
-                location=CONFIG.get('vio', 'artifacts_dir'),
-                filename=os.path.basename(media_key_value)
-            )
-            if not media_already_exists:
-                media_thread = DownloadMediaThread(thread_id,
-                                                   media_key,
-                                                   media_key_value,
-                                                   self.ip_address,
-                                                   self.username,
-                                                   self.password)
-                media_thread.daemon = True
-                media_threads.append(media_thread)
-                thread_id = thread_id + 1
-
-        # Start Threads
-        for item in media_threads:
-            item.start()
-
-        # Wait for all of them to finish
-        for item in media_threads:
-            item.join()
+        Args:
+            media_file_name (str): media file name in the DVMS artifacts directory
+            published (dict): published size and sha1 checksum of the file
+
+        Returns:
+            (bool): True | False
+        """
+        media_file_name = kwargs.pop('media_file_name')
+        published = kwargs.pop('published')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        if published['size'] is None and published['sha1'] is None:
+            return True
+        remote = utils.get_remote_files_metadata(
+            ip_address=self.ip_address,
+            username=self.username,
+            password=self.password,
+            location=self.artifact_directory,
+            published_metadata={media_file_name: published}
+        ).get(media_file_name, {'size': None, 'sha1': None})
+        if (published['size'] is None or remote['size'] == published['size']) and \
+                (published['sha1'] is None or remote['sha1'] == published['sha1']):
+            LOG.info('Verified %s against its published metadata', media_file_name)
+            return True
+        return False
 
     def download_enm_media(self, **kwargs):
         """
@@ -312,91 +480,61 @@ class DeploymentVirtualManagementServer:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
         media_prep_required = False
-        media_details = self.artifact_json['media_details']
-        for cxp_number, media_url in media_details.items():
+        image_names = self.get_image_names()
+        media_urls = []
+        kgb_media_file_names = []
+        for cxp_number, media_url in self.artifact_json['media_details'].items():
             media_file_name = os.path.basename(media_url)
             image_name = re.sub(r'\.iso|\.qcow2', '' if image_name_postfix is None
                                 else image_name_postfix, media_file_name)
-            if self.image_exists(image_name=image_name) is False:
-                if CONFIG.get('CXPNUMBERS', 'ENM_ISO') in media_file_name:
-                    media_prep_required = True
-                if media_artifact_mappings.get(cxp_number):
-                    continue
-                if '_KGB+N' in media_file_name:
-                    utils.sftp_file(
-                        ip_address=self.ip_address,
-                        username=self.username,
-                        password=self.password,
-                        local_file_path=os.path.join(self.temp_directory, media_file_name),
-                        remote_file_path=os.path.join(self.artifact_directory, media_file_name)
-                    )
-                else:
-                    media_file_path = os.path.join(self.artifact_directory, media_file_name)
-                    utils.run_notimeout_ssh_command(
-                        ip_address=self.ip_address,
-                        username=self.username,
-                        password=self.password,
-                        command=f'curl --fail --silent --show-error {media_url} -o \
-{media_file_path}'
-                    )
-
-        for artifact_json_key in ['vmware_guest_tools_details', 'vnflcm_details']:
-            media_url = list(self.artifact_json[artifact_json_key].values())[0]
-            media_file_name = os.path.basename(media_url)
-            self.delete_image_on_dvms(
-                image_path=os.path.join(self.artifact_directory, media_file_name)
-            )
-            utils.run_notimeout_ssh_command(
-                ip_address=self.ip_address,
-                username=self.username,
-                password=self.password,
-                command=f'curl --fail --silent --show-error {media_url} -o \
-{os.path.join(self.artifact_directory, media_file_name)}'
-            )
+            if image_name in image_names:
+                continue
+            if CONFIG.get('CXPNUMBERS', 'ENM_ISO') in media_file_name:
+                media_prep_required = True
+            if media_artifact_mappings.get(cxp_number):
+                continue
+            if '_KGB+N' in media_file_name:
+                kgb_media_file_names.append(media_file_name)
+            else:
+                media_urls.append(media_url)
+
+        media_urls.extend(
+            list(self.artifact_json[artifact_json_key].values())[0]
+            for artifact_json_key in ['vmware_guest_tools_details', 'vnflcm_details']
+        )
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as uploader:
+            uploads = [
+                uploader.submit(
+                    utils.sftp_file,
+                    ip_address=self.ip_address,
+                    username=self.username,
+                    password=self.password,
+                    local_file_path=os.path.join(self.temp_directory, media_file_name),
+                    remote_file_path=os.path.join(self.artifact_directory, media_file_name)
+                )
+                for media_file_name in kgb_media_file_names
+            ]
+            self.sync_media_files(media_urls=media_urls)
+            for upload in uploads:
+                upload.result()
         return media_prep_required
 
     @classmethod
-    def image_exists(cls, **kwargs):
+    def get_image_names(cls):
         """
-        Return True if image is already in glance.
-
-        Args:
-            image_name (str): image name
+        Return the names of all images in glance.
 
         Returns:
-            (bool): True | False
+            (set): image names
         """
-        image_name = kwargs.pop('image_name')
-
-        if kwargs:
-            raise TypeError('Unexpected **kwargs: %r' % kwargs)
-
         image_list = openstack.openstack_client_command(
             command_type='openstack',
             object_type='image',
             action='list',
             arguments='--limit 1000000'
         )
-        return any(image['Name'] == image_name for image in image_list)
-
-    def delete_image_on_dvms(self, **kwargs):
-        """
-        Delete image on DVMS.
-
-        Args:
-            image_path (str): image directory path
-        """
-        image_path = kwargs.pop('image_path')
-
-        if kwargs:
-            raise TypeError('Unexpected **kwargs: %r' % kwargs)
-
-        utils.run_ssh_command(
-            ip_address=self.ip_address,
-            username=self.username,
-            password=self.password,
-            command=f'rm -f {image_path}'
-        )
+        return {image['Name'] for image in image_list}
 
     def configure_dvms_for_platform(self, **kwargs):
         """
@@ -629,35 +767,3 @@ def post_vio_key_pair_to_dit(**kwargs):
         f'/api/deployments/{deployment_id}/',
         json.dumps({'enm': deployment_key_pair})
     )
-
-
-class DownloadMediaThread(threading.Thread):
-    """Thread for downloading media onto the DVMS."""
-
-    def __init__(self, *args):
-        """The _init_ for DownloadMediaThread."""
-        self._stop_event = threading.Event()
-        threading.Thread.__init__(self)
-        self.args = args
-
-    def run(self):
-        """The run for DownloadMediaThread."""
-        # pylint: disable=W0703
-        try:
-            LOG.info('Starting Thread %d: %s', self.args[0], os.path.basename(self.args[2]))
-            ssh_command = ('curl --fail --silent --show-error -o ' +
-                           os.path.join(CONFIG.get('vio', 'artifacts_dir'),
-                                        os.path.basename(self.args[2])) + ' ' + self.args[2])
-
-            utils.run_notimeout_ssh_command(
-                ip_address=self.args[3],
-                username=self.args[4],
-                password=self.args[5],
-                command=ssh_command
-            )
-            LOG.info('Exiting Thread %d: %s', self.args[0], os.path.basename(self.args[2]))
-        except Exception as error_thrown:
-            LOG.error('Interrupting main program from thread.....%s', str(error_thrown))
-            _thread.interrupt_main()
-            # pylint: disable=W0212
-            os._exit(1)
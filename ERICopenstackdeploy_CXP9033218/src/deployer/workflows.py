@@ -5,16 +5,20 @@ import logging
 import json
 import time
 import re
-import requests
-import urllib3
+import threading
+import warnings
 import simplejson
 from packaging import version
 from . import configuration
 from . import utils
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from .lazy import lazy_import
+warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+requests = lazy_import('requests')  # pylint: disable=C0103
 
-CONFIG = configuration.DeployerConfig()
+CONFIG = configuration.get_deployer_config()
 LOG = logging.getLogger(__name__)
+DEFINITIONS_CATALOGS = {}
+DEFINITIONS_CATALOGS_LOCK = threading.Lock()
 
 
 def log_progress(**kwargs):
@@ -47,6 +51,112 @@ def log_progress(**kwargs):
     log_progress.latest_workflow = workflow_progress[-1]['definitionName']
 
 
+class DefinitionsCatalog:
+    """
+    Represents the workflow definitions known to VNF-LCM.
+
+    The definitions list is downloaded once and indexed by definition id
+    and by bundle, later refreshes are conditional requests so an unchanged
+    list is not downloaded again.
+
+    Attributes:
+        base_url (str): VNF-LCM base url
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize a DefinitionsCatalog object."""
+        self.base_url = kwargs.pop('base_url')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        self.etag = None
+        self.last_modified = None
+        self.definitions = {}
+        self.bundles = {}
+
+    @property
+    def supports_conditional_requests(self):
+        """bool: Return true if VNF-LCM returned a validator for the definitions list."""
+        return bool(self.etag or self.last_modified)
+
+    def refresh(self):
+        """
+        Refresh the definitions, unless VNF-LCM reports they have not changed.
+
+        Returns:
+            (bool): True if the definitions were downloaded again
+        """
+        definitions_url = f'{self.base_url}/wfs/rest/definitions'
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        response = requests.get(definitions_url, headers=headers, timeout=60, verify=False)
+        if response.status_code == 304:
+            return False
+        response.raise_for_status()
+        definitions = {}
+        bundles = {}
+        for definition in response.json():
+            definitions[definition['definitionId']] = definition
+            bundles.setdefault(
+                definition['definitionId'].split('.--.')[0], []
+            ).append(definition)
+        self.definitions = definitions
+        self.bundles = bundles
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        return True
+
+    def find(self, **kwargs):
+        """
+        Return the first definition whose id contains the given id.
+
+        Args:
+            definition_id (str): full or partial definition id
+
+        Returns:
+            (dict): definition details, None if not found
+        """
+        definition_id = kwargs.pop('definition_id')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        if definition_id in self.definitions:
+            return self.definitions[definition_id]
+        candidates = self.definitions.values()
+        if '.--.' in definition_id:
+            candidates = self.bundles.get(definition_id.split('.--.')[0], [])
+        for definition in candidates:
+            if definition_id in definition['definitionId']:
+                return definition
+        return None
+
+
+def get_definitions_catalog(**kwargs):
+    """
+    Return the workflow definitions catalog of a VNF-LCM, shared for the whole run.
+
+    Args:
+        base_url (str): VNF-LCM base url
+
+    Returns:
+        (DefinitionsCatalog): workflow definitions catalog
+    """
+    base_url = kwargs.pop('base_url')
+
+    if kwargs:
+        raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+    with DEFINITIONS_CATALOGS_LOCK:
+        if base_url not in DEFINITIONS_CATALOGS:
+            DEFINITIONS_CATALOGS[base_url] = DefinitionsCatalog(base_url=base_url)
+        return DEFINITIONS_CATALOGS[base_url]
+
+
 class Workflows:
     """
     Represents a workflows instance.
@@ -59,6 +169,9 @@ class Workflows:
         username (str): User name
         password (str, optional): user password, defaults to None
         private_key (str, optional): private key, defaults to None
+        https_enabled (bool): True if VNF-LCM is served over HTTPS
+        ui_hostname (str): VNF-LCM UI hostname
+        facts (obj, optional): remote facts of the VNF-LCM services VM, defaults to None
     """
 
     def __init__(self, **kwargs):
@@ -69,13 +182,20 @@ class Workflows:
         self.private_key = kwargs.pop('private_key', None)
         self.https_enabled = kwargs.pop('https_enabled')
         self.ui_hostname = kwargs.pop('ui_hostname')
+        self.facts = kwargs.pop('facts', None)
 
         if kwargs:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-        self.base_url = f'http://{self.ip_address}'
-        if self.https_enabled:
-            self.base_url = f'https://{self.ip_address}'
+    @property
+    def base_url(self):
+        """str: Return the VNF-LCM base url."""
+        return f'https://{self.ip_address}' if self.https_enabled else f'http://{self.ip_address}'
+
+    @property
+    def definitions_catalog(self):
+        """DefinitionsCatalog: Return the workflow definitions catalog of this VNF-LCM."""
+        return get_definitions_catalog(base_url=self.base_url)
 
     def download_workflows(self, **kwargs):
         """
@@ -136,6 +256,8 @@ bundle install --package=/tmp/{package_name}'
         )
         LOG.info(wfmgr_output)
         LOG.info('Workflows: %s is installed', package_name)
+        if self.facts:
+            self.facts.invalidate()
 
     def wait_for_workflow_definition(self, **kwargs):
         """
@@ -152,14 +274,16 @@ bundle install --package=/tmp/{package_name}'
         if kwargs:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-        max_check_attempts = 360
+        max_wait_time = 3600
+        start_time = time.time()
         check_attempt = 1
         found_workflow_definition = False
-        while check_attempt < max_check_attempts:
-            LOG.info(
-                'Waiting for the "%s" workflow definition to be available in VNF-LCM.Attempt %d of \
-%d', workflow_id, check_attempt, max_check_attempts
-            )
+        while time.time() - start_time < max_wait_time:
+            if check_attempt == 1 or not self.definitions_catalog.supports_conditional_requests:
+                LOG.info(
+                    'Waiting for the "%s" workflow definition to be available in VNF-LCM.Attempt \
+%d', workflow_id, check_attempt
+                )
             try:
                 self.get_definition_containing_id(definition_id=workflow_id)
                 found_workflow_definition = True
@@ -174,14 +298,20 @@ bundle install --package=/tmp/{package_name}'
             ):
                 pass
 
-            LOG.info('Sleeping for 10 seconds as its not there yet')
-            time.sleep(10)
+            # An unchanged definitions list costs a single 304 response, so it can
+            # be checked every second, otherwise fall back to the full download
+            # every 10 seconds
+            if self.definitions_catalog.supports_conditional_requests:
+                time.sleep(1)
+            else:
+                LOG.info('Sleeping for 10 seconds as its not there yet')
+                time.sleep(10)
             check_attempt += 1
 
         if not found_workflow_definition:
             raise RuntimeError(
-                'Didn\'t find the "%s" workflow definition after %d attempts, giving up' %
-                (workflow_id, max_check_attempts)
+                'Didn\'t find the "%s" workflow definition after %d seconds, giving up' %
+                (workflow_id, max_wait_time)
             )
 
     def execute_workflow_and_wait(self, **kwargs):
@@ -213,15 +343,6 @@ bundle install --package=/tmp/{package_name}'
             max_check_attempts=max_check_attempts,
             workflow_data=workflow_data
         )
-        workflow_progress_events = self.get_progress_events(
-            instance_id=instance_id
-        )
-        self.log_progress_events(
-            events=workflow_progress_events
-        )
-        self.search_for_failed_events(
-            events=workflow_progress_events
-        )
 
     def execute_workflow(self, **kwargs):
         """
@@ -289,15 +410,23 @@ bundle install --package=/tmp/{package_name}'
         a given id to complete. It will throw an exception
         if the workflow does not complete successfully
 
+        Only the instance summary is read on every poll. The progress event
+        history is read when the summary changes, and otherwise at most once
+        per progress_events_poll_interval. New events are logged and checked
+        for errors. The poll interval starts at the configured minimum, is
+        reset to it whenever the workflow makes progress and doubles up to
+        the configured maximum while nothing changes.
+
         Args:
             instance_id (str): workflow instance id
-            max_check_attempts (str, optional): maximum checking attempts, defaults to 1260
+            max_check_attempts (str, optional): maximum checking attempts of 10 seconds each,
+                defaults to 1260
             workflow_data (str): workflow data
 
         Raises:
-            RuntimeError: if the workflows times out
+            RuntimeError: if the workflows times out or an error event is found
         """
-        # pylint: disable=R0914,R0915
+        # pylint: disable=R0912,R0914,R0915
         instance_id = kwargs.pop('instance_id')
         max_check_attempts = kwargs.pop('max_check_attempts', 1260)
         workflow_data = kwargs.pop('workflow_data')
@@ -306,33 +435,58 @@ bundle install --package=/tmp/{package_name}'
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
         lcm_progress_summaries_url = f'{self.base_url}/wfs/rest/progresssummaries/'
-        time.sleep(10)
-        check_attempt = 1
-        wait_time = 10
+        min_poll_interval = CONFIG.getint('workflows', 'progress_min_poll_interval')
+        max_poll_interval = CONFIG.getint('workflows', 'progress_max_poll_interval')
+        events_poll_interval = CONFIG.getint('workflows', 'progress_events_poll_interval')
+        max_duration = max_check_attempts * 10
+        poll_interval = min_poll_interval
+        seen_events = set()
+        previous_summary_state = None
+        last_events_time = 0
+        last_status_log_time = 0
         workflow_completed = False
         exception_count = 0
         repeated_exception_limit = 30
         workflow_duration = '00:00:00'
-        while check_attempt <= max_check_attempts:
-            workflow_duration = time.strftime("%H:%M:%S", time.gmtime(check_attempt * wait_time))
-            LOG.info(
-                'Waiting for the workflow with instance id: %s to complete. Attempt %d of %d, \
-current workflow duration: %s', instance_id, check_attempt, max_check_attempts, workflow_duration
-            )
+        start_time = time.time()
+        time.sleep(min_poll_interval)
+        while time.time() - start_time <= max_duration:
+            workflow_duration = time.strftime("%H:%M:%S", time.gmtime(time.time() - start_time))
+            if time.time() - last_status_log_time >= 60:
+                LOG.info(
+                    'Waiting for the workflow with instance id: %s to complete, current workflow \
+duration: %s of at most %s', instance_id, workflow_duration,
+                    time.strftime("%H:%M:%S", time.gmtime(max_duration))
+                )
+                last_status_log_time = time.time()
             if exception_count > repeated_exception_limit:
                 LOG.error('VNF-LCM failed to start the workflow with instance ID: %s', instance_id)
                 break
             try:
-                workflow_response = requests.get(
-                    lcm_progress_summaries_url, timeout=30, verify=False
-                )
-                workflow_response.raise_for_status()
-                log_progress(workflow_progress=workflow_response.json())
                 workflow_summary_response = requests.get(
                     f'{lcm_progress_summaries_url}{instance_id}', timeout=30, verify=False
                 )
                 workflow_summary_response.raise_for_status()
                 workflow_summary_response_json = workflow_summary_response.json()
+                summary_state = (
+                    workflow_summary_response_json.get('endNodeId'),
+                    workflow_summary_response_json.get('active'),
+                    workflow_summary_response_json.get('incidentActive')
+                )
+                new_events = []
+                if summary_state != previous_summary_state or \
+                        time.time() - last_events_time >= events_poll_interval:
+                    new_events = self.stream_progress_events(
+                        instance_id=instance_id,
+                        seen_events=seen_events
+                    )
+                    last_events_time = time.time()
+                if new_events:
+                    workflow_response = requests.get(
+                        lcm_progress_summaries_url, timeout=30, verify=False
+                    )
+                    workflow_response.raise_for_status()
+                    log_progress(workflow_progress=workflow_response.json())
                 workflow_instance_business_key = workflow_summary_response_json['businessKey']
                 if workflow_instance_business_key == 'Restore Deployment':
                     self.check_and_complete_user_task(
@@ -347,10 +501,6 @@ current workflow duration: %s', instance_id, check_attempt, max_check_attempts,
                     LOG.info('An incident has occurred in the workflow with an instance id of \
 %s.', instance_id)
                     break
-
-                LOG.info('Sleeping for %d seconds as its not complete yet', wait_time)
-                time.sleep(wait_time)
-                check_attempt += 1
             except requests.exceptions.RequestException:
                 exception_count += 1
                 LOG.info('workflow progress unavailable...retrying in 10 seconds, attempt: %d \
@@ -358,6 +508,12 @@ of %d', exception_count, repeated_exception_limit)
                 time.sleep(10)
                 continue
             exception_count = 0
+            if new_events or summary_state != previous_summary_state:
+                poll_interval = min_poll_interval
+            else:
+                poll_interval = min(poll_interval * 2, max_poll_interval)
+            previous_summary_state = summary_state
+            time.sleep(poll_interval)
 
         if not workflow_completed:
             raise RuntimeError(
@@ -368,9 +524,10 @@ open VNF-LCM: %s/index.html#workflows/workflow/workflowinstance/%s' % (workflow_
             )
 
         workflow_summary_response = requests.get(lcm_progress_summaries_url + instance_id,
-                                                 verify=False)
+                                                 timeout=30, verify=False)
         workflow_summary_response.raise_for_status()
         workflow_summary_response_json = workflow_summary_response.json()
+        self.stream_progress_events(instance_id=instance_id, seen_events=seen_events)
         if 'failure' in workflow_summary_response_json['endNodeId']:
             raise RuntimeError(
                 'The workflow with an instance id of %s FAILED to complete successfully. Refer to \
@@ -380,6 +537,36 @@ the relevant logs for more information. To check the workflow log you must open
 
         LOG.info('The workflow with an instance id of %s is now completed.', instance_id)
 
+    def stream_progress_events(self, **kwargs):
+        """
+        Log the progress events not seen before and check them for errors.
+
+        Args:
+            instance_id (str): workflow instance id
+            seen_events (set): keys of the events already logged, updated in place
+
+        Returns:
+            (list): new progress events
+
+        Raises:
+            RuntimeError: if an error is found in the new events
+        """
+        instance_id = kwargs.pop('instance_id')
+        seen_events = kwargs.pop('seen_events')
+
+        if kwargs:
+            raise TypeError('Unexpected **kwargs: %r' % kwargs)
+
+        new_events = []
+        for event in self.get_progress_events(instance_id=instance_id):
+            event_key = (event['nodeId'], event['nodeType'], event['eventTime'])
+            if event_key not in seen_events:
+                seen_events.add(event_key)
+                new_events.append(event)
+        self.log_progress_events(events=new_events)
+        self.search_for_failed_events(events=new_events)
+        return new_events
+
     def check_and_complete_user_task(self, **kwargs):
         """
         Check for and complete the restore user task.
@@ -426,6 +613,7 @@ the relevant logs for more information. To check the workflow log you must open
 
         lcm_progress_events_response = requests.get(
             f'{self.base_url}/wfs/rest/progressevents?instanceId={instance_id}',
+            timeout=60,
             verify=False
         )
         lcm_progress_events_response.raise_for_status()
@@ -443,7 +631,6 @@ the relevant logs for more information. To check the workflow log you must open
         if kwargs:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-        LOG.info('Please see below details about the events')
         for event in events:
             LOG.info(
                 'Node ID: %s | Node Type: %s | Event Time: %s',
@@ -494,13 +681,14 @@ workflow log in VNF LCM: %s/index.html#workflows' % self.base_url
         if kwargs:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-        definitions_url = f'{self.base_url}/wfs/rest/definitions'
-        LOG.info('Running GET REST towards: %s', definitions_url)
-        response = requests.get(definitions_url, timeout=60, verify=False)
-        definitions = response.json()
-        for definition in definitions:
-            if definition_id in definition['definitionId']:
-                return definition
+        if self.definitions_catalog.refresh():
+            LOG.info(
+                'Loaded %d workflow definitions from: %s/wfs/rest/definitions',
+                len(self.definitions_catalog.definitions), self.base_url
+            )
+        definition = self.definitions_catalog.find(definition_id=definition_id)
+        if definition:
+            return definition
 
         raise RuntimeError(
             'There was no definition found containing "%s"' % definition_id
@@ -517,7 +705,7 @@ workflow log in VNF LCM: %s/index.html#workflows' % self.base_url
             (list): installed workflows info
 
         Raises:
-            ValueError: if package not installed
+            ValueError: if no bundle with the given name is installed
         """
         workflows_name = kwargs.pop('workflows_name')
 
@@ -528,27 +716,33 @@ workflow log in VNF LCM: %s/index.html#workflows' % self.base_url
         max_check_attempts = 10
         check_attempt = 1
         while check_attempt < max_check_attempts:
-            ssh_command = f'sudo /opt/ericsson/ERICwfmgrruntimetools_CXP9032765/wfmgr bundle list \
---name={workflows_name}'
-            installed_workflows_info = utils.run_ssh_command(
-                ip_address=self.ip_address,
-                username=self.username,
-                private_key=self.private_key,
-                command=ssh_command
-            )
+            if self.facts:
+                installed_workflows_info = '\n'.join(self.facts.workflow_bundles)
+            else:
+                ssh_command = f'sudo /opt/ericsson/ERICwfmgrruntimetools_CXP9032765/wfmgr bundle \
+list --name={workflows_name}'
+                installed_workflows_info = utils.run_ssh_command(
+                    ip_address=self.ip_address,
+                    username=self.username,
+                    private_key=self.private_key,
+                    command=ssh_command
+                )
             if installed_workflows_info:
                 break
+            if self.facts:
+                self.facts.invalidate()
             time.sleep(10)
             check_attempt += 1
-        if 'No package installed' in installed_workflows_info or not installed_workflows_info:
+        installed_workflows = [
+            workflow for workflow in installed_workflows_info.split('\n')
+            if workflows_name in [column.strip() for column in workflow.split('|')]
+        ]
+        if 'No package installed' in installed_workflows_info or not installed_workflows:
             raise ValueError('VNF-LCM workflow Manager on %s is reporting no workflows are \
 installed' % self.ip_address)
 
-        LOG.info(installed_workflows_info)
-        installed_workflows = installed_workflows_info.split('\n')
-        installed_workflows_info = [workflow for workflow in installed_workflows
-                                    if workflows_name in workflow]
-        return installed_workflows_info
+        LOG.info('\n'.join(installed_workflows))
+        return installed_workflows
 
     def get_workflows_version(self, **kwargs):
         """
@@ -632,13 +826,15 @@ installed' % self.ip_address)
             workflows_name=workflows_name
         )
 
-        for installed_workflows_version in installed_workflows_versions:
-            if ('SNAPSHOT' in installed_workflows_version or
-                    version.parse(installed_workflows_version) > version.parse(workflows_version)):
-                self.__uninstall_workflows(
-                    workflows_name=workflows_name,
-                    workflows_version=installed_workflows_version
-                )
+        self.__uninstall_workflows(
+            workflows_name=workflows_name,
+            workflows_versions=[
+                installed_workflows_version
+                for installed_workflows_version in installed_workflows_versions
+                if ('SNAPSHOT' in installed_workflows_version or
+                    version.parse(installed_workflows_version) > version.parse(workflows_version))
+            ]
+        )
 
     def cleanup_workflows_versions(self, **kwargs):
         """
@@ -663,37 +859,66 @@ installed' % self.ip_address)
         if len(installed_workflows_versions) > retain_value:
             LOG.info('Proceeding with uninstall of obsolete %s versions.', workflows_name)
 
-        while range(len(installed_workflows_versions) - retain_value):
-            self.__uninstall_workflows(
-                workflows_name=workflows_name,
-                workflows_version=installed_workflows_versions[-1],
-                suppress_exception=suppress_exception
-            )
-            del installed_workflows_versions[-1]
+        self.__uninstall_workflows(
+            workflows_name=workflows_name,
+            workflows_versions=list(reversed(installed_workflows_versions[retain_value:])),
+            suppress_exception=suppress_exception
+        )
 
     def __uninstall_workflows(self, **kwargs):
         """
-        Uninstall VNF-LCM workflow.
+        Uninstall VNF-LCM workflow versions in one ssh command.
+
+        wfmgr keeps its bundle state in a single repository so the versions
+        are uninstalled one after another, but within the same remote command.
+        The result of each uninstall is logged.
 
         Args:
             workflows_name (str): workflows name
-            workflows_version (str): workflows version
+            workflows_versions (list): workflows versions
             suppress_exception (boolean, Optional): suppress exception, defaults to False
+
+        Raises:
+            CliNonZeroExitCodeException: if an uninstall fails and suppress_exception is False
         """
         workflows_name = kwargs.pop('workflows_name')
-        workflows_version = kwargs.pop('workflows_version')
+        workflows_versions = kwargs.pop('workflows_versions')
         suppress_exception = kwargs.pop('suppress_exception', False)
 
         if kwargs:
             raise TypeError('Unexpected **kwargs: %r' % kwargs)
 
-        ssh_command = f'echo "yes" | sudo /opt/ericsson/ERICwfmgrruntimetools_CXP9032765/wfmgr \
-bundle uninstall --name={workflows_name} --version={workflows_version}'
+        if not workflows_versions:
+            return
+
+        ssh_command = f'for workflows_version in {" ".join(workflows_versions)}; do \
+echo "### $workflows_version"; echo "yes" | sudo /opt/ericsson/ERICwfmgrruntimetools_CXP9032765/wfmgr \
+bundle uninstall --name={workflows_name} --version=$workflows_version; echo "### exit $?"; done'
         wfmgr_output = utils.run_ssh_command(
             ip_address=self.ip_address,
             username=self.username,
             private_key=self.private_key,
             command=ssh_command,
-            suppress_exception=suppress_exception
+            suppress_exception=True
         )
-        LOG.info(wfmgr_output)
+        if self.facts:
+            self.facts.invalidate()
+
+        failed_versions = list(workflows_versions)
+        workflows_version = None
+        for line in wfmgr_output.splitlines():
+            if line.startswith('### exit '):
+                if line.split()[-1] == '0':
+                    failed_versions.remove(workflows_version)
+                LOG.info(
+                    'Uninstall of %s %s: %s', workflows_name, workflows_version,
+                    'failed' if workflows_version in failed_versions else 'done'
+                )
+            elif line.startswith('### '):
+                workflows_version = line[4:].strip()
+            else:
+                LOG.info(line)
+        if failed_versions and not suppress_exception:
+            raise utils.CliNonZeroExitCodeException(
+                'Failed to uninstall %s versions: %s' % (workflows_name, ', '.join(failed_versions))
+            )
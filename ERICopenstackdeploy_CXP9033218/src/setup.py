@@ -1,9 +1,120 @@
 """This is the setuptools file for the deployer package."""
 
+import ast
+from configparser import ConfigParser
+from os.path import abspath, dirname, join
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+from setuptools.command.develop import develop
 from deployer import configuration
 
 CONFIG = configuration.VersionConfig()
+SOURCE_DIRECTORY = dirname(abspath(__file__))
+COMMANDS = [
+    'ci enm backup deployment = deployer.ci_enm_backup_deployment:CIENMBackupDeployment',
+    'ci enm restore deployment = deployer.ci_enm_restore_deployment:CIENMRestoreDeployment',
+    'ci enm rollout = deployer.ci_enm_rollout:CIENMRollout',
+    'ci enm snapshot deployment = deployer.ci_enm_snapshot:CIENMSnapshotDeployment',
+    'ci enm upgrade = deployer.ci_enm_upgrade:CIENMUpgrade',
+    'ci enm rollback deployment = ' +
+    'deployer.ci_enm_rollback_deployment:CIENMRollbackDeployment',
+    'ci enm stacks delete = deployer.enm_stacks_delete:CIENMStacksDelete',
+    'ci vio dvms deploy = deployer.ci_vio_dvms_deploy:CIVIODvmsDeploy',
+    'ci vio platform install = deployer.ci_vio_platform_install:CIVIOPlatformInstall',
+    'ci vio platform upgrade = deployer.ci_vio_platform_upgrade:CIVIOPlatformUpgrade',
+    'ci vio platform post install = ' +
+    'deployer.ci_vio_platform_post_install:CIVIOPlatformPostInstall',
+    'ci vio platform post upgrade = ' +
+    'deployer.ci_vio_platform_post_upgrade:CIVIOPlatformPostUpgrade',
+    'glance clean = deployer.glance_clean:GlanceClean',
+    'ci enm schema upgrade = deployer.ci_enm_schema_upgrade:CIENMSchemaUpgrade',
+    'ci task = deployer.ci_tasks:CITask',
+    'nwci task = deployer.ci_tasks:CITask',
+    'nwci enm backup deployment = ' +
+    'deployer.ci_enm_backup_deployment:CIENMBackupDeployment',
+    'nwci enm restore deployment = ' +
+    'deployer.ci_enm_restore_deployment:CIENMRestoreDeployment',
+    'nwci enm rollout = deployer.ci_enm_rollout:CIENMRollout',
+    'nwci enm snapshot deployment = deployer.ci_enm_snapshot:CIENMSnapshotDeployment',
+    'nwci enm upgrade = deployer.ci_enm_upgrade:CIENMUpgrade',
+    'nwci enm rollback deployment = ' +
+    'deployer.ci_enm_rollback_deployment:CIENMRollbackDeployment',
+    'nwci enm stacks delete = deployer.enm_stacks_delete:CIENMStacksDelete',
+    'ci edp venm = deployer.ci_edp_venm:CIEDPVENM',
+    'nwci edp venm = deployer.ci_edp_venm:CIEDPVENM'
+]
+
+
+def get_command_summary(command_value):
+    """
+    Return the first line of the docstring of a command class.
+
+    The module is parsed rather than imported, so the
+    package dependencies are not needed to build it.
+
+    Args:
+        command_value (str): command module and class name
+
+    Returns:
+        (str): first line of the class docstring
+    """
+    module_name, class_name = command_value.split(':')
+    module_file_path = join(SOURCE_DIRECTORY, *module_name.split('.')) + '.py'
+    with open(module_file_path) as module_file:
+        module_tree = ast.parse(module_file.read())
+    for node in module_tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            return (ast.get_docstring(node) or '').split('\n')[0]
+    raise ValueError(f'Command class {command_value} was not found')
+
+
+def write_command_registry(package_directory):
+    """
+    Write the static command registry into a deployer package directory.
+
+    The registry holds the deployer.commands entry points and the
+    summary of each command, which the deployer reads at startup
+    instead of scanning the installed entry points every time
+    it starts or importing every command to list them.
+
+    Args:
+        package_directory (str): directory containing the deployer package
+    """
+    registry = ConfigParser(delimiters=['='], interpolation=None)
+    registry.optionxform = str
+    registry.add_section('deployer.commands')
+    registry.add_section('deployer.command_summaries')
+    for command in COMMANDS:
+        command_name, command_value = [part.strip() for part in command.split('=', 1)]
+        registry.set('deployer.commands', command_name, command_value)
+        registry.set(
+            'deployer.command_summaries', command_name, get_command_summary(command_value)
+        )
+    with open(join(package_directory, 'deployer', 'etc', 'commands.ini'), 'w') as registry_file:
+        registry.write(registry_file)
+
+
+class BuildPyWithCommandRegistry(build_py):
+    """Build the package along with the static command registry."""
+
+    def run(self):
+        """Build the package, then write the registry into the build directory."""
+        build_py.run(self)
+        self.mkpath(join(self.build_lib, 'deployer', 'etc'))
+        write_command_registry(self.build_lib)
+        # Editable installs import the package from the source directory
+        if getattr(self, 'editable_mode', False):
+            write_command_registry(SOURCE_DIRECTORY)
+
+
+class DevelopWithCommandRegistry(develop):
+    """Install the package in development mode along with the static command registry."""
+
+    def run(self):
+        """Write the registry into the source directory, then install the package."""
+        write_command_registry(SOURCE_DIRECTORY)
+        develop.run(self)
+
 
 setup(
     name='ERICopenstackdeploy_CXP9033218',
@@ -11,43 +122,15 @@ setup(
     version=CONFIG.get('VERSION', 'version'),
     package_data={'deployer': ['etc/*', 'heat_templates/*']},
     packages=find_packages(),
+    cmdclass={
+        'build_py': BuildPyWithCommandRegistry,
+        'develop': DevelopWithCommandRegistry
+    },
     entry_points={
         'console_scripts': [
             'deployer = deployer.shell:main'
         ],
-        'deployer.commands': [
-            'ci enm backup deployment = deployer.ci_enm_backup_deployment:CIENMBackupDeployment',
-            'ci enm restore deployment = deployer.ci_enm_restore_deployment:CIENMRestoreDeployment',
-            'ci enm rollout = deployer.ci_enm_rollout:CIENMRollout',
-            'ci enm snapshot deployment = deployer.ci_enm_snapshot:CIENMSnapshotDeployment',
-            'ci enm upgrade = deployer.ci_enm_upgrade:CIENMUpgrade',
-            'ci enm rollback deployment = ' +
-            'deployer.ci_enm_rollback_deployment:CIENMRollbackDeployment',
-            'ci enm stacks delete = deployer.enm_stacks_delete:CIENMStacksDelete',
-            'ci vio dvms deploy = deployer.ci_vio_dvms_deploy:CIVIODvmsDeploy',
-            'ci vio platform install = deployer.ci_vio_platform_install:CIVIOPlatformInstall',
-            'ci vio platform upgrade = deployer.ci_vio_platform_upgrade:CIVIOPlatformUpgrade',
-            'ci vio platform post install = ' +
-            'deployer.ci_vio_platform_post_install:CIVIOPlatformPostInstall',
-            'ci vio platform post upgrade = ' +
-            'deployer.ci_vio_platform_post_upgrade:CIVIOPlatformPostUpgrade',
-            'glance clean = deployer.glance_clean:GlanceClean',
-            'ci enm schema upgrade = deployer.ci_enm_schema_upgrade:CIENMSchemaUpgrade',
-            'ci task = deployer.ci_tasks:CITask',
-            'nwci task = deployer.ci_tasks:CITask',
-            'nwci enm backup deployment = ' +
-            'deployer.ci_enm_backup_deployment:CIENMBackupDeployment',
-            'nwci enm restore deployment = ' +
-            'deployer.ci_enm_restore_deployment:CIENMRestoreDeployment',
-            'nwci enm rollout = deployer.ci_enm_rollout:CIENMRollout',
-            'nwci enm snapshot deployment = deployer.ci_enm_snapshot:CIENMSnapshotDeployment',
-            'nwci enm upgrade = deployer.ci_enm_upgrade:CIENMUpgrade',
-            'nwci enm rollback deployment = ' +
-            'deployer.ci_enm_rollback_deployment:CIENMRollbackDeployment',
-            'nwci enm stacks delete = deployer.enm_stacks_delete:CIENMStacksDelete',
-            'ci edp venm = deployer.ci_edp_venm:CIEDPVENM',
-            'nwci edp venm = deployer.ci_edp_venm:CIEDPVENM'
-        ]
+        'deployer.commands': COMMANDS
     },
     install_requires=[
         'cliff==3.10.0',
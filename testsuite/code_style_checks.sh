@@ -48,12 +48,27 @@ then
       PEP257_RESULT="FAILED"
 fi
 
+printf "\n \n############ INFO: Running startup benchmark ############# \n"
+# Build a copy of the package along with its command registry, as the mounted source is read only
+STARTUP_BUILD_DIRECTORY=`mktemp -d`
+cp -r /mountedpath/ERICopenstackdeploy_CXP9033218/src/ $STARTUP_BUILD_DIRECTORY/src/ && \
+    (cd $STARTUP_BUILD_DIRECTORY/src/ && python setup.py -q build_py -d $STARTUP_BUILD_DIRECTORY/build/) && \
+    PYTHONPATH=$STARTUP_BUILD_DIRECTORY/build/ python /mountedpath/testsuite/startup_benchmark.py --max-seconds 2
+STARTUP_BENCHMARK_EXIT_CODE=$?
+rm -rf $STARTUP_BUILD_DIRECTORY
+STARTUP_BENCHMARK_RESULT="PASSED"
+if [[ $STARTUP_BENCHMARK_EXIT_CODE -ne 0 ]]
+then
+      STARTUP_BENCHMARK_RESULT="FAILED"
+fi
+
 printf "\n \n---- Code Style Check Results Summary ---- \n"
 echo "pylint:                       ${PYLINT_RESULT}"
 echo "pycodestyle:                  ${PYCODESTYLE_RESULT}"
 echo "pep257:                       ${PEP257_RESULT}"
+echo "startup benchmark:            ${STARTUP_BENCHMARK_RESULT}"
 echo "------------------------------------------"
-if [[ $PYLINT_EXIT_CODE -ne 0 ]] || [[ $PYCODESTYLE_EXIT_CODE -ne 0 ]] || [[ $PEP257_EXIT_CODE -ne 0 ]]
+if [[ $PYLINT_EXIT_CODE -ne 0 ]] || [[ $PYCODESTYLE_EXIT_CODE -ne 0 ]] || [[ $PEP257_EXIT_CODE -ne 0 ]] || [[ $STARTUP_BENCHMARK_EXIT_CODE -ne 0 ]]
 then
     echo "ERROR: code style checks failed, see above for details. Please fix and commit again"
     exit 1
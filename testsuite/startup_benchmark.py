@@ -0,0 +1,85 @@
+"""
+Measure how long the deployer takes to start.
+
+Two figures are reported for each measured command line:
+the time taken by 'deployer --help' and the time taken until
+cliff hands the parsed arguments to a command, which is the
+earliest point at which a command can start doing any work.
+The command is stopped at that point, so nothing is deployed
+and no network access is needed.
+
+Usage:
+    python startup_benchmark.py [--runs RUNS] [--max-seconds MAX_SECONDS]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+FIRST_ACTION_SNIPPET = '''
+import os
+import sys
+from cliff import command
+command.Command.run = lambda *args, **kwargs: os._exit(0)
+from deployer import shell
+shell.main(sys.argv[1:])
+'''
+
+COMMAND_LINES = [
+    ['ci', 'task', '--deployment-name', 'benchmark'],
+    ['glance', 'clean', '--delete-images', 'benchmark', '--os-username', 'benchmark',
+     '--os-password', 'benchmark', '--os-auth-url', 'http://localhost',
+     '--os-project-name', 'benchmark'],
+]
+
+
+def time_command(command_line, runs):
+    """
+    Return the median wall clock time of a command line.
+
+    Args:
+        command_line (list): command line to run
+        runs (int): number of times to run the command line
+
+    Returns:
+        (float): median time in seconds
+    """
+    timings = []
+    for _ in range(runs):
+        start_time = time.time()
+        subprocess.run(command_line, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=True)
+        timings.append(time.time() - start_time)
+    return statistics.median(timings)
+
+
+def main():
+    """Run the startup benchmark and return a non zero exit code if it is too slow."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help='fail if any median time is above this value')
+    args = parser.parse_args()
+
+    results = [(
+        'deployer --help',
+        time_command([sys.executable, '-m', 'deployer.shell', '--help'], args.runs)
+    )]
+    for command_line in COMMAND_LINES:
+        results.append((
+            'time to first action: deployer ' + ' '.join(command_line),
+            time_command([sys.executable, '-c', FIRST_ACTION_SNIPPET] + command_line, args.runs)
+        ))
+
+    for description, median_time in results:
+        print(f'{median_time:.3f}s {description}')
+    if args.max_seconds is not None and \
+            any(median_time > args.max_seconds for _, median_time in results):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())